@@ -5,17 +5,26 @@ algorithm.
 
 """
 
+import calendar
+import csv
+import datetime
 import flask
 import logging
 import logging.config
 from pprint import pprint
+import os
 import traceback
 import sys
 import time
 
 import utils.data_manager as data_manager
 import utils.data_manager_exceptions as data_manager_exceptions
+import utils.downsample as downsample
+import utils.export as export
 import utils.foosball_exceptions as foosball_exceptions
+import utils.http_cache as http_cache
+import utils.retention as retention
+import utils.single_flight as single_flight
 
 try:
     logging.config.fileConfig("./foosball-flask/utils/logging.conf",
@@ -32,13 +41,162 @@ FOOSBALL_APP = flask.Flask(__name__, static_folder='./utils/static',
 
 #FOOSBALL_APP.config['DEBUG'] = True
 
+RESULT_PAGE_SIZE = 25
+MAX_RESULT_PAGE_SIZE = 200
+
+# games accepted by one batch result submission
+MAX_RESULT_BATCH = 1000
+
+# result seats, in the order of a batch game's players
+RESULT_SEATS = ('offense_winner', 'defense_winner', 'offense_loser',
+    'defense_loser')
+
+# points returned by a rating timeline by default and at most
+TIMELINE_POINTS = 200
+MAX_TIMELINE_POINTS = 2000
+
+# games predicted by one request, and the seats of a predicted game
+MAX_PREDICTION_BATCH = 1000
+PREDICTION_SEATS = ('offense_one', 'defense_one', 'offense_two',
+    'defense_two')
+
+# lineups returned by default and at most, and players pooled at most
+LINEUPS = 5
+MAX_LINEUPS = 50
+MAX_LINEUP_POOL = 100
+
+# changes with every deploy, so cached pages rendered by older code are not
+# revalidated
+PAGE_REVISION = str(max([os.path.getmtime(os.path.join(root, name))
+    for root, _, names in os.walk(os.path.dirname(os.path.abspath(__file__)))
+    for name in names if name.endswith(('.py', '.html'))]))
+
 MYSQL_STARTUP = 10
 time.sleep(MYSQL_STARTUP)
 
 FOOSBALL_DATA = data_manager.DataManager(db_user='foosball',
     db_pass='foosball', db_host='db_1', db_name='foosball')
 
+DASHBOARD_FLIGHT = single_flight.SingleFlight()
+
+# seconds between rating retention runs, None to leave it to the
+# maintenance script
+RETENTION_INTERVAL = None
+RETENTION_POLICY = retention.RetentionPolicy(keep_days=None)
+
+def get_page_args():
+    """Read result page arguments from the query string
+
+    Args:
+        None
+
+    Returns:
+        page_size (int):    results per page
+        cursor (str):       page cursor, or None for the first page
+        direction (str):    'next' or 'prev'
+
+    """
+
+    page_size = flask.request.args.get('page_size', RESULT_PAGE_SIZE,
+        type=int)
+    page_size = min(max(page_size, 1), MAX_RESULT_PAGE_SIZE)
+    cursor = flask.request.args.get('cursor')
+    direction = flask.request.args.get('direction', 'next')
+
+    if direction not in ('next', 'prev'):
+        direction = 'next'
+
+    if cursor is not None:
+        cursor = cursor.encode('utf-8')
+
+        try:
+            data_manager.decode_cursor(cursor)
+        except data_manager_exceptions.DBValueError as error:
+            data_manager.LOGGER.error(error.msg)
+            cursor, direction = None, 'next'
+
+    return page_size, cursor, direction
+
+# read views answer unchanged GET requests with 304 Not Modified, the data
+# manager is looked up per request so it can be swapped
+conditional_get = http_cache.conditional_get(lambda: FOOSBALL_DATA,
+    PAGE_REVISION)
+
+def build_dashboard():
+    """Run the dashboard queries and sort the rankings
+
+    Args:
+        None
+
+    Returns:
+        dashboard (dict):   dashboard.html template arguments
+
+    """
+
+    individual_ranks = FOOSBALL_DATA.get_individual_rankings()
+    team_ranks = FOOSBALL_DATA.get_team_rankings()
+
+    return {
+        'player_count': FOOSBALL_DATA.get_total_players(),
+        'team_count': FOOSBALL_DATA.get_total_teams(),
+        'result_count': FOOSBALL_DATA.get_total_results(),
+        'individual_ranks': sorted(individual_ranks, key=lambda tup: tup[4],
+            reverse=True),
+        'team_ranks': sorted(team_ranks, key=lambda tup: tup[1],
+            reverse=True)}
+
+def get_dashboard():
+    """Get the dashboard, sharing one build between concurrent requests
+
+    Requests arriving while a dashboard for the same data version is being
+    built wait for it instead of running the queries again.
+
+    Args:
+        None
+
+    Returns:
+        dashboard (dict):   dashboard.html template arguments
+
+    """
+
+    return DASHBOARD_FLIGHT.do(FOOSBALL_DATA.get_data_version('data'),
+        build_dashboard)
+
+@FOOSBALL_APP.teardown_request
+def release_connection(exception):
+    """Return the request's MySQL connection to the pool
+
+    Args:
+        exception (obj):    unhandled exception raised by the request
+
+    Returns:
+        None
+
+    """
+
+    FOOSBALL_DATA.release_connection()
+
+@FOOSBALL_APP.route('/status')
+def status():
+    """Server status
+
+    Args:
+        None
+
+    Returns:
+        JSON connection pool, statement text cache, identity index, read cache
+        and dashboard coalescing statistics
+
+    """
+
+    return flask.jsonify(pool=FOOSBALL_DATA.get_pool_stats(),
+        statements=FOOSBALL_DATA.get_statement_stats(),
+        identity=FOOSBALL_DATA.get_identity_stats(),
+        cache=FOOSBALL_DATA.get_cache_stats(),
+        dashboard=DASHBOARD_FLIGHT.get_stats())
+
 @FOOSBALL_APP.route('/')
+@conditional_get
 def index_redirect():
     """Main entry point to webpage
 
@@ -50,21 +208,10 @@ def index_redirect():
 
     """
 
-    player_count = FOOSBALL_DATA.get_total_players()
-    team_count = FOOSBALL_DATA.get_total_teams()
-    result_count = FOOSBALL_DATA.get_total_results()
-    individual_ranks = FOOSBALL_DATA.get_individual_rankings()
-    individual_ranks = sorted(individual_ranks, key=lambda tup: tup[4],
-        reverse=True)
-    team_ranks = FOOSBALL_DATA.get_team_rankings()
-    team_ranks = sorted(team_ranks, key=lambda tup: tup[1],
-        reverse=True)
-
-    return flask.render_template('dashboard.html', player_count=player_count,
-        team_count=team_count, result_count=result_count,
-        individual_ranks=individual_ranks, team_ranks=team_ranks)
+    return flask.render_template('dashboard.html', **get_dashboard())
 
 @FOOSBALL_APP.route('/index')
+@conditional_get
 def index():
     """Dashboard webpage
 
@@ -76,21 +223,10 @@ def index():
 
     """
 
-    player_count = FOOSBALL_DATA.get_total_players()
-    team_count = FOOSBALL_DATA.get_total_teams()
-    result_count = FOOSBALL_DATA.get_total_results()
-    individual_ranks = FOOSBALL_DATA.get_individual_rankings()
-    individual_ranks = sorted(individual_ranks, key=lambda tup: tup[4],
-        reverse=True)
-    team_ranks = FOOSBALL_DATA.get_team_rankings()
-    team_ranks = sorted(team_ranks, key=lambda tup: tup[1],
-        reverse=True)
-
-    return flask.render_template('dashboard.html', player_count=player_count,
-        team_count=team_count, result_count=result_count,
-        individual_ranks=individual_ranks, team_ranks=team_ranks)
+    return flask.render_template('dashboard.html', **get_dashboard())
 
 @FOOSBALL_APP.route('/result')
+@conditional_get
 def result():
     """Results webpage
 
@@ -102,11 +238,17 @@ def result():
 
     """
 
-    results = FOOSBALL_DATA.get_all_results()
+    page_size, cursor, direction = get_page_args()
 
-    return flask.render_template('result.html', results=results)
+    results, prev_cursor, next_cursor = FOOSBALL_DATA.get_all_results(
+        page_size=page_size, cursor=cursor, direction=direction)
+
+    return flask.render_template('result.html', results=results,
+        page_size=page_size, prev_cursor=prev_cursor,
+        next_cursor=next_cursor)
 
 @FOOSBALL_APP.route('/player')
+@conditional_get
 def player():
     """Players webpage
 
@@ -123,6 +265,7 @@ def player():
     return flask.render_template('player.html', players=players)
 
 @FOOSBALL_APP.route('/team')
+@conditional_get
 def team():
     """Team webpage
 
@@ -139,6 +282,7 @@ def team():
     return flask.render_template('team.html', teams=teams)
 
 @FOOSBALL_APP.route('/addteam', methods=['GET', 'POST'])
+@conditional_get
 def add_team():
     """Add Team webpage
 
@@ -208,6 +352,7 @@ def add_team():
         raise foosball_exceptions.HTTPError("Received unrecognized HTTP method")
 
 @FOOSBALL_APP.route('/addplayer', methods=['GET', 'POST'])
+@conditional_get
 def add_player():
     """Add Player webpage
 
@@ -260,6 +405,7 @@ def add_player():
 
 
 @FOOSBALL_APP.route('/editplayer', methods=['GET', 'POST'])
+@conditional_get
 def edit_player():
     """Edit an existing player name"""
     players = FOOSBALL_DATA.get_all_players()
@@ -366,6 +512,7 @@ def del_player():
         raise foosball_exceptions.HTTPError("Received unrecognized HTTP method")
 
 @FOOSBALL_APP.route('/addresult', methods=['GET', 'POST'])
+@conditional_get
 def add_result():
     """Add Result webpage
 
@@ -442,96 +589,604 @@ def add_result():
             pass
 
         message = 'Result successfully added'
-        results = FOOSBALL_DATA.get_all_results()
+        results, prev_cursor, next_cursor = FOOSBALL_DATA.get_all_results(
+            page_size=RESULT_PAGE_SIZE)
         return flask.render_template('result.html', message=message,
-            results=results)
+            results=results, page_size=RESULT_PAGE_SIZE,
+            prev_cursor=prev_cursor, next_cursor=next_cursor)
     elif flask.request.method == 'GET':
         return flask.render_template('addresult.html', players=players)
     else:
         raise foosball_exceptions.HTTPError("Received unrecognized HTTP method")
 
-@FOOSBALL_APP.route('/teamstat')
-def team_stat():
-    """Team Stat webpage
+def read_json_game(game, seats=RESULT_SEATS):
+    """Convert a JSON game into player name tuples
 
     Args:
-        None
+        game (dict):    [first name, last name, nickname] list per seat
+        seats (tup):    seat names, in the order returned
 
     Returns:
-        display dashboard
+        game (tup):     name tuples of the seats, empty if malformed
 
     """
 
-    player_count = FOOSBALL_DATA.get_total_players()
-    team_count = FOOSBALL_DATA.get_total_teams()
-    result_count = FOOSBALL_DATA.get_total_results()
-    individual_ranks = FOOSBALL_DATA.get_individual_rankings()
-    individual_ranks = sorted(individual_ranks, key=lambda tup: tup[4],
-        reverse=True)
-    team_ranks = FOOSBALL_DATA.get_team_rankings()
-    team_ranks = sorted(team_ranks, key=lambda tup: tup[1],
-        reverse=True)
+    if not isinstance(game, dict):
+        return ()
 
-    return flask.render_template('dashboard.html', player_count=player_count,
-        team_count=team_count, result_count=result_count,
-        individual_ranks=individual_ranks, team_ranks=team_ranks)
+    players = []
+    for seat in seats:
+        player = game.get(seat)
+        if not isinstance(player, list):
+            player = ()
+        players.append(tuple(unicode(name).encode('utf-8')
+            for name in player))
 
-@FOOSBALL_APP.route('/playerstat', methods=['GET', 'POST'])
-def player_stat():
-    """Player Stat webpage
+    return tuple(players)
+
+def read_result_batch():
+    """Read a batch of games from the request body
+
+    A JSON body is a list of games, each an object with a [first name,
+    last name, nickname] list per seat in RESULT_SEATS. Any other body is
+    read as CSV with one game per line and three columns per seat, in the
+    same order. Malformed games are passed through for the data manager to
+    reject.
 
     Args:
         None
 
     Returns:
-        display dashboard
+        games (list):   (offense_winner, defense_winner, offense_loser,
+                        defense_loser) tuples of player name tuples
+
+    Raises:
+        foosball_exceptions.HTTPError
 
     """
 
-    players = FOOSBALL_DATA.get_all_players()
-    results = FOOSBALL_DATA.get_all_results()
+    if flask.request.mimetype == 'application/json':
+        body = flask.request.get_json(silent=True)
 
-    if flask.request.method == 'POST':
-        selected_player = flask.request.form['player'].encode('utf-8')
-        selected_position = flask.request.form['position'].encode('utf-8')
+        if not isinstance(body, list):
+            raise foosball_exceptions.HTTPError("Expected a JSON list of \
+games")
+
+        games = [read_json_game(game) for game in body]
+    else:
+        games = []
+        for row in csv.reader(flask.request.get_data().splitlines()):
+            if not row:
+                continue
+            games.append(tuple(tuple(row[start:start + 3])
+                for start in range(0, len(row), 3)))
+
+    if len(games) > MAX_RESULT_BATCH:
+        raise foosball_exceptions.HTTPError("At most {0} games can be added \
+at once".format(MAX_RESULT_BATCH))
+
+    return games
+
+@FOOSBALL_APP.route('/api/results', methods=['POST'])
+def add_results():
+    """Add a batch of results
+
+    Games are rated in order and added in one transaction. Games that fail
+    validation are skipped and reported, the others are still added.
+
+    Args:
+        games (list):   JSON or CSV games, see read_result_batch
+
+    Returns:
+        JSON count of added games and the error of every skipped one
+
+    """
+
+    try:
+        games = read_result_batch()
+    except foosball_exceptions.HTTPError as error:
+        return flask.jsonify(error=error.msg), 400
+
+    try:
+        errors = FOOSBALL_DATA.add_results(games)
+        FOOSBALL_DATA.commit_data()
+    except data_manager_exceptions.DBSyntaxError as error:
+        data_manager.LOGGER.error(error.msg)
+        return flask.jsonify(error=error.msg), 500
+    except data_manager_exceptions.DBConnectionError as error:
+        data_manager.LOGGER.error(error.msg)
+        return flask.jsonify(error=error.msg), 503
+    else:
+        pass
+
+    return flask.jsonify(added=len(games) - len(errors),
+        errors=[{'game': index, 'error': error.msg}
+        for index, error in errors])
+
+@FOOSBALL_APP.route('/api/results/<int:result_id>', methods=['PUT', 'DELETE'])
+def change_result(result_id):
+    """Correct or delete a result
+
+    Ratings of the results after it are replayed from the last checkpoint
+    before it.
+
+    Args:
+        result_id (int):    result id
+        game (dict):        corrected JSON game when correcting, see
+                            read_json_game
+
+    Returns:
+        JSON result id, or the error
+
+    """
+
+    try:
+        if flask.request.method == 'PUT':
+            game = read_json_game(flask.request.get_json(silent=True))
+            FOOSBALL_DATA.edit_result(result_id, *(game or ((),) * 4))
+        else:
+            FOOSBALL_DATA.delete_result(result_id)
+        FOOSBALL_DATA.commit_data()
+    except data_manager_exceptions.DBValueError as error:
+        data_manager.LOGGER.error(error.msg)
+        return flask.jsonify(error=error.msg), 400
+    except data_manager_exceptions.DBExistError as error:
+        data_manager.LOGGER.error(error.msg)
+        return flask.jsonify(error=error.msg), 404
+    except data_manager_exceptions.DBSyntaxError as error:
+        data_manager.LOGGER.error(error.msg)
+        return flask.jsonify(error=error.msg), 500
+    except data_manager_exceptions.DBConnectionError as error:
+        data_manager.LOGGER.error(error.msg)
+        return flask.jsonify(error=error.msg), 503
+    else:
+        pass
+
+    return flask.jsonify(result_id=result_id)
+
+def read_display_name(name):
+    """Split a player display name into its names
+
+    Args:
+        name (str):     display name, as First "nickname" Last
+
+    Returns:
+        player (tup):   first name, last name and nickname
+
+    """
+
+    first_quote = name.find('"')
+    second_quote = name.find('"', first_quote + 1)
+
+    return (name[:first_quote - 1], name[second_quote + 2:],
+        name[first_quote + 1:second_quote])
+
+def read_date(name):
+    """Read an optional YYYY-MM-DD date query argument
+
+    Args:
+        name (str):     query argument name
+
+    Returns:
+        date (obj):     datetime, None if absent
+
+    Raises:
+        ValueError
+
+    """
 
-        first_quote = selected_player.find('"')
-        second_quote = selected_player.find('"', first_quote + 1)
-        final_player = (selected_player[:first_quote - 1],
-            selected_player[second_quote + 2:],
-            selected_player[first_quote + 1:second_quote])
+    value = flask.request.args.get(name)
+    if not value:
+        return None
+
+    return datetime.datetime.strptime(value, '%Y-%m-%d')
+
+@FOOSBALL_APP.route('/api/players/timeline', methods=['GET'])
+def player_timeline():
+    """Rating timeline of a player position
+
+    Long timelines are downsampled to the requested number of points,
+    keeping the points that shape the chart the most.
+
+    Args:
+        player (str):       player display name
+        position (str):     Offense or Defense
+        start (str):        first date included, as YYYY-MM-DD
+        end (str):          last date included, as YYYY-MM-DD
+        points (int):       points returned at most
+
+    Returns:
+        JSON time, rank, mu and sigma of every point, or the error
+
+    """
+
+    player = flask.request.args.get('player', u'').encode('utf-8')
+    position = flask.request.args.get('position', u'').encode('utf-8')
+
+    try:
+        start = read_date('start')
+        end = read_date('end')
+        points = min(int(flask.request.args.get('points', TIMELINE_POINTS)),
+            MAX_TIMELINE_POINTS)
+    except ValueError:
+        return flask.jsonify(error="Malformed start, end or points"), 400
+
+    if points < 3:
+        return flask.jsonify(error="At least 3 points must be asked for"), 400
+
+    try:
+        ratings = FOOSBALL_DATA.get_rating_timeline(read_display_name(player),
+            position, start=start, end=end)
+    except data_manager_exceptions.DBValueError as error:
+        data_manager.LOGGER.error(error.msg)
+        return flask.jsonify(error=error.msg), 400
+    except data_manager_exceptions.DBExistError as error:
+        data_manager.LOGGER.error(error.msg)
+        return flask.jsonify(error=error.msg), 404
+    except data_manager_exceptions.DBSyntaxError as error:
+        data_manager.LOGGER.error(error.msg)
+        return flask.jsonify(error=error.msg), 500
+    except data_manager_exceptions.DBConnectionError as error:
+        data_manager.LOGGER.error(error.msg)
+        return flask.jsonify(error=error.msg), 503
+    else:
+        pass
+
+    series = [(calendar.timegm(time.timetuple()),
+        mu - 3 * sigma, mu, sigma, time) for time, mu, sigma in ratings]
+
+    return flask.jsonify(player=player, position=position,
+        points=[{'time': point[4].strftime('%Y-%m-%d %H:%M:%S'),
+        'rank': round(point[1], 4), 'mu': point[2], 'sigma': point[3]}
+        for point in downsample.lttb(series, points)])
+
+def get_player_records(partners):
+    """Serve a player's records against opponents or with partners
+
+    Args:
+        partners (bool):    records with teammates instead of opponents
+
+    Returns:
+        JSON record with every other player, or the error
+
+    """
+
+    player = flask.request.args.get('player', u'').encode('utf-8')
+    position = flask.request.args.get('position', u'').encode('utf-8')
+
+    try:
+        records = FOOSBALL_DATA.get_player_records(read_display_name(player),
+            position, partners=partners)
+    except data_manager_exceptions.DBValueError as error:
+        data_manager.LOGGER.error(error.msg)
+        return flask.jsonify(error=error.msg), 400
+    except data_manager_exceptions.DBExistError as error:
+        data_manager.LOGGER.error(error.msg)
+        return flask.jsonify(error=error.msg), 404
+    except data_manager_exceptions.DBSyntaxError as error:
+        data_manager.LOGGER.error(error.msg)
+        return flask.jsonify(error=error.msg), 500
+    except data_manager_exceptions.DBConnectionError as error:
+        data_manager.LOGGER.error(error.msg)
+        return flask.jsonify(error=error.msg), 503
+    else:
+        pass
+
+    return flask.jsonify(player=player, position=position,
+        records=[{'player': [first_name, last_name, nickname], 'wins': wins,
+        'losses': losses, 'win_rate': round(float(wins) / (wins + losses), 4)}
+        for first_name, last_name, nickname, wins, losses in records])
+
+@FOOSBALL_APP.route('/api/players/opponents', methods=['GET'])
+def player_opponents():
+    """Record of a player position against every opponent
+
+    Args:
+        player (str):       player display name
+        position (str):     Offense or Defense
+
+    Returns:
+        JSON wins, losses and win rate against every opponent, most games
+        first, or the error
+
+    """
+
+    return get_player_records(partners=False)
+
+@FOOSBALL_APP.route('/api/players/partners', methods=['GET'])
+def player_partners():
+    """Record of a player position with every teammate
+
+    Args:
+        player (str):       player display name
+        position (str):     Offense or Defense
+
+    Returns:
+        JSON wins, losses and win rate with every teammate, most games
+        first, or the error
+
+    """
+
+    return get_player_records(partners=True)
+
+@FOOSBALL_APP.route('/api/export/<name>', methods=['GET'])
+def export_table(name):
+    """Stream every row of a table
+
+    Rows go from a server-side cursor straight into the response, so the
+    export uses constant memory however many rows there are.
+
+    Args:
+        name (str):     results, players, teams or ratings
+        format (str):   csv or ndjson
+
+    Returns:
+        CSV with a header line, or one JSON object per line, or the error
+
+    """
+
+    format_name = flask.request.args.get('format', 'csv')
+
+    if format_name not in export.FORMATS:
+        return flask.jsonify(error="Unrecognized export format"), 400
+
+    try:
+        columns, rows = FOOSBALL_DATA.export_rows(name)
+    except data_manager_exceptions.DBValueError as error:
+        data_manager.LOGGER.error(error.msg)
+        return flask.jsonify(error=error.msg), 404
+    except data_manager_exceptions.DBSyntaxError as error:
+        data_manager.LOGGER.error(error.msg)
+        return flask.jsonify(error=error.msg), 500
+    except data_manager_exceptions.DBConnectionError as error:
+        data_manager.LOGGER.error(error.msg)
+        return flask.jsonify(error=error.msg), 503
+    else:
+        pass
+
+    mimetype, extension = export.FORMATS[format_name]
+    response = flask.Response(flask.stream_with_context(export.write(
+        columns, rows, format_name)), mimetype=mimetype)
+    response.headers['Content-Disposition'] = \
+        'attachment; filename={0}.{1}'.format(name, extension)
+
+    return response
+
+@FOOSBALL_APP.route('/api/predict', methods=['POST'])
+def predict():
+    """Chance to win of a batch of games
+
+    Args:
+        games (list):   JSON games, each with a [first name, last name,
+                        nickname] list per seat in PREDICTION_SEATS
+
+    Returns:
+        JSON chance that the first team wins, or the error, of every game in
+        the order given
+
+    """
+
+    body = flask.request.get_json(silent=True)
+
+    if not isinstance(body, list):
+        return flask.jsonify(error="Expected a JSON list of games"), 400
+
+    if len(body) > MAX_PREDICTION_BATCH:
+        return flask.jsonify(error="At most {0} games can be predicted at \
+once".format(MAX_PREDICTION_BATCH)), 400
+
+    try:
+        predictions, errors = FOOSBALL_DATA.predict_games([read_json_game(
+            game, seats=PREDICTION_SEATS) for game in body])
+    except data_manager_exceptions.DBSyntaxError as error:
+        data_manager.LOGGER.error(error.msg)
+        return flask.jsonify(error=error.msg), 500
+    except data_manager_exceptions.DBConnectionError as error:
+        data_manager.LOGGER.error(error.msg)
+        return flask.jsonify(error=error.msg), 503
+    else:
+        pass
+
+    games = [{'game': index, 'probability': probability}
+        for index, probability in enumerate(predictions)]
+    for index, error in errors:
+        games[index] = {'game': index, 'error': error.msg}
+
+    return flask.jsonify(games=games)
+
+@FOOSBALL_APP.route('/api/lineups', methods=['POST'])
+def lineups():
+    """Most balanced lineups for a pool of available players
+
+    Args:
+        players (list):     [first name, last name, nickname] list per
+                            available player
+        top (int):          lineups returned at most
+
+    Returns:
+        JSON quality and seated players of every lineup, best first, or the
+        error
+
+    """
+
+    body = flask.request.get_json(silent=True)
+
+    if not isinstance(body, dict) or \
+        not isinstance(body.get('players'), list):
+        return flask.jsonify(error="Expected a JSON list of players"), 400
+
+    if len(body['players']) > MAX_LINEUP_POOL:
+        return flask.jsonify(error="At most {0} players can be pooled".format(
+            MAX_LINEUP_POOL)), 400
+
+    try:
+        top = min(int(body.get('top', LINEUPS)), MAX_LINEUPS)
+    except (TypeError, ValueError):
+        return flask.jsonify(error="Malformed top"), 400
+
+    players = [tuple(unicode(name).encode('utf-8') for name in player)
+        if isinstance(player, list) else () for player in body['players']]
+
+    try:
+        found = FOOSBALL_DATA.get_lineups(players, top=top)
+    except data_manager_exceptions.DBValueError as error:
+        data_manager.LOGGER.error(error.msg)
+        return flask.jsonify(error=error.msg), 400
+    except data_manager_exceptions.DBExistError as error:
+        data_manager.LOGGER.error(error.msg)
+        return flask.jsonify(error=error.msg), 404
+    except data_manager_exceptions.DBSyntaxError as error:
+        data_manager.LOGGER.error(error.msg)
+        return flask.jsonify(error=error.msg), 500
+    except data_manager_exceptions.DBConnectionError as error:
+        data_manager.LOGGER.error(error.msg)
+        return flask.jsonify(error=error.msg), 503
+    else:
+        pass
+
+    return flask.jsonify(lineups=[dict(zip(('quality', 'offense_one',
+        'defense_one', 'offense_two', 'defense_two'), lineup))
+        for lineup in found])
+
+@FOOSBALL_APP.route('/delteam', methods=['POST', 'DELETE'])
+def del_team():
+    """Delete team webpage
+
+    A team whose players played together is only deleted when
+    delete_results is given, and its results are then deleted too.
+
+    Args:
+        team_name (str):        team name
+        delete_results (str):   true to also delete the team's results
+
+    Returns:
+        display team
+
+    Raises:
+        foosball_exceptions.HTTPError
+
+    """
+
+    if flask.request.method in ('POST', 'DELETE'):
+        team_name = flask.request.values.get('team_name', u'').encode('utf-8')
+        delete_results = flask.request.values.get('delete_results',
+            '').lower() in ('1', 'true', 'yes', 'on')
 
         try:
-            individual_results = FOOSBALL_DATA.get_individual_results(
-                player=final_player, position=selected_position)
+            FOOSBALL_DATA.delete_team(team_name=team_name,
+                delete_results=delete_results)
+            FOOSBALL_DATA.commit_data()
         except data_manager_exceptions.DBValueError as error:
-            LOGGER.error(error.msg)
-            return flask.render_template('playerstat.html', error=error,
-                players=players, results=results)
+            data_manager.LOGGER.error(error.msg)
+            return flask.render_template('team.html', error=error)
         except data_manager_exceptions.DBSyntaxError as error:
-            LOGGER.error(error.msg)
-            return flask.render_template('playerstat.html', error=error,
-                players=players, results=results)
+            data_manager.LOGGER.error(error.msg)
+            return flask.render_template('team.html', error=error)
         except data_manager_exceptions.DBConnectionError as error:
-            LOGGER.error(error.msg)
-            return flask.render_template('playerstat.html', error=error,
-                players=players, results=results)
+            data_manager.LOGGER.error(error.msg)
+            return flask.render_template('team.html', error=error)
         except data_manager_exceptions.DBExistError as error:
-            LOGGER.error(error.msg)
-            return flask.render_template('playerstat.html', error=error,
-                players=players, results=results)
+            data_manager.LOGGER.error(error.msg)
+            return flask.render_template('team.html', error=error)
         else:
             pass
 
-        return flask.render_template('playerstat.html',
-            results=individual_results,
-            players=players)
+        message = 'Team successfully deleted'
+        teams = FOOSBALL_DATA.get_all_teams()
+        return flask.render_template('team.html', message=message,
+            teams=teams)
+
+    else:
+        raise foosball_exceptions.HTTPError("Received unrecognized HTTP method")
+
+@FOOSBALL_APP.route('/teamstat')
+@conditional_get
+def team_stat():
+    """Team Stat webpage
+
+    Args:
+        None
+
+    Returns:
+        display dashboard
+
+    """
+
+    return flask.render_template('dashboard.html', **get_dashboard())
+
+@FOOSBALL_APP.route('/playerstat', methods=['GET', 'POST'])
+@conditional_get
+def player_stat():
+    """Player Stat webpage
+
+    Args:
+        player (str):       selected player
+        position (str):     selected position
+
+    Returns:
+        display player stats
+
+    Raises:
+        foosball_exceptions.HTTPError
+
+    """
+
+    players = FOOSBALL_DATA.get_all_players()
+    page_size, cursor, direction = get_page_args()
+
+    if flask.request.method == 'POST':
+        selected_player = flask.request.form['player'].encode('utf-8')
+        selected_position = flask.request.form['position'].encode('utf-8')
+        cursor = None
+        direction = 'next'
     elif flask.request.method == 'GET':
-        return flask.render_template('playerstat.html', results=results,
-            players=players)
+        selected_player = flask.request.args.get('player')
+        selected_position = flask.request.args.get('position')
+
+        if selected_player is None or selected_position is None:
+            results, prev_cursor, next_cursor = \
+                FOOSBALL_DATA.get_all_results(page_size=page_size,
+                cursor=cursor, direction=direction)
+            return flask.render_template('playerstat.html', results=results,
+                players=players, page_size=page_size,
+                prev_cursor=prev_cursor, next_cursor=next_cursor)
+
+        selected_player = selected_player.encode('utf-8')
+        selected_position = selected_position.encode('utf-8')
     else:
         raise foosball_exceptions.HTTPError("Received unrecognized HTTP method")
 
+    final_player = read_display_name(selected_player)
+
+    try:
+        individual_results, prev_cursor, next_cursor = \
+            FOOSBALL_DATA.get_individual_results(player=final_player,
+            position=selected_position, page_size=page_size, cursor=cursor,
+            direction=direction)
+    except data_manager_exceptions.DBValueError as error:
+        data_manager.LOGGER.error(error.msg)
+        return flask.render_template('playerstat.html', error=error,
+            players=players, results=())
+    except data_manager_exceptions.DBSyntaxError as error:
+        data_manager.LOGGER.error(error.msg)
+        return flask.render_template('playerstat.html', error=error,
+            players=players, results=())
+    except data_manager_exceptions.DBConnectionError as error:
+        data_manager.LOGGER.error(error.msg)
+        return flask.render_template('playerstat.html', error=error,
+            players=players, results=())
+    except data_manager_exceptions.DBExistError as error:
+        data_manager.LOGGER.error(error.msg)
+        return flask.render_template('playerstat.html', error=error,
+            players=players, results=())
+    else:
+        pass
+
+    return flask.render_template('playerstat.html',
+        results=individual_results, players=players, page_size=page_size,
+        prev_cursor=prev_cursor, next_cursor=next_cursor,
+        selected_player=selected_player, selected_position=selected_position)
+
 def main():
     """Main entry point
 
@@ -543,7 +1198,11 @@ def main():
 
     """
 
-    FOOSBALL_APP.run(port=11111, host='0.0.0.0')
+    if RETENTION_INTERVAL is not None:
+        retention.RetentionJob(FOOSBALL_DATA, RETENTION_POLICY,
+            RETENTION_INTERVAL).start()
+
+    FOOSBALL_APP.run(port=11111, host='0.0.0.0', threaded=True)
 
 if __name__ == '__main__':
     main()
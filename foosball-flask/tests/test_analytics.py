@@ -0,0 +1,65 @@
+"""Foosball Analytics Tests
+
+Example:
+    python -m unittest discover -s tests -t .
+
+"""
+
+import unittest
+
+import utils.analytics as analytics
+
+# (offense winner, defense winner, offense loser, defense loser) rows
+GAMES = ((10, 20, 30, 40), (10, 20, 40, 30), (30, 20, 10, 40))
+
+OFFENSE = 0
+DEFENSE = 1
+
+class PlayerMatricesTest(unittest.TestCase):
+    """PlayerMatricesTest class checking records on fixed games"""
+
+    def setUp(self):
+        self.matrices = analytics.build(GAMES)
+
+    def test_players_indexed_in_id_order(self):
+        self.assertEqual(self.matrices.player_ids, [10, 20, 30, 40])
+        self.assertEqual(self.matrices.index[30], 2)
+
+    def test_opponents(self):
+        self.assertEqual(self.matrices.get_opponents(10, OFFENSE),
+            [(30, 2, 1), (40, 2, 0), (20, 0, 1)])
+        self.assertEqual(self.matrices.get_opponents(20, DEFENSE),
+            [(40, 3, 0), (30, 2, 0), (10, 1, 0)])
+        self.assertEqual(self.matrices.get_opponents(40, DEFENSE),
+            [(20, 0, 2), (10, 0, 1), (30, 0, 1)])
+
+    def test_partners(self):
+        self.assertEqual(self.matrices.get_partners(10, OFFENSE),
+            [(20, 2, 0), (40, 0, 1)])
+        self.assertEqual(self.matrices.get_partners(20, DEFENSE),
+            [(10, 2, 0), (30, 1, 0)])
+        self.assertEqual(self.matrices.get_partners(30, OFFENSE),
+            [(20, 1, 0), (40, 0, 1)])
+
+    def test_unplayed_position_and_unknown_player(self):
+        self.assertEqual(self.matrices.get_opponents(20, OFFENSE), [])
+        self.assertEqual(self.matrices.get_partners(20, OFFENSE), [])
+        self.assertEqual(self.matrices.get_opponents(99, OFFENSE), [])
+
+    def test_totals(self):
+        # every game counts two opponents and one teammate per seat
+        self.assertEqual(self.matrices.opponent_wins.sum(), 2 * 2 *
+            len(GAMES))
+        self.assertEqual(self.matrices.opponent_losses.sum(), 2 * 2 *
+            len(GAMES))
+        self.assertEqual(self.matrices.partner_wins.sum(), 2 * len(GAMES))
+        self.assertEqual(self.matrices.partner_losses.sum(), 2 * len(GAMES))
+
+    def test_no_games(self):
+        matrices = analytics.build([])
+
+        self.assertEqual(matrices.player_ids, [])
+        self.assertEqual(matrices.get_opponents(10, OFFENSE), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,222 @@
+"""Foosball Connection Pool Tests
+
+The pool's connect method is overridden to hand out in-memory connections,
+so no MySQL server is needed.
+
+Example:
+    python -m unittest discover -s tests -t .
+
+"""
+
+import threading
+import unittest
+
+import MySQLdb
+
+import utils.connection_pool as connection_pool
+import utils.data_manager_exceptions as data_manager_exceptions
+
+class FakeConnection(object):
+    """FakeConnection class standing in for a MySQL connection
+
+    Attributes:
+        dead (bool):    pings fail when set
+        closed (bool):  set once closed
+        pings (int):    pings received
+
+    """
+
+    def __init__(self):
+        self.dead = False
+        self.closed = False
+        self.pings = 0
+
+    def ping(self):
+        self.pings += 1
+        if self.dead:
+            raise MySQLdb.OperationalError(2006, "MySQL server has gone away")
+
+    def close(self):
+        self.closed = True
+
+class FakePool(connection_pool.ConnectionPool):
+    """FakePool class opening FakeConnection objects
+
+    Attributes:
+        opened (list):          every connection opened, in order
+        fail_connect (bool):    connect fails when set
+
+    """
+
+    def __init__(self, **kwargs):
+        self.opened = []
+        self.fail_connect = False
+        connection_pool.ConnectionPool.__init__(self, 'user', 'pass', 'host',
+            'db', **kwargs)
+
+    def connect(self):
+        if self.fail_connect:
+            raise data_manager_exceptions.DBConnectionError("Cannot connect \
+to MySQL server")
+
+        conn = FakeConnection()
+        self.opened.append(conn)
+        return conn
+
+class ConnectionPoolTest(unittest.TestCase):
+    """ConnectionPoolTest class checking pool accounting"""
+
+    def test_min_size_opened_up_front(self):
+        pool = FakePool(min_size=2, max_size=4)
+
+        stats = pool.get_stats()
+        self.assertEqual(len(pool.opened), 2)
+        self.assertEqual((stats['size'], stats['idle'], stats['in_use']),
+            (2, 2, 0))
+
+    def test_rejects_bad_sizes(self):
+        self.assertRaises(data_manager_exceptions.DBValueError, FakePool,
+            min_size=3, max_size=2)
+        self.assertRaises(data_manager_exceptions.DBValueError, FakePool,
+            min_size=0, max_size=0)
+
+    def test_acquire_release_accounting(self):
+        pool = FakePool(min_size=1, max_size=3)
+
+        first = pool.acquire()
+        second = pool.acquire()
+        stats = pool.get_stats()
+        self.assertEqual((stats['size'], stats['idle'], stats['in_use']),
+            (2, 0, 2))
+
+        pool.release(second)
+        pool.release(first)
+        stats = pool.get_stats()
+        self.assertEqual((stats['size'], stats['idle'], stats['in_use']),
+            (2, 2, 0))
+        self.assertEqual(stats['checkouts'], 2)
+
+        # most recently released first
+        self.assertTrue(pool.acquire() is first)
+
+    def test_discard_shrinks_pool(self):
+        pool = FakePool(min_size=0, max_size=2)
+
+        conn = pool.acquire()
+        pool.release(conn, discard=True)
+
+        stats = pool.get_stats()
+        self.assertTrue(conn.closed)
+        self.assertEqual((stats['size'], stats['idle'], stats['in_use']),
+            (0, 0, 0))
+
+    def test_timeout_when_exhausted(self):
+        pool = FakePool(min_size=0, max_size=1, wait_timeout=0.05)
+
+        pool.acquire()
+        self.assertRaises(data_manager_exceptions.DBConnectionError,
+            pool.acquire)
+        self.assertEqual(pool.get_stats()['timeouts'], 1)
+
+    def test_waiter_gets_released_connection(self):
+        pool = FakePool(min_size=0, max_size=1, wait_timeout=5)
+        conn = pool.acquire()
+        acquired = []
+
+        waiter = threading.Thread(target=lambda: acquired.append(
+            pool.acquire()))
+        waiter.start()
+        pool.release(conn)
+        waiter.join(5)
+
+        self.assertEqual(acquired, [conn])
+        self.assertEqual(pool.get_stats()['in_use'], 1)
+
+    def test_failed_connect_frees_slot(self):
+        pool = FakePool(min_size=0, max_size=1)
+        pool.fail_connect = True
+
+        self.assertRaises(data_manager_exceptions.DBConnectionError,
+            pool.acquire)
+        stats = pool.get_stats()
+        self.assertEqual((stats['size'], stats['in_use']), (0, 0))
+
+        pool.fail_connect = False
+        pool.acquire()
+        self.assertEqual(pool.get_stats()['size'], 1)
+
+    def test_replace_swaps_connection(self):
+        pool = FakePool(min_size=1, max_size=1)
+
+        conn = pool.acquire()
+        new = pool.replace(conn)
+
+        stats = pool.get_stats()
+        self.assertTrue(conn.closed)
+        self.assertFalse(new is conn)
+        self.assertEqual((stats['size'], stats['in_use']), (1, 1))
+
+    def test_check_pings_once_per_interval(self):
+        pool = FakePool(min_size=0, max_size=1, ping_interval=60)
+
+        conn = pool.acquire()
+        self.assertTrue(pool.check(conn) is conn)
+        self.assertTrue(pool.check(conn) is conn)
+        self.assertEqual(conn.pings, 1)
+
+        pool.check(conn, force=True)
+        self.assertEqual(conn.pings, 2)
+
+    def test_check_replaces_dead_connection(self):
+        pool = FakePool(min_size=0, max_size=1, ping_interval=0)
+
+        conn = pool.acquire()
+        conn.dead = True
+        new = pool.check(conn)
+
+        stats = pool.get_stats()
+        self.assertFalse(new is conn)
+        self.assertTrue(conn.closed)
+        self.assertEqual((stats['reconnects'], stats['in_use'],
+            stats['size']), (1, 1, 1))
+
+    def test_idle_connections_above_min_size_expire(self):
+        pool = FakePool(min_size=1, max_size=3, max_idle=-1)
+
+        conns = [pool.acquire() for _ in range(3)]
+        for conn in conns:
+            pool.release(conn)
+
+        pool.release(pool.acquire())
+        stats = pool.get_stats()
+        self.assertEqual((stats['size'], stats['idle']), (1, 1))
+        self.assertEqual(sum(conn.closed for conn in conns), 2)
+
+    def test_concurrent_checkouts_stay_consistent(self):
+        pool = FakePool(min_size=0, max_size=4, wait_timeout=5,
+            ping_interval=0)
+        errors = []
+
+        def work():
+            try:
+                for _ in range(200):
+                    conn = pool.check(pool.acquire())
+                    pool.release(conn)
+            except Exception as error:
+                errors.append(error)
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(30)
+
+        stats = pool.get_stats()
+        self.assertEqual(errors, [])
+        self.assertEqual(stats['in_use'], 0)
+        self.assertEqual(stats['checkouts'], 1600)
+        self.assertEqual(stats['pings'], 1600)
+        self.assertTrue(stats['size'] <= 4)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+"""Foosball Downsampling Tests
+
+Example:
+    python -m unittest discover -s tests -t .
+
+"""
+
+import unittest
+
+import utils.downsample as downsample
+
+class LttbTest(unittest.TestCase):
+    """LttbTest class checking largest-triangle-three-buckets"""
+
+    def setUp(self):
+        self.points = [(x, (x * 7919) % 101) for x in range(1000)]
+
+    def test_short_series_is_kept(self):
+        self.assertEqual(downsample.lttb(self.points[:10], 10),
+            self.points[:10])
+
+    def test_threshold_is_met(self):
+        sampled = downsample.lttb(self.points, 50)
+
+        self.assertEqual(len(sampled), 50)
+        self.assertEqual(sampled[0], self.points[0])
+        self.assertEqual(sampled[-1], self.points[-1])
+        self.assertEqual(sampled, sorted(sampled))
+        self.assertTrue(set(sampled) <= set(self.points))
+
+    def test_small_threshold_keeps_ends(self):
+        self.assertEqual(downsample.lttb(self.points, 2),
+            [self.points[0], self.points[-1]])
+        self.assertEqual(downsample.lttb(self.points, 1), [self.points[0]])
+        self.assertEqual(downsample.lttb(self.points, 0), [])
+        self.assertEqual(downsample.lttb(self.points, -5), [])
+
+    def test_peak_is_kept(self):
+        points = [(x, 0) for x in range(100)]
+        points[37] = (37, 100)
+
+        self.assertIn((37, 100), downsample.lttb(points, 10))
+
+if __name__ == '__main__':
+    unittest.main()
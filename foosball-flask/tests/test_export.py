@@ -0,0 +1,91 @@
+"""Foosball Export Tests
+
+Example:
+    python -m unittest discover -s tests -t .
+
+"""
+
+import csv
+import datetime
+import decimal
+import json
+import unittest
+
+import utils.export as export
+
+COLUMNS = ('result_id', 'name', 'mu', 'time')
+
+ROWS = ((1, 'Ann', decimal.Decimal('25.5'),
+    datetime.datetime(2016, 5, 4, 3, 2, 1)), (2, 'Bob, Jr.', 1.25, None))
+
+class RowSource(object):
+    """RowSource class handing out rows one at a time and counting them
+
+    Args:
+        rows (tup):     row tuples
+
+    Attributes:
+        rows (tup):     row tuples
+        read (int):     rows handed out so far
+
+    """
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.read = 0
+
+    def __iter__(self):
+        for row in self.rows:
+            self.read += 1
+            yield row
+
+class ExportTest(unittest.TestCase):
+    """ExportTest class checking CSV and NDJSON lines"""
+
+    def test_csv_header_and_rows(self):
+        lines = list(export.write(COLUMNS, ROWS, 'csv'))
+
+        self.assertEqual(lines[0], 'result_id,name,mu,time\n')
+        self.assertEqual(lines[1:], ['1,Ann,25.5,2016-05-04T03:02:01\n',
+            '2,"Bob, Jr.",1.25,\n'])
+        self.assertEqual(list(csv.reader(lines))[2],
+            ['2', 'Bob, Jr.', '1.25', ''])
+
+    def test_csv_header_only_without_rows(self):
+        self.assertEqual(list(export.write(COLUMNS, [], 'csv')),
+            ['result_id,name,mu,time\n'])
+
+    def test_ndjson_rows(self):
+        lines = list(export.write(COLUMNS, ROWS, 'ndjson'))
+
+        self.assertEqual(len(lines), 2)
+        self.assertTrue(all(line.endswith('\n') for line in lines))
+        self.assertEqual(json.loads(lines[0]), {'result_id': 1,
+            'name': 'Ann', 'mu': 25.5, 'time': '2016-05-04T03:02:01'})
+        self.assertEqual(json.loads(lines[1]), {'result_id': 2,
+            'name': 'Bob, Jr.', 'mu': 1.25, 'time': None})
+
+    def test_rows_are_streamed(self):
+        for format_name, leading in (('csv', 1), ('ndjson', 0)):
+            source = RowSource(ROWS)
+            lines = export.write(COLUMNS, source, format_name)
+
+            for _ in range(leading):
+                next(lines)
+            self.assertEqual(source.read, 0)
+
+            next(lines)
+            self.assertEqual(source.read, 1)
+
+            self.assertEqual(len(list(lines)), 1)
+            self.assertEqual(source.read, 2)
+
+    def test_unknown_format(self):
+        self.assertRaises(ValueError, export.write, COLUMNS, ROWS, 'xml')
+
+    def test_every_format_is_handled(self):
+        for format_name in export.FORMATS:
+            self.assertTrue(list(export.write(COLUMNS, ROWS, format_name)))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+"""Foosball HTTP Cache Tests
+
+The decorator is applied to a bare Flask app reading versions from an
+in-memory stand-in for the data manager, so no MySQL server is needed.
+
+Example:
+    python -m unittest discover -s tests -t .
+
+"""
+
+import datetime
+import unittest
+
+import flask
+
+import utils.http_cache as http_cache
+
+class FakeData(object):
+    """FakeData class standing in for the data manager's versions
+
+    Attributes:
+        version (int):  stored data version
+        modified (obj): UTC datetime of the last bump
+        bump (bool):    bump the version while the view renders when set
+        renders (int):  times the view rendered
+
+    """
+
+    def __init__(self):
+        self.version = 7
+        self.modified = datetime.datetime(2016, 5, 4, 3, 2, 1)
+        self.bump = False
+        self.renders = 0
+
+    def get_data_version(self, name):
+        return self.version
+
+    def get_data_modified(self, name):
+        return self.modified
+
+    def get_data_stamp(self, name, refresh=False):
+        return self.version, self.modified
+
+class ConditionalGetTest(unittest.TestCase):
+    """ConditionalGetTest class checking 304 answers and validators"""
+
+    def setUp(self):
+        self.data = FakeData()
+        app = flask.Flask(__name__)
+
+        @app.route('/page', methods=['GET', 'POST'])
+        @http_cache.conditional_get(lambda: self.data, 'rev')
+        def page():
+            self.data.renders += 1
+            if self.data.bump:
+                self.data.version += 1
+            return 'page'
+
+        self.client = app.test_client()
+
+    def test_replayed_last_modified_is_not_modified(self):
+        first = self.client.get('/page')
+        self.assertEqual(first.status_code, 200)
+        self.assertTrue(first.headers.get('Last-Modified'))
+
+        second = self.client.get('/page', headers={
+            'If-Modified-Since': first.headers['Last-Modified']})
+        self.assertEqual(second.status_code, 304)
+        self.assertEqual(self.data.renders, 1)
+
+    def test_later_bump_is_modified(self):
+        first = self.client.get('/page')
+        self.data.modified += datetime.timedelta(seconds=1)
+
+        second = self.client.get('/page', headers={
+            'If-Modified-Since': first.headers['Last-Modified']})
+        self.assertEqual(second.status_code, 200)
+
+    def test_replayed_etag_is_not_modified(self):
+        first = self.client.get('/page')
+
+        second = self.client.get('/page', headers={
+            'If-None-Match': first.headers['ETag']})
+        self.assertEqual(second.status_code, 304)
+
+        # If-Modified-Since is ignored once an ETag is sent
+        self.data.version += 1
+        third = self.client.get('/page', headers={
+            'If-None-Match': first.headers['ETag'],
+            'If-Modified-Since': first.headers['Last-Modified']})
+        self.assertEqual(third.status_code, 200)
+
+    def test_bump_in_current_second_sends_no_last_modified(self):
+        self.data.modified = datetime.datetime.utcnow() + \
+            datetime.timedelta(minutes=1)
+
+        response = self.client.get('/page')
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.headers.get('Last-Modified'))
+        self.assertTrue(response.headers.get('ETag'))
+
+    def test_bump_while_rendering_sends_no_validators(self):
+        self.data.bump = True
+
+        response = self.client.get('/page')
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.headers.get('ETag'))
+        self.assertFalse(response.headers.get('Last-Modified'))
+
+    def test_other_methods_pass_through(self):
+        response = self.client.post('/page')
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.headers.get('ETag'))
+
+    def test_last_modified_waits_for_second_to_end(self):
+        now = datetime.datetime(2016, 5, 4, 3, 2, 1, 500000)
+
+        self.assertEqual(http_cache.last_modified(now.replace(microsecond=0),
+            now), None)
+        self.assertEqual(http_cache.last_modified(now, now), None)
+        earlier = datetime.datetime(2016, 5, 4, 3, 2, 0)
+        self.assertEqual(http_cache.last_modified(earlier, now), earlier)
+
+if __name__ == '__main__':
+    unittest.main()
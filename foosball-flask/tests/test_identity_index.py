@@ -0,0 +1,96 @@
+"""Foosball Identity Index Tests
+
+Example:
+    python -m unittest discover -s tests -t .
+
+"""
+
+import unittest
+
+import utils.identity_index as identity_index
+
+# (player_id, first_name, last_name, nickname) rows
+PLAYERS = ((1, 'Ann', 'Lee', 'Ace'), (2, 'Bob', 'Kim', ''),
+    (3, 'Cy', 'Orr', 'Wall'))
+
+# (team_id, player_one_id, player_two_id) rows
+TEAMS = ((10, 2, 1),)
+
+class IdentityIndexTest(unittest.TestCase):
+    """IdentityIndexTest class checking lookups and versioned changes"""
+
+    def setUp(self):
+        self.index = identity_index.IdentityIndex()
+        self.index.load(4, PLAYERS, TEAMS)
+
+    def test_team_key_is_unordered(self):
+        self.assertEqual(identity_index.team_key(7, 3), (3, 7))
+        self.assertEqual(identity_index.team_key(3, 7), (3, 7))
+
+    def test_lookups(self):
+        self.assertEqual(self.index.get_player_id(['Ann', 'Lee', 'Ace']), 1)
+        self.assertEqual(self.index.get_player_id(('Ann', 'Lee', '')), None)
+        self.assertEqual(self.index.get_team_id(1, 2), 10)
+        self.assertEqual(self.index.get_team_id(1, 3), None)
+
+        stats = self.index.get_stats()
+        self.assertEqual((stats['version'], stats['players'], stats['teams'],
+            stats['hits'], stats['misses'], stats['reloads']),
+            (4, 3, 1, 2, 2, 1))
+
+    def test_uncommitted_changes_seen_by_their_transaction(self):
+        changes = identity_index.IdentityChanges(4)
+        changes.players[('Dee', 'Fox', '')] = 4
+        changes.players[('Ann', 'Lee', 'Ace')] = None
+        changes.teams[(1, 3)] = 11
+
+        self.assertEqual(self.index.get_player_id(('Dee', 'Fox', ''),
+            changes), 4)
+        self.assertEqual(self.index.get_player_id(('Ann', 'Lee', 'Ace'),
+            changes), None)
+        self.assertEqual(self.index.get_team_id(3, 1, changes), 11)
+
+        # other transactions still see the committed index
+        self.assertEqual(self.index.get_player_id(('Dee', 'Fox', '')), None)
+        self.assertEqual(self.index.get_player_id(('Ann', 'Lee', 'Ace')), 1)
+
+    def test_apply_at_base_version(self):
+        changes = identity_index.IdentityChanges(4)
+        changes.version = 5
+        changes.players[('Dee', 'Fox', '')] = 4
+        changes.players[('Bob', 'Kim', '')] = None
+        changes.teams[(1, 2)] = None
+        changes.teams[(3, 4)] = 12
+
+        self.assertTrue(self.index.apply(changes))
+        self.assertEqual(self.index.version, 5)
+        self.assertEqual(self.index.get_player_id(('Dee', 'Fox', '')), 4)
+        self.assertEqual(self.index.get_player_id(('Bob', 'Kim', '')), None)
+        self.assertEqual(self.index.get_team_id(2, 1), None)
+        self.assertEqual(self.index.get_team_id(4, 3), 12)
+
+    def test_apply_skipped_after_another_writer(self):
+        changes = identity_index.IdentityChanges(3)
+        changes.version = 5
+        changes.players[('Dee', 'Fox', '')] = 4
+
+        self.assertFalse(self.index.apply(changes))
+        self.assertEqual(self.index.version, 4)
+        self.assertEqual(self.index.get_player_id(('Dee', 'Fox', '')), None)
+
+    def test_apply_skipped_before_load(self):
+        index = identity_index.IdentityIndex()
+        changes = identity_index.IdentityChanges(None)
+
+        self.assertFalse(index.apply(changes))
+        self.assertEqual(index.version, None)
+
+    def test_load_replaces_contents(self):
+        self.index.load(9, PLAYERS[:1], ())
+
+        self.assertEqual(self.index.get_player_id(('Bob', 'Kim', '')), None)
+        self.assertEqual(self.index.get_team_id(1, 2), None)
+        self.assertEqual(self.index.get_stats()['reloads'], 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,128 @@
+"""Foosball Matchmaking Tests
+
+These tests check lineup search against brute force trueskill.quality over
+every lineup of a small pool.
+
+Example:
+    python -m unittest discover -s tests -t .
+
+"""
+
+import itertools
+import random
+import unittest
+
+import trueskill
+
+import utils.matchmaking as matchmaking
+
+# largest difference allowed between matchmaking and trueskill
+TOLERANCE = 1e-9
+
+# players in the exhaustively searched pool
+POOL = 7
+
+def random_rating(generator):
+    """Draw a rating around the default environment's
+
+    Args:
+        generator (obj):    random.Random
+
+    Returns:
+        rating (obj):       trueskill rating
+
+    """
+
+    return trueskill.Rating(mu=generator.uniform(10.0, 40.0),
+        sigma=generator.uniform(1.0, 8.0))
+
+class MatchmakingTest(unittest.TestCase):
+    """MatchmakingTest class comparing lineups with trueskill quality"""
+
+    def setUp(self):
+        generator = random.Random(22)
+        self.env = trueskill.TrueSkill()
+        self.offense = [random_rating(generator) for _ in range(POOL)]
+        self.defense = [random_rating(generator) for _ in range(POOL)]
+
+    def brute_force(self):
+        """Score every lineup of the pool with trueskill.quality
+
+        Lineups only differing by which team is listed first are kept once.
+
+        Args:
+            None
+
+        Returns:
+            scores (dict):  frozenset of both (offense, defense) teams to
+                            match quality
+
+        """
+
+        scores = {}
+        for lineup in itertools.permutations(range(POOL), 4):
+            teams = frozenset((lineup[:2], lineup[2:]))
+            if teams not in scores:
+                scores[teams] = self.env.quality([
+                    (self.offense[lineup[0]], self.defense[lineup[1]]),
+                    (self.offense[lineup[2]], self.defense[lineup[3]])])
+
+        return scores
+
+    def test_quality_matches_trueskill(self):
+        team_one = self.offense[:2]
+        team_two = self.defense[2:4]
+
+        self.assertAlmostEqual(matchmaking.quality(team_one, team_two,
+            self.env), self.env.quality([team_one, team_two]),
+            delta=TOLERANCE)
+
+    def test_best_lineups_match_brute_force(self):
+        scores = self.brute_force()
+        expected = sorted(scores.values(), reverse=True)[:10]
+
+        lineups = matchmaking.best_lineups(self.offense, self.defense,
+            top=10, env=self.env)
+
+        self.assertEqual(len(lineups), 10)
+        for want, (score, lineup) in zip(expected, lineups):
+            self.assertAlmostEqual(want, score, delta=TOLERANCE)
+            self.assertEqual(len(set(lineup)), 4)
+            self.assertAlmostEqual(scores[frozenset((lineup[:2],
+                lineup[2:]))], score, delta=TOLERANCE)
+
+    def test_every_lineup_returned_once(self):
+        lineups = matchmaking.best_lineups(self.offense, self.defense,
+            top=10000, env=self.env)
+
+        self.assertEqual(len(lineups), len(self.brute_force()))
+
+    def test_large_pool_scores_match_trueskill(self):
+        generator = random.Random(23)
+        size = matchmaking.EXHAUSTIVE_POOL + 6
+        offense = [random_rating(generator) for _ in range(size)]
+        defense = [random_rating(generator) for _ in range(size)]
+
+        lineups = matchmaking.best_lineups(offense, defense, top=5,
+            env=self.env)
+
+        self.assertEqual(len(lineups), 5)
+        for score, lineup in lineups:
+            self.assertEqual(len(set(lineup)), 4)
+            self.assertAlmostEqual(self.env.quality([
+                (offense[lineup[0]], defense[lineup[1]]),
+                (offense[lineup[2]], defense[lineup[3]])]), score,
+                delta=TOLERANCE)
+
+    def test_nothing_returned_for_top_below_one(self):
+        self.assertEqual(matchmaking.best_lineups(self.offense, self.defense,
+            top=0), [])
+        self.assertEqual(matchmaking.best_lineups(self.offense, self.defense,
+            top=-3), [])
+
+    def test_nothing_returned_for_small_pool(self):
+        self.assertEqual(matchmaking.best_lineups(self.offense[:3],
+            self.defense[:3]), [])
+
+if __name__ == '__main__':
+    unittest.main()
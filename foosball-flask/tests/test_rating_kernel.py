@@ -0,0 +1,160 @@
+"""Foosball Rating Kernel Tests
+
+These tests check the closed-form rating kernel against the trueskill
+library, and the batch functions against the scalar ones.
+
+Example:
+    python -m unittest discover -s tests -t .
+
+"""
+
+import random
+import unittest
+
+import numpy
+import trueskill
+
+import utils.rating_kernel as rating_kernel
+
+# largest difference allowed between the kernel and trueskill
+TOLERANCE = 1e-9
+
+# random games checked by every test
+GAMES = 200
+
+def random_rating(generator):
+    """Draw a rating around the default environment's
+
+    Args:
+        generator (obj):    random.Random
+
+    Returns:
+        rating (obj):       trueskill rating
+
+    """
+
+    return trueskill.Rating(mu=generator.uniform(0.0, 50.0),
+        sigma=generator.uniform(0.5, 9.0))
+
+class RatingKernelTest(unittest.TestCase):
+    """RatingKernelTest class comparing the kernel with trueskill"""
+
+    def setUp(self):
+        self.generator = random.Random(20)
+
+    def assert_ratings_equal(self, expected, actual):
+        """Assert two sequences of ratings agree within TOLERANCE
+
+        Args:
+            expected (tup):     trueskill ratings
+            actual (tup):       kernel ratings
+
+        Returns:
+            None
+
+        """
+
+        self.assertEqual(len(expected), len(actual))
+        for want, got in zip(expected, actual):
+            self.assertAlmostEqual(want.mu, got.mu, delta=TOLERANCE)
+            self.assertAlmostEqual(want.sigma, got.sigma, delta=TOLERANCE)
+
+    def test_rate_2vs2(self):
+        for _ in range(GAMES):
+            winners = (random_rating(self.generator),
+                random_rating(self.generator))
+            losers = (random_rating(self.generator),
+                random_rating(self.generator))
+
+            expected = trueskill.rate([winners, losers], ranks=[0, 1])
+            actual = rating_kernel.rate_2vs2(winners, losers)
+
+            self.assert_ratings_equal(expected[0], actual[0])
+            self.assert_ratings_equal(expected[1], actual[1])
+
+    def test_rate_1vs1(self):
+        for _ in range(GAMES):
+            winner = random_rating(self.generator)
+            loser = random_rating(self.generator)
+
+            self.assert_ratings_equal(trueskill.rate_1vs1(winner, loser),
+                rating_kernel.rate_1vs1(winner, loser))
+
+    def test_win_probability(self):
+        env = trueskill.global_env()
+        for _ in range(GAMES):
+            team_one = (random_rating(self.generator),
+                random_rating(self.generator))
+            team_two = (random_rating(self.generator),
+                random_rating(self.generator))
+
+            # between teams of equal means quality is sqrt(n beta^2 / c^2),
+            # which gives the deviation c of the performance difference
+            level = [[trueskill.Rating(mu=0.0, sigma=rating.sigma)
+                for rating in team] for team in (team_one, team_two)]
+            c = numpy.sqrt(4 * env.beta ** 2) / trueskill.quality(level)
+            delta = sum(rating.mu for rating in team_one) - \
+                sum(rating.mu for rating in team_two)
+
+            probability = rating_kernel.win_probability(team_one, team_two)
+            self.assertAlmostEqual(probability, env.cdf(delta / c),
+                delta=TOLERANCE)
+            self.assertAlmostEqual(probability +
+                rating_kernel.win_probability(team_two, team_one), 1.0,
+                delta=TOLERANCE)
+
+    def test_rate_batch_matches_scalar(self):
+        games = [[random_rating(self.generator) for _ in range(4)]
+            for _ in range(GAMES)]
+
+        mu, sigma = rating_kernel.rate_2vs2_batch(
+            [[rating.mu for rating in game] for game in games],
+            [[rating.sigma for rating in game] for game in games])
+
+        for number, game in enumerate(games):
+            winners, losers = rating_kernel.rate_2vs2(game[:2], game[2:])
+            for seat, rating in enumerate(winners + losers):
+                self.assertAlmostEqual(rating.mu, mu[number, seat],
+                    delta=TOLERANCE)
+                self.assertAlmostEqual(rating.sigma, sigma[number, seat],
+                    delta=TOLERANCE)
+
+    def test_rate_arrays_per_game_environment(self):
+        games = [[random_rating(self.generator) for _ in range(2)]
+            for _ in range(GAMES)]
+        envs = [trueskill.TrueSkill(beta=self.generator.uniform(1.0, 8.0),
+            tau=self.generator.uniform(0.0, 0.5), draw_probability=0.0)
+            for _ in games]
+
+        mu, sigma = rating_kernel.rate_arrays(
+            [[rating.mu for rating in game] for game in games],
+            [[rating.sigma for rating in game] for game in games], 1,
+            numpy.array([env.beta for env in envs]),
+            numpy.array([env.tau for env in envs]),
+            numpy.array([trueskill.calc_draw_margin(env.draw_probability, 2,
+            env) for env in envs]))
+
+        for number, (game, env) in enumerate(zip(games, envs)):
+            winner, loser = rating_kernel.rate_1vs1(game[0], game[1],
+                env=env)
+            for seat, rating in enumerate((winner, loser)):
+                self.assertAlmostEqual(rating.mu, mu[number, seat],
+                    delta=TOLERANCE)
+                self.assertAlmostEqual(rating.sigma, sigma[number, seat],
+                    delta=TOLERANCE)
+
+    def test_win_probability_arrays_matches_scalar(self):
+        games = [[random_rating(self.generator) for _ in range(4)]
+            for _ in range(GAMES)]
+
+        probabilities = rating_kernel.win_probability_arrays(
+            [[rating.mu for rating in game] for game in games],
+            [[rating.sigma for rating in game] for game in games], 2,
+            trueskill.global_env().beta)
+
+        for game, probability in zip(games, probabilities):
+            self.assertAlmostEqual(rating_kernel.win_probability(game[:2],
+                game[2:]), probability, delta=TOLERANCE)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+"""Foosball Read Cache Tests
+
+Example:
+    python -m unittest discover -s tests -t .
+
+"""
+
+import unittest
+
+import utils.read_cache as read_cache
+
+class ReadCacheTest(unittest.TestCase):
+    """ReadCacheTest class checking versioned caching"""
+
+    def setUp(self):
+        self.cache = read_cache.ReadCache(max_size=2)
+
+    def test_hit_after_put(self):
+        self.assertEqual(self.cache.get(1, 'ranks'), (False, None))
+        self.cache.put(1, 'ranks', [1, 2])
+
+        self.assertEqual(self.cache.get(1, 'ranks'), (True, [1, 2]))
+        stats = self.cache.get_stats()
+        self.assertEqual((stats['hits'], stats['misses']), (1, 1))
+
+    def test_newer_version_invalidates(self):
+        self.cache.put(1, 'ranks', 'old')
+
+        self.assertEqual(self.cache.get(2, 'ranks'), (False, None))
+        stats = self.cache.get_stats()
+        self.assertEqual((stats['version'], stats['size'],
+            stats['invalidations']), (2, 0, 1))
+
+    def test_older_version_is_not_cached(self):
+        self.cache.put(2, 'ranks', 'new')
+
+        # a reader still at version 1 neither sees nor stores entries
+        self.assertEqual(self.cache.get(1, 'ranks'), (False, None))
+        self.cache.put(1, 'ranks', 'old')
+        self.assertEqual(self.cache.get(2, 'ranks'), (True, 'new'))
+
+    def test_least_recently_used_evicted(self):
+        self.cache.put(1, 'a', 1)
+        self.cache.put(1, 'b', 2)
+        self.cache.get(1, 'a')
+        self.cache.put(1, 'c', 3)
+
+        self.assertEqual(self.cache.get(1, 'b'), (False, None))
+        self.assertEqual(self.cache.get(1, 'a'), (True, 1))
+        self.assertEqual(self.cache.get(1, 'c'), (True, 3))
+        self.assertEqual(self.cache.get_stats()['evictions'], 1)
+
+    def test_clear_keeps_version(self):
+        self.cache.put(3, 'ranks', 'value')
+        self.cache.clear()
+
+        self.assertEqual(self.cache.get(3, 'ranks'), (False, None))
+        self.assertEqual(self.cache.get_stats()['version'], 3)
+
+if __name__ == '__main__':
+    unittest.main()
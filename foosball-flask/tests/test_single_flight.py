@@ -0,0 +1,123 @@
+"""Foosball Single Flight Tests
+
+Example:
+    python -m unittest discover -s tests -t .
+
+"""
+
+import threading
+import time
+import unittest
+
+import utils.single_flight as single_flight
+
+# callers joining the leader's computation
+FOLLOWERS = 5
+
+# seconds any test waits on a thread at most
+TIMEOUT = 5
+
+class SingleFlightTest(unittest.TestCase):
+    """SingleFlightTest class checking leader and follower behavior"""
+
+    def setUp(self):
+        self.flight = single_flight.SingleFlight()
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def run_callers(self, function):
+        """Run a leader and FOLLOWERS callers for the same key
+
+        The leader's computation blocks until every follower is waiting on
+        it.
+
+        Args:
+            function (func):    computation run by the leader
+
+        Returns:
+            outcomes (list):    ('result', value) or ('error', exception) of
+                                every caller
+
+        """
+
+        outcomes = []
+        lock = threading.Lock()
+
+        def call():
+            try:
+                value = self.flight.do('key', function)
+            except Exception as error:
+                outcome = ('error', error)
+            else:
+                outcome = ('result', value)
+            with lock:
+                outcomes.append(outcome)
+
+        leader = threading.Thread(target=call)
+        leader.start()
+        self.assertTrue(self.started.wait(TIMEOUT))
+
+        followers = [threading.Thread(target=call) for _ in range(FOLLOWERS)]
+        for follower in followers:
+            follower.start()
+
+        while self.flight.get_stats()['coalesced'] < FOLLOWERS:
+            time.sleep(0.001)
+
+        self.release.set()
+        for thread in [leader] + followers:
+            thread.join(TIMEOUT)
+
+        return outcomes
+
+    def test_followers_share_result(self):
+        def compute():
+            self.started.set()
+            self.release.wait(TIMEOUT)
+            return object()
+
+        outcomes = self.run_callers(compute)
+
+        self.assertEqual(len(outcomes), FOLLOWERS + 1)
+        self.assertEqual(len(set(id(value) for _, value in outcomes)), 1)
+        stats = self.flight.get_stats()
+        self.assertEqual((stats['calls'], stats['executions'],
+            stats['coalesced'], stats['in_flight']),
+            (FOLLOWERS + 1, 1, FOLLOWERS, 0))
+
+    def test_followers_share_error(self):
+        def compute():
+            self.started.set()
+            self.release.wait(TIMEOUT)
+            raise ValueError("build failed")
+
+        outcomes = self.run_callers(compute)
+
+        self.assertEqual([kind for kind, _ in outcomes],
+            ['error'] * (FOLLOWERS + 1))
+        self.assertEqual(len(set(id(error) for _, error in outcomes)), 1)
+        stats = self.flight.get_stats()
+        self.assertEqual((stats['errors'], stats['in_flight']), (1, 0))
+
+    def test_finished_flight_is_not_reused(self):
+        results = iter([1, 2])
+
+        self.assertEqual(self.flight.do('key', lambda: next(results)), 1)
+        self.assertEqual(self.flight.do('key', lambda: next(results)), 2)
+        self.assertEqual(self.flight.get_stats()['executions'], 2)
+
+    def test_error_does_not_block_next_call(self):
+        def fail():
+            raise ValueError("build failed")
+
+        self.assertRaises(ValueError, self.flight.do, 'key', fail)
+        self.assertEqual(self.flight.do('key', lambda: 'ok'), 'ok')
+
+    def test_different_keys_run_separately(self):
+        self.assertEqual(self.flight.do(1, lambda value: value, 'a'), 'a')
+        self.assertEqual(self.flight.do(2, lambda value=None: value,
+            value='b'), 'b')
+        self.assertEqual(self.flight.get_stats()['executions'], 2)
+
+if __name__ == '__main__':
+    unittest.main()
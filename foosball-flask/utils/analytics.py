@@ -0,0 +1,174 @@
+"""Foosball Analytics
+
+These functions count, for every pair of players, the games they played
+against each other and the games they played together. The result table is
+read once into integer columns and every matrix is built with one bincount
+per pair of seats, so the cost grows with the number of games only once.
+
+Matrices are indexed by position, then by player, then by the other player.
+A player's position is the seat they played in, the other player's position
+is not distinguished.
+
+"""
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# matrix index of each result seat's position
+SEAT_POSITIONS = (0, 1, 0, 1)
+
+class PlayerMatrices(object):
+    """PlayerMatrices class holding head to head and partner counts
+
+    Args:
+        player_ids (list):      player_id of every matrix row and column
+        games (obj):            games x 4 integer array of the offense winner,
+                                defense winner, offense loser and defense
+                                loser player indexes
+
+    Attributes:
+        player_ids (list):      player_id of every matrix row and column
+        index (dict):           matrix index of every player_id
+        opponent_wins (obj):    positions x players x players array of games
+                                won against each opponent
+        opponent_losses (obj):  positions x players x players array of games
+                                lost against each opponent
+        partner_wins (obj):     positions x players x players array of games
+                                won with each teammate
+        partner_losses (obj):   positions x players x players array of games
+                                lost with each teammate
+
+    Raises:
+        ImportError
+
+    """
+
+    def __init__(self, player_ids, games):
+        if numpy is None:
+            raise ImportError("Install numpy to build player matrices")
+
+        self.player_ids = list(player_ids)
+        self.index = dict((player_id, index)
+            for index, player_id in enumerate(self.player_ids))
+
+        games = numpy.asarray(games, dtype=numpy.int64).reshape(-1, 4)
+        size = len(self.player_ids)
+
+        self.opponent_wins = self._count(games, size, (0, 1), (2, 3))
+        self.opponent_losses = self._count(games, size, (2, 3), (0, 1))
+        self.partner_wins = self._count(games, size, (0, 1), None)
+        self.partner_losses = self._count(games, size, (2, 3), None)
+
+    @staticmethod
+    def _count(games, size, seats, others):
+        """Count games between the players of two sets of seats
+
+        Args:
+            games (obj):        games x 4 array of player indexes
+            size (int):         number of players
+            seats (tup):        seats counted from
+            others (tup):       seats counted against, the teammate's seat
+                                if None
+
+        Returns:
+            counts (obj):       positions x players x players array
+
+        """
+
+        counts = numpy.zeros((2, size * size), dtype=numpy.int64)
+        for seat in seats:
+            if others is None:
+                against = (seat ^ 1,)
+            else:
+                against = others
+            for other in against:
+                counts[SEAT_POSITIONS[seat]] += numpy.bincount(
+                    games[:, seat] * size + games[:, other],
+                    minlength=size * size)
+
+        return counts.reshape(2, size, size)
+
+    def get_opponents(self, player_id, position):
+        """Get a player's record against every opponent
+
+        Args:
+            player_id (int):    player_id
+            position (int):     0 for offense, 1 for defense
+
+        Returns:
+            opponents (list):   (player_id, wins, losses) of every opponent,
+                                most games first
+
+        """
+
+        return self._get_record(self.opponent_wins, self.opponent_losses,
+            player_id, position)
+
+    def get_partners(self, player_id, position):
+        """Get a player's record with every teammate
+
+        Args:
+            player_id (int):    player_id
+            position (int):     0 for offense, 1 for defense
+
+        Returns:
+            partners (list):    (player_id, wins, losses) of every teammate,
+                                most games first
+
+        """
+
+        return self._get_record(self.partner_wins, self.partner_losses,
+            player_id, position)
+
+    def _get_record(self, wins, losses, player_id, position):
+        """Get the non empty records of one matrix row
+
+        Args:
+            wins (obj):         matrix of wins
+            losses (obj):       matrix of losses
+            player_id (int):    player_id
+            position (int):     0 for offense, 1 for defense
+
+        Returns:
+            records (list):     (player_id, wins, losses), most games first
+
+        """
+
+        index = self.index.get(player_id)
+        if index is None:
+            return []
+
+        row_wins = wins[position, index]
+        row_losses = losses[position, index]
+        played = numpy.nonzero(row_wins + row_losses)[0]
+        played = played[numpy.argsort(-(row_wins + row_losses)[played],
+            kind='mergesort')]
+
+        return [(self.player_ids[other], int(row_wins[other]),
+            int(row_losses[other])) for other in played]
+
+def build(rows):
+    """Build the player matrices of a result history
+
+    Args:
+        rows (list):    (offense winner, defense winner, offense loser,
+                        defense loser) player_ids of every result
+
+    Returns:
+        matrices (obj): PlayerMatrices
+
+    Raises:
+        ImportError
+
+    """
+
+    if numpy is None:
+        raise ImportError("Install numpy to build player matrices")
+
+    columns = numpy.asarray(rows, dtype=numpy.int64).reshape(-1, 4)
+    player_ids, games = numpy.unique(columns, return_inverse=True)
+
+    return PlayerMatrices([int(player_id) for player_id in player_ids],
+        games.reshape(-1, 4))
@@ -0,0 +1,259 @@
+"""Foosball Benchmarks
+
+This script seeds a scratch database with synthetic players and results and
+reports query counts and latency for the data manager's read paths. It also
+compares the rating kernel against the trueskill package, which needs no
+database.
+
+Example:
+    python benchmark.py --db_name foosball_bench rankings 100 1000 10000
+    python benchmark.py kernel 10000
+
+"""
+
+import argparse
+import random
+import sys
+import time
+
+import trueskill
+
+import data_manager
+import rating_kernel
+
+GAMES_PER_PLAYER = 10
+REPEAT = 5
+
+# largest difference in mu or sigma tolerated between the rating kernel and
+# the trueskill package
+KERNEL_TOLERANCE = 1e-9
+
+def seed_players(data_mgr, target):
+    """Grow the scratch league to the target player count
+
+    New players get default ratings and GAMES_PER_PLAYER random results
+    each, inserted with multi-row statements.
+
+    Args:
+        data_mgr (obj): DataManager connected to the scratch database
+        target (int):   number of players wanted
+
+    Returns:
+        None
+
+    """
+
+    cursor = data_mgr.db_conn.cursor()
+    cursor.execute("SELECT COUNT(player_id) FROM player")
+    existing = cursor.fetchone()[0]
+
+    if existing >= target:
+        return
+
+    default = trueskill.Rating()
+    new_players = target - existing
+
+    cursor.executemany("INSERT INTO player (first_name, last_name, nickname, \
+offense_mu, offense_sigma, defense_mu, defense_sigma) VALUES \
+(%s, %s, %s, %s, %s, %s, %s)",
+        [("Bench{0}".format(existing + index), "Player", "", default.mu,
+        default.sigma, default.mu, default.sigma)
+        for index in range(new_players)])
+
+    cursor.execute("SELECT player_id FROM player")
+    player_ids = [row[0] for row in cursor.fetchall()]
+
+    games = []
+    for _ in range(new_players * GAMES_PER_PLAYER // 4):
+        games.append(tuple(random.sample(player_ids, 4)))
+
+    cursor.executemany("INSERT INTO result (offense_winner, defense_winner, \
+offense_loser, defense_loser) VALUES (%s, %s, %s, %s)", games)
+
+    data_mgr.rebuild_standings()
+    data_mgr.commit_data()
+
+def time_call(data_mgr, method):
+    """Time a data manager read and count the statements it runs
+
+    The read cache is cleared before every call, so each one reaches the
+    database.
+
+    Args:
+        data_mgr (obj):     DataManager connected to the scratch database
+        method (str):       name of the DataManager method to call
+
+    Returns:
+        queries (int):      statements executed per call
+        latency (float):    best wall time per call in milliseconds
+
+    """
+
+    best = None
+    queries = 0
+
+    for _ in range(REPEAT):
+        data_mgr.read_cache.clear()
+        executes = data_mgr.get_statement_stats()['executes']
+        start = time.time()
+        getattr(data_mgr, method)()
+        elapsed = (time.time() - start) * 1000
+        queries = data_mgr.get_statement_stats()['executes'] - executes
+        best = elapsed if best is None else min(best, elapsed)
+
+    return queries, best
+
+def rankings(data_mgr, sizes):
+    """Benchmark the dashboard ranking reads at growing league sizes
+
+    Args:
+        data_mgr (obj): DataManager connected to the scratch database
+        sizes (list):   player counts to measure
+
+    Returns:
+        None
+
+    """
+
+    print "{0:>8} {1:>8} {2:>8} {3:>10}".format("players", "results",
+        "queries", "ms")
+
+    for size in sorted(sizes):
+        seed_players(data_mgr, size)
+        queries, latency = time_call(data_mgr, 'get_individual_rankings')
+        print "{0:>8} {1:>8} {2:>8} {3:>10.2f}".format(size,
+            data_mgr.get_total_results(), queries, latency)
+
+def random_games(count, players):
+    """Draw random ratings for independent games
+
+    Args:
+        count (int):    number of games
+        players (int):  players per game
+
+    Returns:
+        games (list):   lists of trueskill ratings, winners first
+
+    """
+
+    default = trueskill.Rating()
+
+    return [[trueskill.Rating(mu=random.uniform(0, 2 * default.mu),
+        sigma=random.uniform(default.sigma / 10, default.sigma))
+        for _ in range(players)] for _ in range(count)]
+
+def kernel(count):
+    """Compare the rating kernel with the trueskill package
+
+    Every game is rated by trueskill and by the kernel's scalar and batch
+    paths. Games trueskill cannot rate, because the upset is too large for
+    its floating point checks, are skipped.
+
+    Args:
+        count (int):    games to rate per team size
+
+    Returns:
+        message (str):  error message if the kernel disagrees, else None
+
+    """
+
+    print "{0:>6} {1:>8} {2:>12} {3:>12} {4:>12} {5:>10}".format("game",
+        "games", "trueskill ms", "scalar ms", "batch ms", "max diff")
+
+    for name, team_size, reference, scalar in (
+        ('2vs2', 2, lambda game: sum(trueskill.rate([game[:2], game[2:]]),
+        ()), lambda game: sum(rating_kernel.rate_2vs2(game[:2], game[2:]),
+        ())), ('1vs1', 1, lambda game: trueskill.rate_1vs1(*game),
+        lambda game: rating_kernel.rate_1vs1(*game))):
+        games = []
+        for game in random_games(count, 2 * team_size):
+            try:
+                reference(game)
+            except FloatingPointError:
+                continue
+            games.append(game)
+
+        start = time.time()
+        expected = [reference(game) for game in games]
+        reference_time = (time.time() - start) * 1000
+
+        start = time.time()
+        results = [scalar(game) for game in games]
+        scalar_time = (time.time() - start) * 1000
+
+        mu = [[rating.mu for rating in game] for game in games]
+        sigma = [[rating.sigma for rating in game] for game in games]
+        start = time.time()
+        batch_mu, batch_sigma = rating_kernel.rate_batch(mu, sigma,
+            team_size)
+        batch_time = (time.time() - start) * 1000
+
+        difference = 0
+        for index, game in enumerate(expected):
+            for column, rating in enumerate(game):
+                difference = max(difference,
+                    abs(rating.mu - results[index][column].mu),
+                    abs(rating.sigma - results[index][column].sigma),
+                    abs(rating.mu - batch_mu[index][column]),
+                    abs(rating.sigma - batch_sigma[index][column]))
+
+        print "{0:>6} {1:>8} {2:>12.2f} {3:>12.2f} {4:>12.2f} {5:>10.1e}\
+".format(name, len(games), reference_time, scalar_time, batch_time,
+            difference)
+
+        if difference > KERNEL_TOLERANCE:
+            return "Rating kernel disagrees with trueskill on {0} games by \
+{1}".format(name, difference)
+
+def main():
+    """Main entry point
+
+    Args:
+        None
+
+    Returns:
+        None
+
+    """
+
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--db_user', default='foosball')
+    parser.add_argument('--db_pass', default='foosball')
+    parser.add_argument('--db_host', default='127.0.0.1')
+    parser.add_argument('--db_name',
+        help='scratch database, it will be filled with synthetic data')
+    subparsers = parser.add_subparsers(dest='benchmark')
+    rankings_parser = subparsers.add_parser('rankings',
+        help='individual ranking query count and latency')
+    rankings_parser.add_argument('sizes', type=int, nargs='+',
+        help='player counts to measure')
+    kernel_parser = subparsers.add_parser('kernel',
+        help='rating kernel agreement with trueskill and speed')
+    kernel_parser.add_argument('games', type=int,
+        help='games to rate per team size')
+    args = parser.parse_args()
+
+    if args.benchmark == 'kernel':
+        return kernel(args.games)
+
+    if args.db_name is None:
+        parser.error("--db_name is required for database benchmarks")
+
+    data_mgr = data_manager.DataManager(db_user=args.db_user,
+        db_pass=args.db_pass, db_host=args.db_host, db_name=args.db_name)
+
+    cursor = data_mgr.db_conn.cursor()
+    cursor.execute("SELECT COUNT(player_id) FROM player WHERE first_name NOT \
+LIKE 'Bench%'")
+
+    if cursor.fetchone()[0] != 0:
+        return "Aborting. {0} holds real players, use a scratch \
+database".format(args.db_name)
+
+    if args.benchmark == 'rankings':
+        rankings(data_mgr, args.sizes)
+
+    del data_mgr
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,331 @@
+"""Foosball Connection Pool
+
+This class hands out MySQL connections to concurrent worker threads.
+
+"""
+
+import MySQLdb
+import logging
+import threading
+import time
+import traceback
+
+import data_manager_exceptions
+
+LOGGER = logging.getLogger("foosball")
+
+class ConnectionPool(object):
+    """ConnectionPool class used to share MySQL connections between threads
+
+    Every connection is used by a single thread between acquire and release.
+    Idle connections are reused most recently released first, so the ones
+    left at the bottom of the stack age out and are closed once the pool is
+    above its minimum size. Liveness is checked with a protocol ping, at most
+    once per ping_interval for each connection. Counters and ping times are
+    only touched with the pool lock held.
+
+    Args:
+        db_user (str):          MySQL username
+        db_pass (str):          MySQL password
+        db_host (str):          MySQL server host address
+        db_name (str):          MySQL database name
+        min_size (int):         connections kept open when idle
+        max_size (int):         connections open at most
+        max_idle (float):       seconds an idle connection above min_size is
+                                kept before it is closed
+        wait_timeout (float):   seconds acquire waits for a free connection
+        ping_interval (float):  seconds a connection is trusted after a
+                                successful ping
+
+    Attributes:
+        min_size (int):         connections kept open when idle
+        max_size (int):         connections open at most
+        max_idle (float):       idle connection lifetime in seconds
+        wait_timeout (float):   acquire timeout in seconds
+        ping_interval (float):  seconds between liveness pings
+
+    Raises:
+        data_manager_exceptions.DBValueError
+        data_manager_exceptions.DBConnectionError
+
+    """
+
+    def __init__(self, db_user, db_pass, db_host, db_name, min_size=1,
+        max_size=10, max_idle=300, wait_timeout=10, ping_interval=30):
+
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise data_manager_exceptions.DBValueError("Pool sizes must \
+satisfy 0 <= min_size <= max_size and max_size >= 1")
+
+        self.db_user = db_user
+        self.db_pass = db_pass
+        self.db_host = db_host
+        self.db_name = db_name
+        self.min_size = min_size
+        self.max_size = max_size
+        self.max_idle = max_idle
+        self.wait_timeout = wait_timeout
+        self.ping_interval = ping_interval
+
+        self._condition = threading.Condition(threading.Lock())
+        self._idle = []
+        self._size = 0
+        self._in_use = 0
+        self._waiters = 0
+        self._checkouts = 0
+        self._timeouts = 0
+        self._wait_time = 0.0
+        self._max_wait_time = 0.0
+        self._pings = 0
+        self._reconnects = 0
+        self._verified = {}
+
+        for _ in range(min_size):
+            conn = self.connect()
+            self._size += 1
+            self._idle.append((conn, time.time()))
+
+    def connect(self):
+        """Method to open a new MySQL connection
+
+        Args:
+            None
+
+        Returns:
+            conn (obj):     MySQL database connection object
+
+        Raises:
+            data_manager_exceptions.DBConnectionError
+
+        """
+
+        try:
+            LOGGER.info("Opening pooled MySQL connection")
+            return MySQLdb.connect(user=self.db_user, passwd=self.db_pass,
+                host=self.db_host, db=self.db_name)
+        except MySQLdb.OperationalError:
+            LOGGER.error("MySQL operational error occured")
+            traceback.print_exc()
+            raise data_manager_exceptions.DBConnectionError("Cannot connect \
+to MySQL server")
+
+    def acquire(self):
+        """Method to check a connection out of the pool
+
+        Blocks while max_size connections are in use, for at most
+        wait_timeout seconds.
+
+        Args:
+            None
+
+        Returns:
+            conn (obj):     MySQL database connection object
+
+        Raises:
+            data_manager_exceptions.DBConnectionError
+
+        """
+
+        start = time.time()
+        stale = []
+        conn = None
+
+        with self._condition:
+            while True:
+                stale.extend(self._prune_idle())
+
+                if self._idle:
+                    conn = self._idle.pop()[0]
+                    break
+
+                if self._size < self.max_size:
+                    self._size += 1
+                    break
+
+                remaining = self.wait_timeout - (time.time() - start)
+                if remaining <= 0:
+                    self._timeouts += 1
+                    LOGGER.error("Timed out waiting for a MySQL connection")
+                    raise data_manager_exceptions.DBConnectionError("Timed \
+out waiting for a MySQL connection")
+
+                self._waiters += 1
+                try:
+                    self._condition.wait(remaining)
+                finally:
+                    self._waiters -= 1
+
+            waited = time.time() - start
+            self._in_use += 1
+            self._checkouts += 1
+            self._wait_time += waited
+            self._max_wait_time = max(self._max_wait_time, waited)
+
+        self._close_all(stale)
+
+        if conn is None:
+            try:
+                conn = self.connect()
+            except data_manager_exceptions.DBConnectionError:
+                with self._condition:
+                    self._size -= 1
+                    self._in_use -= 1
+                    self._condition.notify()
+                raise
+
+        return conn
+
+    def release(self, conn, discard=False):
+        """Method to return a checked out connection to the pool
+
+        Args:
+            conn (obj):     MySQL database connection object
+            discard (bool): close the connection instead of reusing it
+
+        Returns:
+            None
+
+        """
+
+        with self._condition:
+            self._in_use -= 1
+
+            if discard:
+                self._size -= 1
+            else:
+                self._idle.append((conn, time.time()))
+
+            self._condition.notify()
+
+        if discard:
+            self._close_all([conn])
+
+    def replace(self, conn):
+        """Method to swap a broken checked out connection for a new one
+
+        Args:
+            conn (obj):     broken MySQL database connection object
+
+        Returns:
+            conn (obj):     new MySQL database connection object
+
+        Raises:
+            data_manager_exceptions.DBConnectionError
+
+        """
+
+        self.release(conn, discard=True)
+
+        return self.acquire()
+
+    def check(self, conn, force=False):
+        """Method to make sure a checked out connection is still alive
+
+        The connection is pinged unless it was verified within the last
+        ping_interval seconds, and replaced if the ping fails.
+
+        Args:
+            conn (obj):     MySQL database connection object
+            force (bool):   ping even if the connection was verified recently
+
+        Returns:
+            conn (obj):     the same connection, or its replacement
+
+        Raises:
+            data_manager_exceptions.DBConnectionError
+
+        """
+
+        now = time.time()
+
+        with self._condition:
+            if not force and now - self._verified.get(conn, 0) < \
+                self.ping_interval:
+                return conn
+
+            self._pings += 1
+
+        try:
+            conn.ping()
+        except MySQLdb.Error:
+            LOGGER.error("Database connection dropped, reconnecting")
+            with self._condition:
+                self._reconnects += 1
+            conn = self.replace(conn)
+
+        with self._condition:
+            self._verified[conn] = time.time()
+
+        return conn
+
+    def get_stats(self):
+        """Method to get pool usage statistics
+
+        Args:
+            None
+
+        Returns:
+            stats (dict):   pool size, usage and wait statistics
+
+        """
+
+        with self._condition:
+            return {
+                'size': self._size,
+                'idle': len(self._idle),
+                'in_use': self._in_use,
+                'waiters': self._waiters,
+                'min_size': self.min_size,
+                'max_size': self.max_size,
+                'checkouts': self._checkouts,
+                'timeouts': self._timeouts,
+                'pings': self._pings,
+                'reconnects': self._reconnects,
+                'wait_time_total': round(self._wait_time, 6),
+                'wait_time_max': round(self._max_wait_time, 6),
+                'wait_time_avg': round(self._wait_time /
+                    max(self._checkouts, 1), 6)}
+
+    def _prune_idle(self):
+        """Remove connections idle for longer than max_idle
+
+        Must be called with the pool lock held. Connections are only removed
+        while the pool is above min_size.
+
+        Args:
+            None
+
+        Returns:
+            stale (list):   removed connections, to be closed by the caller
+
+        """
+
+        stale = []
+        deadline = time.time() - self.max_idle
+
+        while self._idle and self._size > self.min_size and \
+            self._idle[0][1] < deadline:
+            stale.append(self._idle.pop(0)[0])
+            self._size -= 1
+
+        return stale
+
+    def _close_all(self, connections):
+        """Close connections, ignoring ones that are already broken
+
+        Args:
+            connections (list): MySQL database connection objects
+
+        Returns:
+            None
+
+        """
+
+        for conn in connections:
+            with self._condition:
+                self._verified.pop(conn, None)
+
+            try:
+                conn.close()
+            except MySQLdb.Error:
+                pass
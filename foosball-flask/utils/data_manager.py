@@ -5,15 +5,26 @@ This class handles all data interactions with the database.
 """
 
 import MySQLdb
+import MySQLdb.cursors
+import analytics
 import logging
 import logging.config
 import os
 import sys
+import threading
 import traceback
 import trueskill
 import datetime
+import functools
+import weakref
 
+import connection_pool
 import data_manager_exceptions
+import identity_index
+import matchmaking
+import rating_kernel
+import read_cache
+import statement_cache
 
 try:
     LOG_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
@@ -26,21 +37,361 @@ except IOError:
 else:
     pass
 
+def retry_on_disconnect(method):
+    """Decorator retrying an idempotent read once after a dropped connection
+
+    The retry only happens when the calling thread's connection turns out to
+    be dead and it held no uncommitted changes.
+
+    Args:
+        method (func):  DataManager read method
+
+    Returns:
+        wrapper (func): retrying method
+
+    """
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        """Call the read, retrying it once on a new connection"""
+
+        try:
+            return method(self, *args, **kwargs)
+        except data_manager_exceptions.DBConnectionError:
+            if getattr(self._local, 'dirty', False) or \
+                not self.reconnect_if_dropped():
+                raise
+
+            LOGGER.info("Retrying {0} on a new connection".format(
+                method.__name__))
+            return method(self, *args, **kwargs)
+
+    return wrapper
+
+def cached_read(method):
+    """Decorator answering a read from the read cache when possible
+
+    Reads are cached under the data version seen by the calling thread.
+    Threads with uncommitted changes bypass the cache, since they can see
+    data no other thread can.
+
+    Args:
+        method (func):  DataManager read method
+
+    Returns:
+        wrapper (func): caching method
+
+    """
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        """Call the read unless its result is cached"""
+
+        if getattr(self._local, 'dirty', False):
+            return method(self, *args, **kwargs)
+
+        version = self.get_data_version('data')
+        key = (method.__name__, args, tuple(sorted(kwargs.items())))
+        found, value = self.read_cache.get(version, key)
+
+        if not found:
+            value = method(self, *args, **kwargs)
+            self.read_cache.put(version, key, value)
+
+        return value
+
+    return wrapper
+
+# MySQL error code for a row that violates a unique index
+DUPLICATE_ENTRY = 1062
+
+# rows written per multi-row INSERT
+INSERT_BATCH_SIZE = 100
+
+# seats of a result, in the order of its player columns
+SEATS = ('offense', 'defense', 'offense', 'defense')
+
+# exportable tables, with their exported columns in order and sort key
+EXPORTS = {
+    'results': ('result', ('result_id', 'offense_winner', 'defense_winner',
+        'offense_loser', 'defense_loser', 'time'), 'result_id'),
+    'players': ('player', ('player_id', 'first_name', 'last_name',
+        'nickname', 'offense_mu', 'offense_sigma', 'defense_mu',
+        'defense_sigma', 'time'), 'player_id'),
+    'teams': ('team', ('team_id', 'team_name', 'player_lo', 'player_hi',
+        'mu', 'sigma', 'time'), 'team_id'),
+    'ratings': ('rating_history', ('history_id', 'entity_type', 'entity_id',
+        'position', 'mu', 'sigma', 'result_id', 'time'), 'history_id')}
+
+# rows fetched at a time from an export's server-side cursor
+EXPORT_BATCH_SIZE = 1000
+
+# result rows joined to the four participating players, in the column order
+# expected by result.html and playerstat.html
+RESULT_SELECT = "SELECT offense_winner.first_name, offense_winner.last_name, \
+offense_winner.nickname, defense_winner.first_name, defense_winner.last_name, \
+defense_winner.nickname, offense_loser.first_name, offense_loser.last_name, \
+offense_loser.nickname, defense_loser.first_name, defense_loser.last_name, \
+defense_loser.nickname, result.time, result.result_id FROM result \
+JOIN player AS offense_winner \
+ON offense_winner.player_id = result.offense_winner \
+JOIN player AS defense_winner \
+ON defense_winner.player_id = result.defense_winner \
+JOIN player AS offense_loser \
+ON offense_loser.player_id = result.offense_loser \
+JOIN player AS defense_loser \
+ON defense_loser.player_id = result.defense_loser"
+
+# per player win and loss counts by position, from a single pass over result
+# that fans each game out to its four (player, seat) pairs
+PLAYER_RECORD_SELECT = "SELECT CASE seat.seat_id \
+WHEN 0 THEN result.offense_winner WHEN 1 THEN result.defense_winner \
+WHEN 2 THEN result.offense_loser ELSE result.defense_loser END AS player_id, \
+SUM(seat.seat_id = 0) AS offense_wins, SUM(seat.seat_id = 1) AS defense_wins, \
+SUM(seat.seat_id = 2) AS offense_losses, \
+SUM(seat.seat_id = 3) AS defense_losses FROM result \
+CROSS JOIN (SELECT 0 AS seat_id UNION ALL SELECT 1 UNION ALL SELECT 2 \
+UNION ALL SELECT 3) AS seat GROUP BY player_id"
+
+# per partnership win and loss counts, from a single pass over result that
+# fans each game out to its winning and losing pair, lower player_id first
+TEAM_RECORD_SELECT = "SELECT CASE side.side_id \
+WHEN 0 THEN LEAST(result.offense_winner, result.defense_winner) \
+ELSE LEAST(result.offense_loser, result.defense_loser) END AS player_one, \
+CASE side.side_id \
+WHEN 0 THEN GREATEST(result.offense_winner, result.defense_winner) \
+ELSE GREATEST(result.offense_loser, result.defense_loser) END AS player_two, \
+SUM(side.side_id = 0) AS wins, SUM(side.side_id = 1) AS losses FROM result \
+CROSS JOIN (SELECT 0 AS side_id UNION ALL SELECT 1) AS side \
+GROUP BY player_one, player_two"
+
+# MySQL error codes of a deadlock and of a lock wait timeout
+LOCK_CONFLICT_ERRORS = (1205, 1213)
+
+def operational_error(error):
+    """Function to translate a MySQL operational error
+
+    Deadlocks and lock wait timeouts leave the connection usable, so they
+    are reported as a conflict worth retrying rather than a lost connection.
+
+    Args:
+        error (obj):        MySQLdb.OperationalError
+
+    Returns:
+        exception (obj):    DBLockError or DBConnectionError to raise
+
+    """
+
+    if error.args and error.args[0] in LOCK_CONFLICT_ERRORS:
+        LOGGER.error("MySQL lock conflict: %s", error)
+        return data_manager_exceptions.DBLockError("Conflicting change in \
+progress, please try again")
+
+    return data_manager_exceptions.DBConnectionError("Cannot connect to \
+MySQL server")
+
+def conservative_rank(rating):
+    """Function to compute the leaderboard rank of a rating
+
+    The rank is mu - 3 * sigma, to four decimals.
+
+    Args:
+        rating (obj):   trueskill rating
+
+    Returns:
+        rank (float):   conservative rank
+
+    """
+
+    return round(rating.mu - 3 * rating.sigma, 4)
+
+def format_results(rows):
+    """Function to convert joined result rows into template tuples
+
+    Args:
+        rows (tup):     rows selected with RESULT_SELECT
+
+    Returns:
+        results (tup):  tuple of result tuples
+
+    """
+
+    return tuple([row[:12] + (row[12].strftime('%Y-%m-%d'),) for row in rows])
+
+def add_records(records, changes):
+    """Function to add record changes to a record change map
+
+    Args:
+        records (dict): (entity_type, entity_id, position) keys to
+                        [wins, losses], updated in place
+        changes (dict): keys to [wins, losses] added
+
+    Returns:
+        None
+
+    """
+
+    for key, (wins, losses) in changes.items():
+        record = records.setdefault(key, [0, 0])
+        record[0] += wins
+        record[1] += losses
+
+def encode_cursor(time, result_id):
+    """Function to build a page cursor from a result's sort key
+
+    Args:
+        time (obj):         result timestamp
+        result_id (int):    result id
+
+    Returns:
+        cursor (str):       opaque page cursor
+
+    """
+
+    return "{0}-{1}".format(time.strftime('%Y%m%d%H%M%S'), result_id)
+
+def decode_cursor(cursor):
+    """Function to split a page cursor into a result sort key
+
+    Args:
+        cursor (str):       page cursor built by encode_cursor
+
+    Returns:
+        time (obj):         result timestamp
+        result_id (int):    result id
+
+    Raises:
+        data_manager_exceptions.DBValueError
+
+    """
+
+    try:
+        time, result_id = cursor.split('-')
+        return datetime.datetime.strptime(time, '%Y%m%d%H%M%S'), \
+            int(result_id)
+    except ValueError:
+        raise data_manager_exceptions.DBValueError("Invalid page cursor")
+
+def keyset_filter(cursor, direction):
+    """Function to build the predicate selecting results past a cursor
+
+    Results are ordered newest first on (time, result_id), so the next page
+    holds smaller keys and the previous page larger ones.
+
+    Args:
+        cursor (str):       page cursor, or None for the first page
+        direction (str):    'next' or 'prev'
+
+    Returns:
+        predicate (str):    SQL predicate on the result table
+        params (tup):       predicate parameters
+        order (str):        sort order used to walk away from the cursor
+
+    Raises:
+        data_manager_exceptions.DBValueError
+
+    """
+
+    if direction == 'next':
+        operator, order = '<', 'DESC'
+    elif direction == 'prev':
+        operator, order = '>', 'ASC'
+    else:
+        raise data_manager_exceptions.DBValueError("Unrecognized page \
+direction")
+
+    if cursor is None:
+        return "TRUE", (), order
+
+    time, result_id = decode_cursor(cursor)
+
+    return "(result.time {0} %s OR (result.time = %s AND result.result_id \
+{0} %s))".format(operator), (time, time, result_id), order
+
+def paginate_results(rows, page_size, cursor, direction):
+    """Function to cut a page out of rows fetched past a cursor
+
+    Args:
+        rows (tup):         up to page_size + 1 rows selected with
+                            RESULT_SELECT, walking away from the cursor
+        page_size (int):    results per page
+        cursor (str):       page cursor the rows were selected from
+        direction (str):    'next' or 'prev'
+
+    Returns:
+        results (tup):      tuple of result tuples, newest first
+        prev_cursor (str):  cursor for newer results, or None
+        next_cursor (str):  cursor for older results, or None
+
+    """
+
+    has_more = len(rows) > page_size
+    rows = list(rows[:page_size])
+
+    if direction == 'prev':
+        rows.reverse()
+
+    if len(rows) == 0:
+        return (), None, None
+
+    first_cursor = encode_cursor(rows[0][12], rows[0][13])
+    last_cursor = encode_cursor(rows[-1][12], rows[-1][13])
+
+    if direction == 'next':
+        prev_cursor = first_cursor if cursor is not None else None
+        next_cursor = last_cursor if has_more else None
+    else:
+        prev_cursor = first_cursor if has_more else None
+        next_cursor = last_cursor
+
+    return format_results(rows), prev_cursor, next_cursor
+
 class DataManager(object):
     """DataManager class used to interact with database
 
+    Connections come from a bounded pool. The first database access made by
+    a thread checks a connection out, and it stays with that thread until
+    release_connection is called, so a request's writes and its commit run
+    on the same connection.
+
+    Dashboard reads are answered from a read cache until another commit, by
+    this or any other process, bumps the stored data version.
+
+    Player names and team memberships are resolved through an in-memory
+    identity index. Its version is checked against the database once per
+    connection checkout and it is reloaded when another process changed it.
+
+    Results are rated one transaction at a time, in result_id order, and
+    every checkpoint_interval results the ratings of all players and teams
+    are saved as a checkpoint. Deleting or editing a result replays only
+    the results after the last checkpoint before it.
+
     Args:
-        db_user (str):  MySQL username
-        db_pass (str):  MySQL password
-        db_host (str):  MySQL server host address
-        db_name (str):  MySQL database name
+        db_user (str):              MySQL username
+        db_pass (str):              MySQL password
+        db_host (str):              MySQL server host address
+        db_name (str):              MySQL database name
+        pool_min_size (int):        connections kept open when idle
+        pool_max_size (int):        connections open at most
+        pool_max_idle (float):      seconds an idle connection above
+                                    pool_min_size is kept
+        pool_wait_timeout (float):  seconds to wait for a free connection
+        ping_interval (float):      seconds between connection liveness pings
+        statement_cache_size (int): statements cached per connection
+        read_cache_size (int):      reads cached at most
+        checkpoint_interval (int):  results between rating checkpoints
 
     Attributes:
-        db_conn (obj):  MySQL database connection object
+        db_conn (obj):  MySQL connection checked out by the calling thread
         db_user (str):  MySQL username
         db_pass (str):  MySQL password
         db_host (str):  MySQL server host address
         db_name (str):  MySQL database name
+        pool (obj):     MySQL connection pool
+        identity (obj): player and team identity index
+        read_cache (obj): cached dashboard reads
+        statement_cache_size (int): statements cached per connection
+        checkpoint_interval (int):  results between rating checkpoints
 
     Raises:
         data_manager_exceptions.DBConnectionError
@@ -48,7 +399,10 @@ class DataManager(object):
 
     """
 
-    def __init__(self, db_user, db_pass, db_host, db_name):
+    def __init__(self, db_user, db_pass, db_host, db_name, pool_min_size=1,
+        pool_max_size=10, pool_max_idle=300, pool_wait_timeout=10,
+        ping_interval=30, statement_cache_size=128, read_cache_size=256,
+        checkpoint_interval=100):
 
         try:
             LOGGER.info("Connecting to MySQL database")
@@ -57,18 +411,28 @@ username: {0}\n\
 password: {1}\n\
 hostname: {2}\n\
 database: {3}".format(db_user, db_pass, db_host, db_name))
-            self.db_conn = MySQLdb.connect(user=db_user, passwd=db_pass,
-                host=db_host, db=db_name)
             self.db_user = db_user
             self.db_pass = db_pass
             self.db_host = db_host
             self.db_name = db_name
+            self._local = threading.local()
+            self.statement_cache_size = statement_cache_size
+            self.checkpoint_interval = checkpoint_interval
+            self._statement_caches = weakref.WeakKeyDictionary()
+            self._statement_lock = threading.Lock()
+            self.identity = identity_index.IdentityIndex()
+            self.read_cache = read_cache.ReadCache(max_size=read_cache_size)
+            self.pool = connection_pool.ConnectionPool(db_user=db_user,
+                db_pass=db_pass, db_host=db_host, db_name=db_name,
+                min_size=pool_min_size, max_size=pool_max_size,
+                max_idle=pool_max_idle, wait_timeout=pool_wait_timeout,
+                ping_interval=ping_interval)
 
             cursor = self.db_conn.cursor()
 
             LOGGER.info("Creating MySQL tables")
 
-            cursor.execute("CREATE TABLE IF NOT EXISTS rating (\
+            self.execute(cursor, "CREATE TABLE IF NOT EXISTS rating (\
 rating_id INT NOT NULL AUTO_INCREMENT,\
 mu DECIMAL(6,4) NOT NULL,\
 sigma DECIMAL(6,4) NOT NULL,\
@@ -76,7 +440,7 @@ time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,\
 PRIMARY KEY (rating_id),\
 UNIQUE INDEX rating_id_UNIQUE (rating_id ASC))")
 
-            cursor.execute("CREATE TABLE IF NOT EXISTS player (\
+            self.execute(cursor, "CREATE TABLE IF NOT EXISTS player (\
 player_id INT NOT NULL AUTO_INCREMENT,\
 first_name VARCHAR(45) NOT NULL,\
 last_name VARCHAR(45) NOT NULL,\
@@ -99,7 +463,7 @@ REFERENCES rating (rating_id) \
 ON DELETE NO ACTION \
 ON UPDATE NO ACTION)")
 
-            cursor.execute("CREATE TABLE IF NOT EXISTS team (\
+            self.execute(cursor, "CREATE TABLE IF NOT EXISTS team (\
 team_id INT NOT NULL AUTO_INCREMENT,\
 team_name VARCHAR(75) NOT NULL,\
 time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,\
@@ -114,7 +478,8 @@ REFERENCES rating (rating_id) \
 ON DELETE NO ACTION \
 ON UPDATE NO ACTION)")
 
-            cursor.execute("CREATE TABLE IF NOT EXISTS player_team_xref (\
+            self.execute(cursor, "CREATE TABLE IF NOT EXISTS \
+player_team_xref (\
 player INT NOT NULL,\
 team INT NOT NULL,\
 INDEX player_idx (player ASC),\
@@ -130,7 +495,7 @@ REFERENCES team (team_id) \
 ON DELETE NO ACTION \
 ON UPDATE NO ACTION)")
 
-            cursor.execute("CREATE TABLE IF NOT EXISTS result (\
+            self.execute(cursor, "CREATE TABLE IF NOT EXISTS result (\
 result_id INT NOT NULL AUTO_INCREMENT,\
 offense_winner INT NOT NULL,\
 defense_winner INT NOT NULL,\
@@ -164,6 +529,125 @@ REFERENCES player (player_id) \
 ON DELETE NO ACTION \
 ON UPDATE NO ACTION)")
 
+            self.execute(cursor, "CREATE TABLE IF NOT EXISTS data_version (\
+name VARCHAR(45) NOT NULL,\
+version BIGINT NOT NULL DEFAULT 0,\
+PRIMARY KEY (name))")
+
+            self.execute(cursor, "CREATE TABLE IF NOT EXISTS \
+player_standing (\
+player_id INT NOT NULL,\
+position VARCHAR(7) NOT NULL,\
+ranking DECIMAL(10,4) NOT NULL,\
+wins INT NOT NULL DEFAULT 0,\
+losses INT NOT NULL DEFAULT 0,\
+PRIMARY KEY (player_id, position),\
+INDEX ranking_idx (ranking))")
+
+            self.execute(cursor, "CREATE TABLE IF NOT EXISTS \
+team_standing (\
+team_id INT NOT NULL,\
+ranking DECIMAL(10,4) NOT NULL,\
+wins INT NOT NULL DEFAULT 0,\
+losses INT NOT NULL DEFAULT 0,\
+PRIMARY KEY (team_id),\
+INDEX ranking_idx (ranking))")
+
+            self.execute(cursor, "CREATE TABLE IF NOT EXISTS \
+rating_history (\
+history_id INT NOT NULL AUTO_INCREMENT,\
+entity_type VARCHAR(6) NOT NULL,\
+entity_id INT NOT NULL,\
+position VARCHAR(7) NOT NULL,\
+mu DOUBLE NOT NULL,\
+sigma DOUBLE NOT NULL,\
+result_id INT NULL,\
+time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,\
+PRIMARY KEY (history_id),\
+INDEX entity_idx (entity_type, entity_id, position, history_id),\
+INDEX result_idx (result_id))")
+
+            self.execute(cursor, "CREATE TABLE IF NOT EXISTS \
+rating_archive (\
+rating_id INT NOT NULL,\
+mu DECIMAL(6,4) NOT NULL,\
+sigma DECIMAL(6,4) NOT NULL,\
+time TIMESTAMP NULL,\
+PRIMARY KEY (rating_id))")
+
+            self.execute(cursor, "CREATE TABLE IF NOT EXISTS \
+rating_checkpoint (\
+result_id INT NOT NULL,\
+time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,\
+PRIMARY KEY (result_id))")
+
+            self.execute(cursor, "CREATE TABLE IF NOT EXISTS \
+rating_snapshot (\
+result_id INT NOT NULL,\
+entity_type VARCHAR(6) NOT NULL,\
+entity_id INT NOT NULL,\
+position VARCHAR(7) NOT NULL,\
+mu DOUBLE NOT NULL,\
+sigma DOUBLE NOT NULL,\
+PRIMARY KEY (result_id, entity_type, entity_id, position))")
+
+            LOGGER.info("Migrating MySQL tables")
+
+            # each two player team keyed by its members, lower player_id
+            # first, so a pair can only ever have one team
+            self.create_column(cursor, 'team', 'player_lo', 'INT NULL')
+            self.create_column(cursor, 'team', 'player_hi', 'INT NULL')
+            self.execute(cursor, "UPDATE team JOIN (SELECT team, \
+MIN(player) AS player_lo, MAX(player) AS player_hi FROM player_team_xref \
+GROUP BY team HAVING COUNT(player) = 2) AS pair ON pair.team = team.team_id \
+SET team.player_lo = pair.player_lo, team.player_hi = pair.player_hi \
+WHERE team.player_lo IS NULL")
+
+            # members are shown in the order they were added, existing
+            # rows are numbered in the order they are stored
+            self.create_column(cursor, 'player_team_xref', 'xref_id',
+                'INT NOT NULL AUTO_INCREMENT PRIMARY KEY FIRST')
+
+            # current ratings inline on player and team, the rating rows
+            # they used to point at are kept as history
+            for table, prefixes in (('player', ('offense_', 'defense_')),
+                ('team', ('',))):
+                for prefix in prefixes:
+                    self.migrate_rating(cursor, table, prefix)
+
+            self.create_column(cursor, 'data_version', 'updated',
+                'TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP \
+ON UPDATE CURRENT_TIMESTAMP')
+
+            self.execute(cursor, "SELECT EXISTS (SELECT 1 FROM player) AND \
+NOT EXISTS (SELECT 1 FROM player_standing)")
+            if cursor.fetchone()[0]:
+                self.rebuild_standings()
+
+            self.execute(cursor, "INSERT IGNORE INTO data_version (name) \
+VALUES (%s), (%s), (%s)", ('identity', 'data', 'ratings'))
+            self.commit_data()
+
+            LOGGER.info("Creating MySQL indexes")
+
+            self.create_index(cursor, 'player', 'name_UNIQUE',
+                'first_name, last_name, nickname', unique=True)
+            self.create_index(cursor, 'team', 'members_UNIQUE',
+                'player_lo, player_hi', unique=True)
+
+            self.create_index(cursor, 'result', 'time_idx',
+                'time, result_id')
+            for position in ('offense_winner', 'defense_winner',
+                'offense_loser', 'defense_loser'):
+                self.create_index(cursor, 'result',
+                    '{0}_time_idx'.format(position),
+                    '{0}, time, result_id'.format(position))
+
+            self.create_index(cursor, 'rating_history', 'entity_time_idx',
+                'entity_type, entity_id, position, time')
+
+            self.refresh_identity_index()
+
         except MySQLdb.OperationalError:
             LOGGER.error("MySQL operational error occured")
             traceback.print_exc()
@@ -176,10 +660,29 @@ to MySQL server")
             raise data_manager_exceptions.DBSyntaxError("MySQL syntax error")
 
         else:
-            pass
+            self.release_connection()
 
-    def check_if_db_connected(self):
-        """Method to check if still connected to database
+    @property
+    def db_conn(self):
+        """MySQL connection checked out by the calling thread"""
+
+        conn = getattr(self._local, 'conn', None)
+
+        if conn is None:
+            conn = self.pool.acquire()
+            self._local.conn = conn
+
+        return conn
+
+    @db_conn.setter
+    def db_conn(self, conn):
+        self._local.conn = conn
+
+    def release_connection(self):
+        """Method to return the calling thread's connection to the pool
+
+        Uncommitted changes are rolled back first. Connections that fail the
+        rollback are closed instead of being reused.
 
         Args:
             None
@@ -189,243 +692,1825 @@ to MySQL server")
 
         """
 
+        conn = getattr(self._local, 'conn', None)
+
+        if conn is None:
+            return
+
+        self._local.conn = None
+        self._local.dirty = False
+        self._local.identity_checked = False
+        self._local.identity_changes = None
+        self._local.data_versions = None
+
         try:
-            cursor = self.db_conn.cursor()
-            cursor.execute("SELECT * FROM player")
-        except MySQLdb.OperationalError:
-            LOGGER.error("Database connection dropped, reconnecting")
-            traceback.print_exc()
-            self.db_conn = MySQLdb.connect(user=self.db_user,
-                passwd=self.db_pass, host=self.db_host, db=self.db_name)
+            conn.rollback()
+        except MySQLdb.Error:
+            LOGGER.error("Discarding broken MySQL connection")
+            self.pool.release(conn, discard=True)
         else:
-            pass
+            self.pool.release(conn)
 
-    def check_if_players_on_team(self, member_one, member_two):
-        """Method to check if two players are already on a team
+    def get_pool_stats(self):
+        """Method to get connection pool statistics
 
         Args:
-            player_one (tup):    player one
-            player_two (tup):    player two
+            None
 
         Returns:
-            (bool):                 True/False
-
-        Raises:
-            data_manager_exceptions.DBConnectionError
-            data_manager_exceptions.DBSyntaxError
+            stats (dict):   pool size, usage and wait statistics
 
         """
 
-        try:
-            LOGGER.info("Checking if players are already on team")
-            self.check_if_db_connected()
-            cursor = self.db_conn.cursor()
-
-            cursor.execute("SELECT player_id FROM player WHERE \
-first_name = '{0}' AND last_name = '{1}' AND nickname = '{2}'".format(
-                member_one[0], member_one[1], member_one[2]))
-            player_one_id = cursor.fetchone()[0]
+        return self.pool.get_stats()
 
-            cursor.execute("SELECT player_id FROM player WHERE \
-first_name = '{0}' AND last_name = '{1}' AND nickname = '{2}'".format(
-                member_two[0], member_two[1], member_two[2]))
-            player_two_id = cursor.fetchone()[0]
+    def create_column(self, cursor, table, column, definition):
+        """Method to add a column to an existing table if it is missing
 
-            cursor.execute("SELECT team FROM player_team_xref WHERE \
-player = {0}".format(player_one_id))
-            teams = cursor.fetchall()
+        Args:
+            cursor (obj):       MySQL cursor
+            table (str):        table name
+            column (str):       column name
+            definition (str):   column type and options
 
-            for team in teams:
-                cursor.execute("SELECT player FROM player_team_xref WHERE \
-team = {0}".format(team[0]))
-                players = cursor.fetchall()
-                for player in players:
-                    if player[0] == player_two_id:
-                        return team[0]
+        Returns:
+            (bool):             True if the column was added
 
-        except MySQLdb.OperationalError:
-            LOGGER.error("MySQL operational error occured")
-            traceback.print_exc()
-            raise data_manager_exceptions.DBConnectionError("Cannot connect \
-to MySQL server")
+        """
 
-        except MySQLdb.ProgrammingError:
-            LOGGER.error("MySQL programming error")
-            traceback.print_exc()
-            raise data_manager_exceptions.DBSyntaxError("MySQL syntax error")
+        self.execute(cursor, "SELECT COUNT(*) FROM \
+information_schema.columns WHERE table_schema = DATABASE() AND \
+table_name = %s AND column_name = %s", (table, column))
 
-        else:
+        if cursor.fetchone()[0] != 0:
             return False
 
-    def check_if_player_exists(self, first_name, last_name, nickname):
-        """Method to check if player currently exists in database
+        LOGGER.info("Adding column {0} to {1}".format(column, table))
+        self.execute(cursor, "ALTER TABLE {0} ADD COLUMN {1} {2}".format(table,
+            column, definition))
 
-        Args:
-            first_name (str):   player first name
-            last_name(str):     player last name
-            nickname (str):     player nickname
+        return True
 
-        Returns:
-            (bool):             True/False if player exists
+    def migrate_rating(self, cursor, table, prefix):
+        """Method to move a rating from the rating table inline
 
-        Raises:
-            data_manager_exceptions.DBConnectionError
-            data_manager_exceptions.DBSyntaxError
+        Adds the {prefix}mu and {prefix}sigma columns, and copies every
+        rating they are still missing from the row pointed at by the legacy
+        {prefix}rating column, recording it as the entity's first history
+        entry. The legacy column is made nullable, since new rows no longer
+        fill it in.
 
-        """
+        Args:
+            cursor (obj):   MySQL cursor
+            table (str):    'player' or 'team'
+            prefix (str):   'offense_' or 'defense_' for players, '' for teams
 
-        try:
-            LOGGER.info("Checking if player already exists")
-            LOGGER.debug("Player parameters:\n\
-first name: {0}\n\
-last name: {1}\n\
-nickname: {2}".format(first_name, last_name, nickname))
+        Returns:
+            None
 
-            self.check_if_db_connected()
-            cursor = self.db_conn.cursor()
-            cursor.execute("SELECT first_name, last_name, nickname FROM player")
-            players = cursor.fetchall()
+        """
 
-            for existing_first_name, existing_last_name, existing_nickname in \
-                players:
-            
-                if (first_name == existing_first_name) and (last_name == 
-                    existing_last_name) and (nickname == existing_nickname):
-                    return False
+        if self.create_column(cursor, table, '{0}mu'.format(prefix),
+            'DOUBLE NULL'):
+            self.create_column(cursor, table, '{0}sigma'.format(prefix),
+                'DOUBLE NULL')
+            self.execute(cursor, "ALTER TABLE {0} MODIFY {1}rating INT \
+NULL".format(table, prefix))
 
-        except MySQLdb.OperationalError:
-            LOGGER.error("MySQL operational error occured")
-            traceback.print_exc()
-            raise data_manager_exceptions.DBConnectionError("Cannot connect \
-to MySQL server")
+        self.execute(cursor, "INSERT INTO rating_history (entity_type, \
+entity_id, position, mu, sigma) SELECT %s, {0}.{0}_id, %s, rating.mu, \
+rating.sigma FROM {0} JOIN rating ON rating.rating_id = {0}.{1}rating \
+WHERE {0}.{1}mu IS NULL".format(table, prefix),
+            (table, prefix.rstrip('_') or 'team'))
+        self.execute(cursor, "UPDATE {0} JOIN rating ON rating.rating_id = \
+{0}.{1}rating SET {0}.{1}mu = rating.mu, {0}.{1}sigma = rating.sigma \
+WHERE {0}.{1}mu IS NULL".format(table, prefix))
 
-        except MySQLdb.ProgrammingError:
-            LOGGER.error("MySQL programming error")
-            traceback.print_exc()
-            raise data_manager_exceptions.DBSyntaxError("MySQL syntax error")
+    def create_index(self, cursor, table, index, columns, unique=False):
+        """Method to add an index to an existing table if it is missing
 
-        else:
-            return True
-    def check_if_team_exists(self, team_name):
-        """Method to check if team currently exists in database
+        A unique index is skipped, with an error logged, if the table already
+        holds duplicate rows.
 
         Args:
-            team_name (str):    team name
+            cursor (obj):   MySQL cursor
+            table (str):    table name
+            index (str):    index name
+            columns (str):  indexed column list
+            unique (bool):  reject rows duplicating the indexed columns
 
         Returns:
-            (bool):             True/False if team exists
-
-        Raises:
-            data_manager_exceptions.DBConnectionError
-            data_manager_exceptions.DBSyntaxError
+            None
 
         """
 
-        try:
-            LOGGER.info("Checking if team already exists")
-            LOGGER.debug("Team parameters:\nTeam name: {0}".format(team_name))
-
-            self.check_if_db_connected()
-            cursor = self.db_conn.cursor()
-            cursor.execute("SELECT team_name FROM team")
-            teams = cursor.fetchall()
-            for team in teams:
-                if team == team_name:
-                    return False
+        self.execute(cursor, "SELECT COUNT(*) FROM \
+information_schema.statistics WHERE table_schema = DATABASE() AND \
+table_name = %s AND index_name = %s", (table, index))
 
-        except MySQLdb.OperationalError:
-            LOGGER.error("MySQL operational error occured")
-            traceback.print_exc()
-            raise data_manager_exceptions.DBConnectionError("Cannot connect \
-to MySQL server")
+        if cursor.fetchone()[0] == 0:
+            LOGGER.info("Creating index {0} on {1}".format(index, table))
 
-        except MySQLdb.ProgrammingError:
-            LOGGER.error("MySQL programming error")
-            traceback.print_exc()
-            raise data_manager_exceptions.DBSyntaxError("MySQL syntax error")
+            try:
+                self.execute(cursor, "CREATE {0}INDEX {1} ON {2} ({3})".format(
+                    "UNIQUE " if unique else "", index, table, columns))
+            except MySQLdb.IntegrityError:
+                if not unique:
+                    raise
+                LOGGER.error("Duplicate rows in {0}, not creating unique \
+index {1}".format(table, index))
 
-        else:
-            return True
+    def check_if_db_connected(self):
+        """Method to check if still connected to database
 
-    def add_rating(self):
-        """Method to add a new rating to the database
+        The calling thread's connection is pinged at most once per ping
+        interval and replaced if it dropped. Losing a connection that holds
+        uncommitted changes is reported rather than silently continuing on
+        the new connection.
 
         Args:
             None
 
-        Return:
-            rating_id (int):    rating_id for rating just created
+        Returns:
+            None
 
         Raises:
             data_manager_exceptions.DBConnectionError
-            data_manager_exceptions.DBSyntaxError
 
         """
 
-        try:
-            LOGGER.info("Creating new rating")
-            new_rating = trueskill.Rating()
-            self.check_if_db_connected()
-            cursor = self.db_conn.cursor()
-            cursor.execute("INSERT INTO rating (mu, sigma) VALUES ({0}, {1}\
-)".format(new_rating.mu, new_rating.sigma))
-            rating_id = cursor.lastrowid
-
-        except MySQLdb.OperationalError:
-            LOGGER.error("MySQL operational error occured")
-            traceback.print_exc()
-            raise data_manager_exceptions.DBConnectionError("Cannot connect \
-to MySQL server")
-
-        except MySQLdb.ProgrammingError:
-            LOGGER.error("MySQL programming error")
-            traceback.print_exc()
-            raise data_manager_exceptions.DBSyntaxError("MySQL syntax error")
-
-        else:
-            return rating_id
+        self.reconnect_if_dropped(force=False)
 
-    def add_player(self, first_name, last_name, nickname):
-        """Method to add a player to the database
+    def reconnect_if_dropped(self, force=True):
+        """Method to replace the calling thread's connection if it dropped
 
         Args:
-            first_name (str):   player first name
-            last_name(str):     player last name
-            nickname (str):     player nickname
+            force (bool):   ping even if the connection was verified recently
+
+        Returns:
+            (bool):         True if the connection was replaced
 
         Raises:
-            data_manager_exceptions.DBValueError
-            data_manager_exceptions.DBExistError
             data_manager_exceptions.DBConnectionError
-            data_manager_exceptions.DBSyntaxError
 
         """
 
-        if len(first_name) is 0:
-            raise data_manager_exceptions.DBValueError("First name must be at \
-least one character")
+        conn = self.db_conn
+        checked_conn = self.pool.check(conn, force=force)
 
-        if len(last_name) is 0:
-            raise data_manager_exceptions.DBValueError("Last name must be at \
-least one character")
+        if checked_conn is conn:
+            return False
 
-        try:
-            if not self.check_if_player_exists(first_name=first_name,
-                last_name=last_name, nickname=nickname):
-                raise data_manager_exceptions.DBExistError("Name already \
-exists in database")
+        self.db_conn = checked_conn
+        self._local.data_versions = None
 
-            offense_rating_id = self.add_rating()
-            defense_rating_id = self.add_rating()
+        if getattr(self._local, 'dirty', False):
+            self._local.dirty = False
+            self._local.identity_changes = None
+            raise data_manager_exceptions.DBConnectionError("Connection to \
+MySQL server lost, uncommitted changes were discarded")
 
+        return True
+
+    def execute(self, cursor, sql, params=(), dirty=True):
+        """Method to run a parameterized statement on the thread's connection
+
+        Every statement goes through here. Values are passed separately
+        rather than formatted into the SQL text, so each statement keeps one
+        text, checked once per connection by its statement text cache.
+        MySQLdb still interpolates the values client side, so the server
+        parses every execution.
+
+        Writes mark the calling thread dirty unless dirty is False, which is
+        meant for housekeeping that leaves every read unchanged.
+
+        Args:
+            cursor (obj):   cursor on the calling thread's connection
+            sql (str):      SQL text with %s placeholders
+            params (tup):   statement parameters
+            dirty (bool):   mark the thread dirty if the statement writes
+
+        Returns:
+            count (int):    affected row count
+
+        Raises:
+            data_manager_exceptions.DBSyntaxError
+
+        """
+
+        statement = self.get_statement_cache().get(sql)
+        bound = statement.bind(tuple(params))
+
+        if dirty and not statement.is_read:
+            self.mark_dirty()
+
+        return cursor.execute(sql, bound)
+
+    def execute_many(self, cursor, sql, rows):
+        """Method to run a parameterized statement once per parameter row
+
+        Args:
+            cursor (obj):   cursor on the calling thread's connection
+            sql (str):      SQL text with %s placeholders
+            rows (list):    parameter tuples
+
+        Returns:
+            count (int):    affected row count
+
+        Raises:
+            data_manager_exceptions.DBSyntaxError
+
+        """
+
+        statement = self.get_statement_cache().get(sql)
+        rows = [tuple(row) for row in rows]
+
+        for row in rows:
+            statement.bind(row)
+
+        if not statement.is_read:
+            self.mark_dirty()
+
+        return cursor.executemany(sql, rows)
+
+    def get_statement_cache(self):
+        """Method to get the statement text cache of the thread's connection
+
+        Args:
+            None
+
+        Returns:
+            cache (obj):    statement text cache
+
+        """
+
+        conn = self.db_conn
+
+        with self._statement_lock:
+            cache = self._statement_caches.get(conn)
+
+            if cache is None:
+                cache = statement_cache.StatementTextCache(
+                    max_size=self.statement_cache_size)
+                self._statement_caches[conn] = cache
+
+        return cache
+
+    def get_statement_stats(self):
+        """Method to get statement text cache statistics for open connections
+
+        Args:
+            None
+
+        Returns:
+            stats (dict):   text check, execute and eviction counts
+
+        """
+
+        stats = {'connections': 0, 'cached': 0, 'checks': 0, 'executes': 0,
+            'evictions': 0}
+
+        with self._statement_lock:
+            for cache in self._statement_caches.values():
+                stats['connections'] += 1
+                stats['cached'] += len(cache)
+                stats['checks'] += cache.checks
+                stats['executes'] += cache.executes
+                stats['evictions'] += cache.evictions
+
+        return stats
+
+    def mark_dirty(self):
+        """Method to record that the calling thread has uncommitted changes
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+
+        self._local.dirty = True
+
+    def get_data_version(self, name):
+        """Method to get a stored data version as seen by the calling thread
+
+        All versions are read together on the first call after a connection
+        checkout or commit, and kept until the next one.
+
+        Args:
+            name (str):     data version name, 'data' or 'identity'
+
+        Returns:
+            version (int):  stored version
+
+        Raises:
+            data_manager_exceptions.DBConnectionError
+            data_manager_exceptions.DBSyntaxError
+
+        """
+
+        return self.get_data_stamp(name)[0]
+
+    def get_data_modified(self, name):
+        """Method to get the time a stored data version was last bumped
+
+        Args:
+            name (str):         data version name, 'data' or 'identity'
+
+        Returns:
+            modified (obj):     UTC datetime, to the second
+
+        Raises:
+            data_manager_exceptions.DBConnectionError
+            data_manager_exceptions.DBSyntaxError
+
+        """
+
+        return datetime.datetime.utcfromtimestamp(
+            self.get_data_stamp(name)[1])
+
+    def get_data_stamp(self, name, refresh=False):
+        """Method to get a stored data version and its bump time
+
+        Args:
+            name (str):     data version name, 'data' or 'identity'
+            refresh (bool): read the versions again instead of using the
+                            ones seen earlier by the calling thread
+
+        Returns:
+            stamp (tup):    version and UNIX bump time
+
+        Raises:
+            data_manager_exceptions.DBConnectionError
+            data_manager_exceptions.DBSyntaxError
+
+        """
+
+        versions = None if refresh else getattr(self._local,
+            'data_versions', None)
+
+        if versions is None:
+            try:
+                self.check_if_db_connected()
+                cursor = self.db_conn.cursor()
+                self.execute(cursor, "SELECT name, version, \
+UNIX_TIMESTAMP(updated) FROM data_version")
+                versions = dict((row[0], (row[1], int(row[2])))
+                    for row in cursor.fetchall())
+
+            except MySQLdb.OperationalError:
+                LOGGER.error("MySQL operational error occured")
+                traceback.print_exc()
+                raise data_manager_exceptions.DBConnectionError("Cannot \
+connect to MySQL server")
+
+            except MySQLdb.ProgrammingError:
+                LOGGER.error("MySQL programming error")
+                traceback.print_exc()
+                raise data_manager_exceptions.DBSyntaxError("MySQL syntax \
+error")
+
+            self._local.data_versions = versions
+
+        return versions[name]
+
+    def get_cache_stats(self):
+        """Method to get read cache statistics
+
+        Args:
+            None
+
+        Returns:
+            stats (dict):   cache size, version and hit counts
+
+        """
+
+        return self.read_cache.get_stats()
+
+    def refresh_identity_index(self):
+        """Method to reload the identity index if the database changed it
+
+        The stored identity version is read once per connection checkout.
+        The index is reloaded when it differs from the version the index
+        was built at, which happens whenever another process added, renamed
+        or deleted a player or added a team.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        Raises:
+            data_manager_exceptions.DBConnectionError
+            data_manager_exceptions.DBSyntaxError
+
+        """
+
+        if getattr(self._local, 'identity_checked', False):
+            return
+
+        try:
+            version = self.get_data_version('identity')
+
+            if version != self.identity.version:
+                LOGGER.info("Loading identity index")
+                cursor = self.db_conn.cursor()
+                self.execute(cursor, "SELECT player_id, first_name, \
+last_name, nickname FROM player")
+                players = cursor.fetchall()
+                self.execute(cursor, "SELECT team_id, player_lo, player_hi \
+FROM team WHERE player_lo IS NOT NULL")
+                teams = cursor.fetchall()
+                self.identity.load(version, players, teams)
+
+        except MySQLdb.OperationalError:
+            LOGGER.error("MySQL operational error occured")
+            traceback.print_exc()
+            raise data_manager_exceptions.DBConnectionError("Cannot connect \
+to MySQL server")
+
+        except MySQLdb.ProgrammingError:
+            LOGGER.error("MySQL programming error")
+            traceback.print_exc()
+            raise data_manager_exceptions.DBSyntaxError("MySQL syntax error")
+
+        else:
+            self._local.identity_checked = True
+
+    def get_player_id(self, player):
+        """Method to resolve player names to a player_id
+
+        Args:
+            player (tup):       first name, last name and nickname
+
+        Returns:
+            player_id (int):    player_id, or None if there is no such player
+
+        Raises:
+            data_manager_exceptions.DBConnectionError
+            data_manager_exceptions.DBSyntaxError
+
+        """
+
+        self.refresh_identity_index()
+
+        return self.identity.get_player_id(player,
+            getattr(self._local, 'identity_changes', None))
+
+    def get_team_id(self, player_one_id, player_two_id):
+        """Method to resolve a pair of players to their team_id
+
+        Args:
+            player_one_id (int):    first member player_id
+            player_two_id (int):    second member player_id
+
+        Returns:
+            team_id (int):          team_id, or None if they have no team
+
+        Raises:
+            data_manager_exceptions.DBConnectionError
+            data_manager_exceptions.DBSyntaxError
+
+        """
+
+        self.refresh_identity_index()
+
+        return self.identity.get_team_id(player_one_id, player_two_id,
+            getattr(self._local, 'identity_changes', None))
+
+    def lock_team_id(self, player_one_id, player_two_id):
+        """Method to read a pair of players' team_id from the database
+
+        The read takes a shared lock, so it sees a team committed by another
+        transaction after this one started, and keeps it from being deleted
+        until this transaction ends.
+
+        Args:
+            player_one_id (int):    first member player_id
+            player_two_id (int):    second member player_id
+
+        Returns:
+            team_id (int):          team_id, or None if they have no team
+
+        Raises:
+            data_manager_exceptions.DBConnectionError
+            data_manager_exceptions.DBSyntaxError
+
+        """
+
+        try:
+            self.check_if_db_connected()
+            cursor = self.db_conn.cursor()
+            self.execute(cursor, "SELECT team_id FROM team WHERE \
+player_lo = %s AND player_hi = %s LOCK IN SHARE MODE",
+                identity_index.team_key(player_one_id, player_two_id))
+            team = cursor.fetchone()
+
+        except MySQLdb.OperationalError as error:
+            LOGGER.error("MySQL operational error occured")
+            traceback.print_exc()
+            raise operational_error(error)
+
+        except MySQLdb.ProgrammingError:
+            LOGGER.error("MySQL programming error")
+            traceback.print_exc()
+            raise data_manager_exceptions.DBSyntaxError("MySQL syntax error")
+
+        else:
+            return team[0] if team is not None else None
+
+    def record_identity_change(self, cursor, players=None, teams=None):
+        """Method to record a player name or team membership change
+
+        The stored identity version is bumped in the calling thread's
+        transaction, which also locks it until commit. The changes are kept
+        for the calling thread and merged into the shared index by
+        commit_data.
+
+        Args:
+            cursor (obj):   cursor on the calling thread's connection
+            players (dict): name triple to player_id, None for a removed name
+            teams (dict):   team key to team_id, None for a removed team
+
+        Returns:
+            None
+
+        """
+
+        self.execute(cursor, "UPDATE data_version SET version = version + 1 \
+WHERE name = %s", ('identity',))
+        self.execute(cursor, "SELECT version FROM data_version WHERE \
+name = %s", ('identity',))
+        version = cursor.fetchone()[0]
+
+        changes = getattr(self._local, 'identity_changes', None)
+
+        if changes is None:
+            changes = identity_index.IdentityChanges(version - 1)
+            self._local.identity_changes = changes
+
+        changes.version = version
+        changes.players.update(players or {})
+        changes.teams.update(teams or {})
+        self._local.identity_checked = True
+
+    def get_identity_stats(self):
+        """Method to get identity index statistics
+
+        Args:
+            None
+
+        Returns:
+            stats (dict):   index size, version and lookup counts
+
+        """
+
+        return self.identity.get_stats()
+
+    def check_if_players_on_team(self, member_one, member_two):
+        """Method to check if two players are already on a team
+
+        Args:
+            player_one (tup):    player one
+            player_two (tup):    player two
+
+        Returns:
+            team_id (int):          team_id of their team, or False
+
+        Raises:
+            data_manager_exceptions.DBExistError
+            data_manager_exceptions.DBConnectionError
+            data_manager_exceptions.DBSyntaxError
+
+        """
+
+        LOGGER.info("Checking if players are already on team")
+
+        player_ids = [self.get_player_id(member) for member in (member_one,
+            member_two)]
+
+        if None in player_ids:
+            raise data_manager_exceptions.DBExistError("Player doesn't exist")
+
+        team_id = self.get_team_id(*player_ids)
+
+        if team_id is None:
+            return False
+
+        return team_id
+
+    def check_if_player_exists(self, first_name, last_name, nickname):
+        """Method to check if player currently exists in database
+
+        Args:
+            first_name (str):   player first name
+            last_name(str):     player last name
+            nickname (str):     player nickname
+
+        Returns:
+            (bool):             True/False if player exists
+
+        Raises:
+            data_manager_exceptions.DBConnectionError
+            data_manager_exceptions.DBSyntaxError
+
+        """
+
+        LOGGER.info("Checking if player already exists")
+        LOGGER.debug("Player parameters:\n\
+first name: {0}\n\
+last name: {1}\n\
+nickname: {2}".format(first_name, last_name, nickname))
+
+        return self.get_player_id((first_name, last_name, nickname)) is None
+
+    def check_if_team_exists(self, team_name):
+        """Method to check if team currently exists in database
+
+        Args:
+            team_name (str):    team name
+
+        Returns:
+            (bool):             True/False if team exists
+
+        Raises:
+            data_manager_exceptions.DBConnectionError
+            data_manager_exceptions.DBSyntaxError
+
+        """
+
+        try:
+            LOGGER.info("Checking if team already exists")
+            LOGGER.debug("Team parameters:\nTeam name: {0}".format(team_name))
+
+            self.check_if_db_connected()
+            cursor = self.db_conn.cursor()
+            self.execute(cursor, "SELECT team_id FROM team WHERE \
+team_name = %s", (team_name,))
+
+            if cursor.fetchone() is not None:
+                return False
+
+        except MySQLdb.OperationalError:
+            LOGGER.error("MySQL operational error occured")
+            traceback.print_exc()
+            raise data_manager_exceptions.DBConnectionError("Cannot connect \
+to MySQL server")
+
+        except MySQLdb.ProgrammingError:
+            LOGGER.error("MySQL programming error")
+            traceback.print_exc()
+            raise data_manager_exceptions.DBSyntaxError("MySQL syntax error")
+
+        else:
+            return True
+
+    def add_rating_history(self, cursor, ratings):
+        """Method to append ratings to the rating history
+
+        Args:
+            cursor (obj):       cursor on the calling thread's connection
+            ratings (list):     (entity_type, entity_id, position, rating,
+                                result_id) tuples, position being 'offense',
+                                'defense' or 'team' and result_id the result
+                                that produced the rating, or None
+
+        Returns:
+            None
+
+        """
+
+        for start in range(0, len(ratings), INSERT_BATCH_SIZE):
+            rows = []
+            for entity_type, entity_id, position, rating, result_id in \
+                ratings[start:start + INSERT_BATCH_SIZE]:
+                rows.extend((entity_type, entity_id, position, rating.mu,
+                    rating.sigma, result_id))
+
+            self.execute(cursor, "INSERT INTO rating_history (entity_type, \
+entity_id, position, mu, sigma, result_id) VALUES {0}".format(", ".join(
+                ["(%s, %s, %s, %s, %s, %s)"] * (len(rows) // 6))), rows)
+
+    def add_player(self, first_name, last_name, nickname):
+        """Method to add a player to the database
+
+        Args:
+            first_name (str):   player first name
+            last_name(str):     player last name
+            nickname (str):     player nickname
+
+        Raises:
+            data_manager_exceptions.DBValueError
+            data_manager_exceptions.DBExistError
+            data_manager_exceptions.DBConnectionError
+            data_manager_exceptions.DBSyntaxError
+
+        """
+
+        if len(first_name) is 0:
+            raise data_manager_exceptions.DBValueError("First name must be at \
+least one character")
+
+        if len(last_name) is 0:
+            raise data_manager_exceptions.DBValueError("Last name must be at \
+least one character")
+
+        try:
+            if not self.check_if_player_exists(first_name=first_name,
+                last_name=last_name, nickname=nickname):
+                raise data_manager_exceptions.DBExistError("Name already \
+exists in database")
+
+            rating = trueskill.Rating()
+
+            self.check_if_db_connected()
+            cursor = self.db_conn.cursor()
+
+            LOGGER.info("Adding player to database")
+            self.execute(cursor, "INSERT INTO player (first_name, last_name, \
+nickname, offense_mu, offense_sigma, defense_mu, defense_sigma) VALUES \
+(%s, %s, %s, %s, %s, %s, %s)", (first_name, last_name, nickname, rating.mu,
+                rating.sigma, rating.mu, rating.sigma))
+            player_id = cursor.lastrowid
+            self.add_rating_history(cursor, [('player', player_id, position,
+                rating, None) for position in ('offense', 'defense')])
+            rank = conservative_rank(rating)
+            self.execute(cursor, "INSERT INTO player_standing (player_id, \
+position, ranking) VALUES (%s, %s, %s), (%s, %s, %s)", (player_id, 'Offense',
+                rank, player_id, 'Defense', rank))
+            self.record_identity_change(cursor,
+                players={(first_name, last_name, nickname): player_id})
+
+        except MySQLdb.OperationalError as error:
+            LOGGER.error("MySQL operational error occured")
+            traceback.print_exc()
+            raise operational_error(error)
+
+        except MySQLdb.ProgrammingError:
+            LOGGER.error("MySQL programming error")
+            traceback.print_exc()
+            raise data_manager_exceptions.DBSyntaxError("MySQL syntax error")
+
+        except MySQLdb.IntegrityError as error:
+            if error.args[0] != DUPLICATE_ENTRY:
+                raise
+            LOGGER.error("Player name already exists")
+            raise data_manager_exceptions.DBExistError("Name already \
+exists in database")
+
+        else:
+            pass
+
+    def edit_player(self, previous_player, new):
+        """TODO"""
+        if len(new['first_name']) is 0:
+            raise data_manager_exceptions.DBValueError("First name must be at \
+least one character")
+
+        if len(new['last_name']) is 0:
+            raise data_manager_exceptions.DBValueError("Last name must be at \
+least one character")
+
+        if not self.check_if_player_exists(**new):
+            raise data_manager_exceptions.DBExistError("Name you are trying to change to already \
+exists in database")
+
+        previous = (previous_player['previous_first_name'],
+            previous_player['previous_last_name'],
+            previous_player['previous_nickname'])
+        player_id = self.get_player_id(previous)
+
+        if player_id is None:
+            raise data_manager_exceptions.DBExistError("Player doesn't exist")
+
+        self.check_if_db_connected()
+        cursor = self.db_conn.cursor()
+        LOGGER.info('Editing player')
+
+        try:
+            self.execute(cursor, "UPDATE player SET first_name = %s, \
+last_name = %s, nickname = %s WHERE player_id = %s", (new['first_name'],
+                new['last_name'], new['nickname'], player_id))
+            self.record_identity_change(cursor, players={previous: None,
+                (new['first_name'], new['last_name'], new['nickname']):
+                player_id})
+        except MySQLdb.OperationalError as error:
+            LOGGER.error("MySQL operational error occured")
+            traceback.print_exc()
+            raise operational_error(error)
+
+        except MySQLdb.ProgrammingError:
+            LOGGER.error("MySQL programming error")
+            traceback.print_exc()
+            raise data_manager_exceptions.DBSyntaxError("MySQL syntax error")
+
+        except MySQLdb.IntegrityError as error:
+            if error.args[0] != DUPLICATE_ENTRY:
+                raise
+            LOGGER.error("Player name already exists")
+            raise data_manager_exceptions.DBExistError("Name you are trying \
+to change to already exists in database")
+
+        else:
+            pass
+    def delete_player(self, first_name, last_name, nickname):
+        """TODO"""
+        """Method to delete a player from the database
+
+        Args:
+            first_name (str):   player first name
+            last_name(str):     player last name
+            nickname (str):     player nickname
+
+        Raises:
+            data_manager_exceptions.DBValueError
+            data_manager_exceptions.DBExistError
+            data_manager_exceptions.DBConnectionError
+            data_manager_exceptions.DBSyntaxError
+
+        """
+
+        #TODO check if data exists and don't delete if it does
+        #TODO deleting player should also delete a team
+
+        if len(first_name) is 0:
+            raise data_manager_exceptions.DBValueError("First name must be at \
+least one character")
+
+        if len(last_name) is 0:
+            raise data_manager_exceptions.DBValueError("Last name must be at \
+least one character")
+
+        try:
+            LOGGER.info("Checking that player already exists")
+            LOGGER.debug("Player parameters:\n\
+first name: {0}\n\
+last name: {1}\n\
+nickname: {2}".format(first_name, last_name, nickname))
+            player_id = self.get_player_id((first_name, last_name,
+                nickname))
+
+            if player_id is None:
+                raise data_manager_exceptions.DBExistError("Player \
+doesn't exist")
+
+            LOGGER.info("Deleting player from database")
+            self.check_if_db_connected()
+            cursor = self.db_conn.cursor()
+            self.execute(cursor, "DELETE FROM player WHERE player_id = %s",
+                (player_id,))
+            self.execute(cursor, "DELETE FROM player_standing WHERE \
+player_id = %s", (player_id,))
+            self.record_identity_change(cursor,
+                players={(first_name, last_name, nickname): None})
+        except MySQLdb.OperationalError as error:
+            LOGGER.error("Cannot connect to MySQL server")
+            raise operational_error(error)
+        except MySQLdb.ProgrammingError:
+            LOGGER.error("MySQL syntax error")
+            raise data_manager_exceptions.DBSyntaxError("MySQL syntax error")
+        else:
+            pass
+
+    @cached_read
+    @retry_on_disconnect
+    def get_all_players(self):
+        """Method to get all players from database
+
+        Args:
+            None
+
+        Returns:
+            players (tup):  tuple of player tuples
+
+        Raises:
+            data_manager_exceptions.DBConnectionError
+            data_manager_exceptions.DBSyntaxError
+
+        """
+
+        try:
+            LOGGER.info("Getting player list")
+            self.check_if_db_connected()
+            cursor = self.db_conn.cursor()
+            self.execute(cursor, "SELECT first_name, last_name, nickname FROM \
+player ORDER BY time DESC")
+            players = cursor.fetchall()
+
+        except MySQLdb.OperationalError:
+            LOGGER.error("MySQL operational error occured")
+            traceback.print_exc()
+            raise data_manager_exceptions.DBConnectionError("Cannot connect \
+to MySQL server")
+
+        except MySQLdb.ProgrammingError:
+            LOGGER.error("MySQL programming error")
+            traceback.print_exc()
+            raise data_manager_exceptions.DBSyntaxError("MySQL syntax error")
+
+        else:
+            return players
+
+    @cached_read
+    @retry_on_disconnect
+    def get_total_players(self):
+        """Method to get player count from database
+
+        Args:
+            None
+
+        Returns:
+            count (int):    count of players
+
+        Raises:
+            data_manager_exceptions.DBConnectionError
+            data_manager_exceptions.DBSyntaxError
+
+        """
+
+        try:
+            LOGGER.info("Getting total player count")
+            self.check_if_db_connected()
+            cursor = self.db_conn.cursor()
+            self.execute(cursor, "SELECT COUNT(player_id) FROM player")
+            count = cursor.fetchone()[0]
+
+        except MySQLdb.OperationalError:
+            LOGGER.error("MySQL operational error occured")
+            traceback.print_exc()
+            raise data_manager_exceptions.DBConnectionError("Cannot connect \
+to MySQL server")
+
+        except MySQLdb.ProgrammingError:
+            LOGGER.error("MySQL programming error")
+            traceback.print_exc()
+            raise data_manager_exceptions.DBSyntaxError("MySQL syntax error")
+
+        else:
+            return count
+
+    @cached_read
+    @retry_on_disconnect
+    def get_total_teams(self):
+        """Method to get team count from database
+
+        Args:
+            None
+
+        Return:
+            count (int):    total number of teams
+
+        Raises:
+            data_manager_exceptions.DBConnectionError
+            data_manager_exceptions.DBSyntaxError
+
+        """
+
+        try:
+            LOGGER.info("Getting total team count")
+            self.check_if_db_connected()
+            cursor = self.db_conn.cursor()
+            self.execute(cursor, "SELECT COUNT(team_id) FROM team")
+            count = cursor.fetchone()[0]
+
+        except MySQLdb.OperationalError:
+            LOGGER.error("MySQL operational error occured")
+            traceback.print_exc()
+            raise data_manager_exceptions.DBConnectionError("Cannot connect \
+to MySQL server")
+
+        except MySQLdb.ProgrammingError:
+            LOGGER.error("MySQL programming error")
+            traceback.print_exc()
+            raise data_manager_exceptions.DBSyntaxError("MySQL syntax error")
+
+        else:
+            return count
+
+    @cached_read
+    @retry_on_disconnect
+    def get_all_teams(self):
+        """Method to get all teams from database
+
+        Args:
+            None
+
+        Returns:
+            teams (tup):    tuple of team tuples
+
+        Raises:
+            data_manager_exceptions.DBValueError
+            data_manager_exceptions.DBConnectionError
+            data_manager_exceptions.DBSyntaxError
+
+        """
+
+        all_teams = []
+
+        try:
+            LOGGER.info("Getting team list")
+            self.check_if_db_connected()
+            cursor = self.db_conn.cursor()
+            self.execute(cursor, "SELECT team.team_id, team.team_name, \
+player.first_name, player.last_name, player.nickname FROM team \
+LEFT JOIN player_team_xref ON player_team_xref.team = team.team_id \
+LEFT JOIN player ON player.player_id = player_team_xref.player \
+ORDER BY team.time DESC, team.team_id, player_team_xref.xref_id")
+            members = cursor.fetchall()
+
+            previous_team_id = None
+            for team_id, name, first_name, last_name, nickname in members:
+                if team_id != previous_team_id:
+                    all_teams.append([name])
+                    previous_team_id = team_id
+
+                if first_name is not None:
+                    all_teams[-1].extend((first_name, last_name, nickname))
+
+            for team in all_teams:
+                if len(team) != 7:
+                    raise data_manager_exceptions.DBValueError("Found more \
+than two players per team")
+
+        except MySQLdb.OperationalError:
+            LOGGER.error("MySQL operational error occured")
+            traceback.print_exc()
+            raise data_manager_exceptions.DBConnectionError("Cannot connect \
+to MySQL server")
+
+        except MySQLdb.ProgrammingError:
+            LOGGER.error("MySQL programming error")
+            traceback.print_exc()
+            raise data_manager_exceptions.DBSyntaxError("MySQL syntax error")
+
+        else:
+            return tuple([tuple(team) for team in all_teams])
+
+    def add_team(self, team_name, member_one, member_two):
+        """Method to add a team to database
+
+        Args:
+            team_name (str):    team name
+            member_one (tup):   first member names
+            member_two (tup):   second member names
+
+        Raises:
+            data_manager_exceptions.DBValueError
+            data_manager_exceptions.DBExistError
+            data_manager_exceptions.DBConnectionError
+            data_manager_exceptions.DBSyntaxError
+
+        """
+
+        if len(team_name) is 0:
+            raise data_manager_exceptions.DBValueError("Team name must be at \
+least one character")
+
+        if len(member_one) != 3:
+            raise data_manager_exceptions.DBValueError("First team member must\
+ be complete")
+
+        if len(member_two) != 3:
+            raise data_manager_exceptions.DBValueError("Second team member must\
+ be complete")
+
+        try:
+
+            if not self.check_if_team_exists(team_name=team_name):
+                raise data_manager_exceptions.DBExistError("Team already \
+exists")
+
+            player_ids = [self.get_player_id(member) for member in (
+                member_one, member_two)]
+
+            if None in player_ids:
+                raise data_manager_exceptions.DBExistError("Player doesn't \
+exist")
+
+            if player_ids[0] == player_ids[1]:
+                raise data_manager_exceptions.DBValueError("Team members \
+must be different players")
+
+            if self.get_team_id(*player_ids) is not None:
+                raise data_manager_exceptions.DBExistError("Players already \
+on team together")
+
+            rating = trueskill.Rating()
+
+            LOGGER.info("Adding team to database")
+
+            self.check_if_db_connected()
+            cursor = self.db_conn.cursor()
+            self.execute(cursor, "INSERT INTO team (team_name, mu, sigma, \
+player_lo, player_hi) VALUES (%s, %s, %s, %s, %s)", (team_name, rating.mu,
+                rating.sigma) + identity_index.team_key(*player_ids))
+
+            team_id = cursor.lastrowid
+
+            self.add_rating_history(cursor, [('team', team_id, 'team',
+                rating, None)])
+            self.execute(cursor, "INSERT INTO team_standing (team_id, \
+ranking) VALUES (%s, %s)", (team_id, conservative_rank(rating)))
+            self.execute(cursor, "INSERT INTO player_team_xref (player, team) \
+VALUES (%s, %s), (%s, %s)", (player_ids[0], team_id, player_ids[1], team_id))
+            self.record_identity_change(cursor,
+                teams={identity_index.team_key(*player_ids): team_id})
+
+        except MySQLdb.OperationalError as error:
+            LOGGER.error("MySQL operational error occured")
+            traceback.print_exc()
+            raise operational_error(error)
+
+        except MySQLdb.ProgrammingError:
+            LOGGER.error("MySQL programming error")
+            traceback.print_exc()
+            raise data_manager_exceptions.DBSyntaxError("MySQL syntax error")
+
+        except MySQLdb.IntegrityError as error:
+            if error.args[0] == DUPLICATE_ENTRY:
+                if self.lock_team_id(*player_ids) is not None:
+                    LOGGER.error("Players already on team together")
+                    raise data_manager_exceptions.DBExistError("Players \
+already on team together")
+                LOGGER.error("Team name already exists")
+                raise data_manager_exceptions.DBExistError("Team already \
+exists")
+            LOGGER.error("MySQL programming error")
+            traceback.print_exc()
+            raise data_manager_exceptions.DBValueError("MySQL integrity error")
+
+        else:
+            return team_id
+
+    def add_result(self, offense_winner, defense_winner, offense_loser,
+        defense_loser):
+        """Method to add a result to database
+
+        Args:
+            offense_winner(tup):    offense_winner
+            defense_winner (tup):   defense_winner
+            offense_loser (tup):    offense_loser
+            defense_loser (tup):    defense_loser
+
+        Raises:
+            data_manager_exceptions.DBValueError
+            data_manager_exceptions.DBExistError
+            data_manager_exceptions.DBConnectionError
+            data_manager_exceptions.DBSyntaxError
+
+        """
+
+        errors = self.add_results([(offense_winner, defense_winner,
+            offense_loser, defense_loser)])
+
+        if errors:
+            raise errors[0][1]
+
+    def get_game_player_ids(self, game, seats=("Offense winner",
+        "Defense winner", "Offense loser", "Defense loser")):
+        """Method to validate a game and resolve its players
+
+        Args:
+            game (tup):         offense winner, defense winner, offense loser
+                                and defense loser
+            seats (tup):        seat names used in errors
+
+        Returns:
+            player_ids (list):  player_ids in the same order
+
+        Raises:
+            data_manager_exceptions.DBValueError
+            data_manager_exceptions.DBExistError
+
+        """
+
+        if len(game) != 4:
+            raise data_manager_exceptions.DBValueError("Result must have \
+four players")
+
+        for player, seat in zip(game, seats):
+            if len(player) != 3:
+                raise data_manager_exceptions.DBValueError("{0} must be \
+complete".format(seat))
+
+        player_ids = [self.get_player_id(player) for player in game]
+
+        if None in player_ids:
+            raise data_manager_exceptions.DBExistError("Player doesn't exist")
+
+        if len(set(player_ids)) != 4:
+            raise data_manager_exceptions.DBValueError("Player can't be in a \
+result twice")
+
+        return player_ids
+
+    def get_game_team_id(self, members, member_ids):
+        """Method to get the team_id of a result side, creating the team
+
+        Args:
+            members (tup):      name tuples of both players
+            member_ids (list):  player_ids of both players
+
+        Returns:
+            team_id (int):      team_id
+
+        Raises:
+            data_manager_exceptions.DBExistError
+            data_manager_exceptions.DBConnectionError
+            data_manager_exceptions.DBSyntaxError
+
+        """
+
+        team_id = self.get_team_id(*member_ids)
+
+        if team_id is None:
+            try:
+                team_id = self.add_team(team_name="{0} & {1}".format(
+                    members[0][0], members[1][0]), member_one=members[0],
+                    member_two=members[1])
+            except data_manager_exceptions.DBExistError:
+                # a concurrent submission created it first
+                team_id = self.lock_team_id(*member_ids)
+                if team_id is None:
+                    raise
+
+        return team_id
+
+    def add_results(self, games):
+        """Method to add a batch of results to database
+
+        Games are rated in the order given, each against the ratings left by
+        the games before it. Ratings are read once and kept in memory, and
+        results, ratings, history and standings are written with multi-row
+        statements. Games that fail validation are skipped and reported, the
+        rest are still added. Nothing is committed.
+
+        Args:
+            games (list):   (offense_winner, defense_winner, offense_loser,
+                            defense_loser) tuples of player name tuples
+
+        Returns:
+            errors (list):  (index, exception) of every skipped game
+
+        Raises:
+            data_manager_exceptions.DBConnectionError
+            data_manager_exceptions.DBSyntaxError
+
+        """
+
+        try:
+            LOGGER.info("Adding %d results to database", len(games))
+            self.check_if_db_connected()
+            cursor = self.db_conn.cursor()
+
+            # taken before teams are created, which locks the identity
+            # version, to keep the lock order of every other writer
+            self.lock_ratings(cursor)
+
+            errors = []
+            valid = []
+            for index, game in enumerate(games):
+                try:
+                    game_ids = self.get_game_player_ids(game)
+                    side = (self.get_game_team_id(game[:2], game_ids[:2]),
+                        self.get_game_team_id(game[2:], game_ids[2:]))
+                except (data_manager_exceptions.DBValueError,
+                    data_manager_exceptions.DBExistError) as error:
+                    errors.append((index, error))
+                else:
+                    valid.append((game_ids, side))
+
+            if not valid:
+                return errors
+
+            player_ids = sorted(set(player_id for game_ids, _ in valid
+                for player_id in game_ids))
+            self.execute(cursor, "SELECT player_id, offense_mu, \
+offense_sigma, defense_mu, defense_sigma FROM player WHERE player_id IN \
+({0}) FOR UPDATE".format(", ".join(["%s"] * len(player_ids))), player_ids)
+            ratings = {}
+            for player_id, offense_mu, offense_sigma, defense_mu, \
+                defense_sigma in cursor.fetchall():
+                ratings[('player', player_id, 'offense')] = trueskill.Rating(
+                    mu=offense_mu, sigma=offense_sigma)
+                ratings[('player', player_id, 'defense')] = trueskill.Rating(
+                    mu=defense_mu, sigma=defense_sigma)
+
+            team_ids = sorted(set(team_id for _, side in valid
+                for team_id in side))
+            self.execute(cursor, "SELECT team_id, mu, sigma FROM team WHERE \
+team_id IN ({0}) FOR UPDATE".format(", ".join(["%s"] * len(team_ids))),
+                team_ids)
+            for team_id, mu, sigma in cursor.fetchall():
+                ratings[('team', team_id, 'team')] = trueskill.Rating(mu=mu,
+                    sigma=sigma)
+
+            LOGGER.info("Rating results")
+            history = []
+            records = {}
+            for number, (game_ids, side) in enumerate(valid):
+                keys = [('player', player_id, seat) for player_id, seat in
+                    zip(game_ids, SEATS)]
+                winners, losers = rating_kernel.rate_2vs2(
+                    (ratings[keys[0]], ratings[keys[1]]),
+                    (ratings[keys[2]], ratings[keys[3]]))
+                new_ratings = list(winners + losers)
+
+                keys.extend(('team', team_id, 'team') for team_id in side)
+                new_ratings.extend(rating_kernel.rate_1vs1(ratings[keys[4]],
+                    ratings[keys[5]]))
+
+                for key, new_rating, won in zip(keys, new_ratings,
+                    (1, 1, 0, 0, 1, 0)):
+                    ratings[key] = new_rating
+                    history.append(key + (new_rating, number))
+                    record = records.setdefault(key, [0, 0])
+                    record[1 - won] += 1
+
+            LOGGER.info("Writing results")
+            first_id = None
+            for start in range(0, len(valid), INSERT_BATCH_SIZE):
+                rows = [player_id for game_ids, _ in
+                    valid[start:start + INSERT_BATCH_SIZE]
+                    for player_id in game_ids]
+                self.execute(cursor, "INSERT INTO result (offense_winner, \
+defense_winner, offense_loser, defense_loser) VALUES {0}".format(", ".join(
+                    ["(%s, %s, %s, %s)"] * (len(rows) // 4))), rows)
+                if first_id is None:
+                    first_id = cursor.lastrowid
+
+            # the ids are read back rather than counted from the first one,
+            # auto increment steps and gaps depend on the server settings;
+            # the rating lock keeps other writers from adding results
+            self.execute(cursor, "SELECT result_id FROM result WHERE \
+result_id >= %s ORDER BY result_id LIMIT %s", (first_id, len(valid)))
+            result_ids = [row[0] for row in cursor.fetchall()]
+
+            self.add_rating_history(cursor, [entry[:4] +
+                (result_ids[entry[4]],) for entry in history])
+
+            updated = dict((key, ratings[key]) for key in records)
+            self.update_ratings(cursor, updated)
+            self.update_standings(cursor, updated, records)
+
+            self.execute(cursor, "SELECT COALESCE(MAX(result_id), 0) FROM \
+rating_checkpoint")
+            if result_ids[-1] - cursor.fetchone()[0] >= \
+                self.checkpoint_interval:
+                self.add_checkpoint(cursor, result_ids[-1])
+
+        except MySQLdb.OperationalError as error:
+            LOGGER.error("MySQL operational error occured")
+            traceback.print_exc()
+            raise operational_error(error)
+
+        except MySQLdb.ProgrammingError:
+            LOGGER.error("MySQL programming error")
+            traceback.print_exc()
+            raise data_manager_exceptions.DBSyntaxError("MySQL syntax error")
+
+        else:
+            return errors
+
+    def lock_ratings(self, cursor):
+        """Method to take the lock serializing rating changes
+
+        The lock is held until commit. Every transaction that rates results
+        takes it first, so results are rated in result_id order and a
+        checkpoint saved by one transaction holds exactly the results up to
+        it. It is also taken before the identity version is bumped, so
+        transactions holding both locks always take them in the same order.
+
+        Args:
+            cursor (obj):   cursor on the calling thread's connection
+
+        Returns:
+            None
+
+        """
+
+        self.execute(cursor, "SELECT version FROM data_version WHERE \
+name = %s FOR UPDATE", ('ratings',))
+        cursor.fetchall()
+
+    def update_ratings(self, cursor, ratings):
+        """Method to write current player and team ratings
+
+        Args:
+            cursor (obj):   cursor on the calling thread's connection
+            ratings (dict): (entity_type, entity_id, position) keys to
+                            trueskill ratings
+
+        Returns:
+            None
+
+        """
+
+        keys = sorted(ratings)
+        for seat in ('offense', 'defense'):
+            self.execute_many(cursor, "UPDATE player SET {0}_mu = %s, \
+{0}_sigma = %s WHERE player_id = %s".format(seat), [(ratings[key].mu,
+                ratings[key].sigma, key[1]) for key in keys
+                if key[0] == 'player' and key[2] == seat])
+        self.execute_many(cursor, "UPDATE team SET mu = %s, sigma = %s \
+WHERE team_id = %s", [(ratings[key].mu, ratings[key].sigma, key[1])
+            for key in keys if key[0] == 'team'])
+
+    def update_standings(self, cursor, ratings, records):
+        """Method to re-rank players and teams and adjust their records
+
+        Args:
+            cursor (obj):   cursor on the calling thread's connection
+            ratings (dict): (entity_type, entity_id, position) keys to
+                            trueskill ratings, every key is re-ranked
+            records (dict): keys to [wins, losses] added to the record, may
+                            be negative
+
+        Returns:
+            None
+
+        """
+
+        player_standings = []
+        team_standings = []
+        for key in sorted(ratings):
+            rank = conservative_rank(ratings[key])
+            wins, losses = records.get(key, (0, 0))
+            if key[0] == 'player':
+                player_standings.append((key[1], key[2].capitalize(), rank,
+                    wins, losses))
+            else:
+                team_standings.append((key[1], rank, wins, losses))
+
+        for start in range(0, len(player_standings), INSERT_BATCH_SIZE):
+            rows = player_standings[start:start + INSERT_BATCH_SIZE]
+            self.execute(cursor, "INSERT INTO player_standing (player_id, \
+position, ranking, wins, losses) VALUES {0} ON DUPLICATE KEY UPDATE \
+ranking = VALUES(ranking), wins = wins + VALUES(wins), \
+losses = losses + VALUES(losses)".format(", ".join(
+                ["(%s, %s, %s, %s, %s)"] * len(rows))),
+                [value for row in rows for value in row])
+
+        for start in range(0, len(team_standings), INSERT_BATCH_SIZE):
+            rows = team_standings[start:start + INSERT_BATCH_SIZE]
+            self.execute(cursor, "INSERT INTO team_standing (team_id, \
+ranking, wins, losses) VALUES {0} ON DUPLICATE KEY UPDATE \
+ranking = VALUES(ranking), wins = wins + VALUES(wins), \
+losses = losses + VALUES(losses)".format(", ".join(
+                ["(%s, %s, %s, %s)"] * len(rows))),
+                [value for row in rows for value in row])
+
+    def add_checkpoint(self, cursor, result_id, ratings=None):
+        """Method to save the ratings of all players and teams
+
+        Players and teams missing from a checkpoint had the default rating
+        at that point.
+
+        Args:
+            cursor (obj):       cursor on the calling thread's connection
+            result_id (int):    last result the ratings include
+            ratings (dict):     (entity_type, entity_id, position) keys to
+                                trueskill ratings, the current ratings of
+                                all players and teams if None
+
+        Returns:
+            None
+
+        """
+
+        LOGGER.info("Saving rating checkpoint at result %d", result_id)
+        self.execute(cursor, "INSERT INTO rating_checkpoint (result_id) \
+VALUES (%s)", (result_id,))
+
+        if ratings is None:
+            self.execute(cursor, "INSERT INTO rating_snapshot (result_id, \
+entity_type, entity_id, position, mu, sigma) \
+SELECT %s, 'player', player_id, 'offense', offense_mu, offense_sigma \
+FROM player UNION ALL \
+SELECT %s, 'player', player_id, 'defense', defense_mu, defense_sigma \
+FROM player UNION ALL \
+SELECT %s, 'team', team_id, 'team', mu, sigma FROM team",
+                (result_id, result_id, result_id))
+            return
+
+        rows = [key + (rating.mu, rating.sigma) for key, rating in
+            sorted(ratings.items())]
+        for start in range(0, len(rows), INSERT_BATCH_SIZE):
+            chunk = rows[start:start + INSERT_BATCH_SIZE]
+            self.execute(cursor, "INSERT INTO rating_snapshot (result_id, \
+entity_type, entity_id, position, mu, sigma) VALUES {0}".format(", ".join(
+                ["(%s, %s, %s, %s, %s, %s)"] * len(chunk))),
+                [value for row in chunk for value in (result_id,) + row])
+
+    def replay_ratings(self, cursor, result_id, records):
+        """Method to re-rate all results from result_id on
+
+        Ratings are restored from the last checkpoint before result_id, the
+        results after it are rated again in order, and checkpoints are saved
+        along the way. Ratings, history and standings are written back for
+        every player and team that played in the replayed results or has
+        its record adjusted. The caller holds the ratings lock.
+
+        Args:
+            cursor (obj):       cursor on the calling thread's connection
+            result_id (int):    first result whose rating changed
+            records (dict):     (entity_type, entity_id, position) keys to
+                                [wins, losses] added to the standings of
+                                players and teams whose results changed
+
+        Returns:
+            replayed (int):     results rated again
+
+        """
+
+        self.execute(cursor, "DELETE FROM rating_snapshot WHERE \
+result_id >= %s", (result_id,))
+        self.execute(cursor, "DELETE FROM rating_checkpoint WHERE \
+result_id >= %s", (result_id,))
+
+        self.execute(cursor, "SELECT COALESCE(MAX(result_id), 0) FROM \
+rating_checkpoint")
+        checkpoint_id = cursor.fetchone()[0]
+        LOGGER.info("Replaying results from checkpoint %d", checkpoint_id)
+
+        self.execute(cursor, "SELECT entity_type, entity_id, position, mu, \
+sigma FROM rating_snapshot WHERE result_id = %s", (checkpoint_id,))
+        ratings = dict((row[:3], trueskill.Rating(mu=row[3], sigma=row[4]))
+            for row in cursor.fetchall())
+
+        self.execute(cursor, "SELECT result_id, offense_winner, \
+defense_winner, offense_loser, defense_loser FROM result \
+WHERE result_id > %s ORDER BY result_id", (checkpoint_id,))
+        results = cursor.fetchall()
+
+        default = trueskill.Rating()
+        updated = dict((key, ratings.get(key, default)) for key in records)
+        history = []
+        for row in results:
+            keys = [('player', player_id, seat) for player_id, seat in
+                zip(row[1:], SEATS)]
+            winners, losers = rating_kernel.rate_2vs2(
+                (ratings.get(keys[0], default), ratings.get(keys[1], default)),
+                (ratings.get(keys[2], default), ratings.get(keys[3], default)))
+            new_ratings = list(winners + losers)
+
+            team_ids = (self.get_team_id(*row[1:3]),
+                self.get_team_id(*row[3:5]))
+            if None in team_ids:
+                LOGGER.warning("Result %d has no team, its team ratings are \
+not replayed", row[0])
+            else:
+                keys.extend(('team', team_id, 'team') for team_id in team_ids)
+                new_ratings.extend(rating_kernel.rate_1vs1(
+                    ratings.get(keys[4], default),
+                    ratings.get(keys[5], default)))
+
+            for key, new_rating in zip(keys, new_ratings):
+                ratings[key] = new_rating
+                updated[key] = new_rating
+                history.append(key + (new_rating, row[0]))
+
+            if row[0] - checkpoint_id >= self.checkpoint_interval:
+                self.add_checkpoint(cursor, row[0], ratings)
+                checkpoint_id = row[0]
+
+        self.execute(cursor, "DELETE FROM rating_history WHERE \
+result_id >= %s", (result_id,))
+        self.add_rating_history(cursor, [entry for entry in history
+            if entry[4] >= result_id])
+        # replayed ratings are dated by their result, not by the replay
+        self.execute(cursor, "UPDATE rating_history JOIN result \
+ON result.result_id = rating_history.result_id \
+SET rating_history.time = result.time \
+WHERE rating_history.result_id >= %s", (result_id,))
+        self.update_ratings(cursor, updated)
+        self.update_standings(cursor, updated, records)
+
+        return len(results)
+
+    def get_result_records(self, result, sign):
+        """Method to get the record changes of a result
+
+        Args:
+            result (tup):   offense winner, defense winner, offense loser and
+                            defense loser player_ids
+            sign (int):     1 for a result being added, -1 for one removed
+
+        Returns:
+            records (dict): (entity_type, entity_id, position) keys to
+                            [wins, losses]
+
+        """
+
+        records = {}
+        for player_id, seat, won in zip(result, SEATS, (1, 1, 0, 0)):
+            records[('player', player_id, seat)] = [sign * won,
+                sign * (1 - won)]
+
+        for members, won in ((result[:2], 1), (result[2:], 0)):
+            team_id = self.get_team_id(*members)
+            if team_id is not None:
+                records[('team', team_id, 'team')] = [sign * won,
+                    sign * (1 - won)]
+
+        return records
+
+    def get_result(self, cursor, result_id):
+        """Method to lock a result and get its players
+
+        Args:
+            cursor (obj):       cursor on the calling thread's connection
+            result_id (int):    result_id
+
+        Returns:
+            result (tup):       offense winner, defense winner, offense loser
+                                and defense loser player_ids
+
+        Raises:
+            data_manager_exceptions.DBExistError
+
+        """
+
+        self.execute(cursor, "SELECT offense_winner, defense_winner, \
+offense_loser, defense_loser FROM result WHERE result_id = %s FOR UPDATE",
+            (result_id,))
+        row = cursor.fetchone()
+
+        if row is None:
+            raise data_manager_exceptions.DBExistError("Result doesn't \
+exist")
+
+        return tuple(row)
+
+    def delete_result(self, result_id):
+        """Method to delete a result and re-rate the results after it
+
+        Args:
+            result_id (int):    result_id
+
+        Raises:
+            data_manager_exceptions.DBExistError
+            data_manager_exceptions.DBConnectionError
+            data_manager_exceptions.DBSyntaxError
+
+        """
+
+        try:
+            LOGGER.info("Deleting result from database")
             self.check_if_db_connected()
             cursor = self.db_conn.cursor()
 
-            LOGGER.info("Adding player to database")
-            cursor.execute("INSERT INTO player (first_name, last_name, \
-nickname, offense_rating, defense_rating) VALUES ('{0}', '{1}', '{2}', \
-{3}, {4})".format(first_name, last_name, nickname, offense_rating_id,
-                defense_rating_id))
+            self.lock_ratings(cursor)
+            result = self.get_result(cursor, result_id)
+
+            self.execute(cursor, "DELETE FROM result WHERE result_id = %s",
+                (result_id,))
+            self.replay_ratings(cursor, result_id,
+                self.get_result_records(result, -1))
+
+        except MySQLdb.OperationalError as error:
+            LOGGER.error("MySQL operational error occured")
+            traceback.print_exc()
+            raise operational_error(error)
+
+        except MySQLdb.ProgrammingError:
+            LOGGER.error("MySQL programming error")
+            traceback.print_exc()
+            raise data_manager_exceptions.DBSyntaxError("MySQL syntax error")
+
+        else:
+            pass
+
+    def edit_result(self, result_id, offense_winner, defense_winner,
+        offense_loser, defense_loser):
+        """Method to correct the players of a result and re-rate from it
+
+        Args:
+            result_id (int):        result_id
+            offense_winner(tup):    offense_winner
+            defense_winner (tup):   defense_winner
+            offense_loser (tup):    offense_loser
+            defense_loser (tup):    defense_loser
+
+        Raises:
+            data_manager_exceptions.DBValueError
+            data_manager_exceptions.DBExistError
+            data_manager_exceptions.DBConnectionError
+            data_manager_exceptions.DBSyntaxError
+
+        """
+
+        game = (offense_winner, defense_winner, offense_loser, defense_loser)
+
+        try:
+            LOGGER.info("Editing result in database")
+            self.check_if_db_connected()
+            cursor = self.db_conn.cursor()
+            self.lock_ratings(cursor)
+
+            player_ids = self.get_game_player_ids(game)
+            self.get_game_team_id(game[:2], player_ids[:2])
+            self.get_game_team_id(game[2:], player_ids[2:])
+
+            result = self.get_result(cursor, result_id)
+
+            self.execute(cursor, "UPDATE result SET offense_winner = %s, \
+defense_winner = %s, offense_loser = %s, defense_loser = %s \
+WHERE result_id = %s", tuple(player_ids) + (result_id,))
+
+            records = self.get_result_records(result, -1)
+            add_records(records, self.get_result_records(player_ids, 1))
+
+            self.replay_ratings(cursor, result_id, records)
+
+        except MySQLdb.OperationalError as error:
+            LOGGER.error("MySQL operational error occured")
+            traceback.print_exc()
+            raise operational_error(error)
+
+        except MySQLdb.ProgrammingError:
+            LOGGER.error("MySQL programming error")
+            traceback.print_exc()
+            raise data_manager_exceptions.DBSyntaxError("MySQL syntax error")
+
+        else:
+            pass
+
+    def rebuild_ratings(self):
+        """Method to re-rate every result from the default ratings
+
+        All checkpoints are saved again on the way. Standings are rebuilt
+        from the new ratings afterwards.
+
+        Args:
+            None
+
+        Returns:
+            replayed (int):     results rated again
+
+        Raises:
+            data_manager_exceptions.DBConnectionError
+            data_manager_exceptions.DBSyntaxError
+
+        """
+
+        try:
+            LOGGER.info("Rebuilding ratings")
+            self.check_if_db_connected()
+            cursor = self.db_conn.cursor()
+
+            self.lock_ratings(cursor)
+
+            # players and teams without results go back to the default
+            default = trueskill.Rating()
+            self.execute(cursor, "UPDATE player SET offense_mu = %s, \
+offense_sigma = %s, defense_mu = %s, defense_sigma = %s", (default.mu,
+                default.sigma, default.mu, default.sigma))
+            self.execute(cursor, "UPDATE team SET mu = %s, sigma = %s",
+                (default.mu, default.sigma))
+
+            replayed = self.replay_ratings(cursor, 0, {})
+            self.rebuild_standings()
+
+        except MySQLdb.OperationalError as error:
+            LOGGER.error("MySQL operational error occured")
+            traceback.print_exc()
+            raise operational_error(error)
+
+        except MySQLdb.ProgrammingError:
+            LOGGER.error("MySQL programming error")
+            traceback.print_exc()
+            raise data_manager_exceptions.DBSyntaxError("MySQL syntax error")
+
+        else:
+            return replayed
+
+    @cached_read
+    @retry_on_disconnect
+    def get_total_results(self):
+        """Method to get result count from database
+
+        Args:
+            None
+
+        Returns:
+            count (int):    total number of results
+
+        Raises:
+            data_manager_exceptions.DBConnectionError
+            data_manager_exceptions.DBSyntaxError
+
+        """
+
+        try:
+            LOGGER.info("Getting total result count")
+            self.check_if_db_connected()
+            cursor = self.db_conn.cursor()
+            self.execute(cursor, "SELECT COUNT(result_id) FROM result")
+            count = cursor.fetchone()[0]
 
         except MySQLdb.OperationalError:
             LOGGER.error("MySQL operational error occured")
@@ -439,37 +2524,45 @@ to MySQL server")
             raise data_manager_exceptions.DBSyntaxError("MySQL syntax error")
 
         else:
-            pass
+            return count
 
-    def edit_player(self, previous_player, new):
-        """TODO"""
-        if len(new['first_name']) is 0:
-            raise data_manager_exceptions.DBValueError("First name must be at \
-least one character")
+    @retry_on_disconnect
+    def get_all_results(self, page_size=None, cursor=None, direction='next'):
+        """Method to get all results from database
 
-        if len(new['last_name']) is 0:
-            raise data_manager_exceptions.DBValueError("Last name must be at \
-least one character")
+        Args:
+            page_size (int):    results per page, or None for all results
+            cursor (str):       page cursor from a previous page
+            direction (str):    'next' for older or 'prev' for newer results
 
-        if not self.check_if_player_exists(**new):
-            raise data_manager_exceptions.DBExistError("Name you are trying to change to already \
-exists in database")
+        Returns:
+            results (tup):      tuple of result tuples
+            (tup):              (results, prev_cursor, next_cursor) if
+                                page_size is given
 
-        self.check_if_db_connected()
-        cursor = self.db_conn.cursor()
-        LOGGER.info('Editing player')
+        Raises:
+            data_manager_exceptions.DBValueError
+            data_manager_exceptions.DBConnectionError
+            data_manager_exceptions.DBSyntaxError
+
+        """
+
+        if page_size is None:
+            predicate, params, order, limit = "TRUE", (), "DESC", ""
+        else:
+            predicate, params, order = keyset_filter(cursor, direction)
+            params = params + (int(page_size) + 1,)
+            limit = "LIMIT %s"
 
-        sql_params = dict(previous_player.items() + new.items())
-        sql = """UPDATE player
-                 SET first_name='{first_name}',
-                     last_name='{last_name}',
-                     nickname='{nickname}'
-                 WHERE first_name='{previous_first_name}' AND
-                       last_name='{previous_last_name}' AND
-                       nickname='{previous_nickname}';""".format(**sql_params)
-        LOGGER.info(sql)
         try:
-            cursor.execute(sql)
+            LOGGER.info("Getting result list")
+            self.check_if_db_connected()
+            db_cursor = self.db_conn.cursor()
+            self.execute(db_cursor, "{0} WHERE {1} ORDER BY result.time {2}, \
+result.result_id {2} {3}".format(RESULT_SELECT, predicate, order, limit),
+                params)
+            rows = db_cursor.fetchall()
+
         except MySQLdb.OperationalError:
             LOGGER.error("MySQL operational error occured")
             traceback.print_exc()
@@ -482,15 +2575,27 @@ to MySQL server")
             raise data_manager_exceptions.DBSyntaxError("MySQL syntax error")
 
         else:
-            pass
-    def delete_player(self, first_name, last_name, nickname):
-        """TODO"""
-        """Method to delete a player from the database
+            if page_size is None:
+                return format_results(rows)
+
+            return paginate_results(rows, int(page_size), cursor, direction)
+
+    @retry_on_disconnect
+    def get_individual_results(self, player, position, page_size=None,
+        cursor=None, direction='next'):
+        """Method to get individual's results from database
 
         Args:
-            first_name (str):   player first name
-            last_name(str):     player last name
-            nickname (str):     player nickname
+            player (tup):       player names
+            position (str):     player position
+            page_size (int):    results per page, or None for all results
+            cursor (str):       page cursor from a previous page
+            direction (str):    'next' for older or 'prev' for newer results
+
+        Returns:
+            results (tup):      tuple of result tuples
+            (tup):              (results, prev_cursor, next_cursor) if
+                                page_size is given
 
         Raises:
             data_manager_exceptions.DBValueError
@@ -500,80 +2605,121 @@ to MySQL server")
 
         """
 
-        #TODO check if data exists and don't delete if it does
-        #TODO deleting player should also delete a team
+        if len(player) != 3:
+            raise data_manager_exceptions.DBValueError("Player must\
+ be complete")
 
-        if len(first_name) is 0:
-            raise data_manager_exceptions.DBValueError("First name must be at \
-least one character")
+        if position == 'Offense':
+            columns = ('offense_winner', 'offense_loser')
+        elif position == 'Defense':
+            columns = ('defense_winner', 'defense_loser')
+        else:
+            raise data_manager_exceptions.DBValueError("Unrecognized\
+position")
 
-        if len(last_name) is 0:
-            raise data_manager_exceptions.DBValueError("Last name must be at \
-least one character")
+        if page_size is None:
+            predicate, params, order, limit = "TRUE", (), "DESC", ""
+            limit_params = ()
+        else:
+            predicate, params, order = keyset_filter(cursor, direction)
+            limit = "LIMIT %s"
+            limit_params = (int(page_size) + 1,)
 
         try:
-            LOGGER.info("Checking that player already exists")
-            LOGGER.debug("Player parameters:\n\
-first name: {0}\n\
-last name: {1}\n\
-nickname: {2}".format(first_name, last_name, nickname))
+            LOGGER.info("Getting individual result list")
             self.check_if_db_connected()
-            cursor = self.db_conn.cursor()
-            cursor.execute("SELECT player_id, first_name, last_name, \
-nickname FROM player")
-            players = cursor.fetchall()
-
-            if len(players) is 0:
-                raise data_manager_exceptions.DBExistError("No players \
-in database to delete")
-
-            for player in players:
-                player_id, existing_first_name, existing_last_name, \
-                    existing_nickname = player
-            
-                if (first_name == existing_first_name) and (last_name == 
-                    existing_last_name) and (nickname == existing_nickname):
-                    LOGGER.info("Deleting player from database")
-                    cursor.execute("DELETE FROM player WHERE player_id \
-= {0}".format(player_id))
-                    return
-                else:
-                    continue
+            db_cursor = self.db_conn.cursor()
+            player_id = self.get_player_id(player)
 
-            raise data_manager_exceptions.DBExistError("Player \
+            if player_id is None:
+                raise data_manager_exceptions.DBExistError("Player \
 doesn't exist")
+
+            # one index range per column, so deep pages cost the same as
+            # the first one
+            page = " UNION ALL ".join(["(SELECT result_id FROM result WHERE \
+{0} = %s AND {1} ORDER BY time {2}, result_id {2} {3})".format(column,
+                predicate, order, limit) for column in columns])
+            page_params = ((player_id,) + params + limit_params) * \
+                len(columns)
+
+            self.execute(db_cursor, "{0} JOIN ({1}) AS page ON \
+page.result_id = result.result_id ORDER BY result.time {2}, \
+result.result_id {2} {3}".format(RESULT_SELECT, page, order, limit),
+                page_params + limit_params)
+            rows = db_cursor.fetchall()
+
         except MySQLdb.OperationalError:
-            LOGGER.error("Cannot connect to MySQL server")
+            LOGGER.error("MySQL operational error occured")
+            traceback.print_exc()
             raise data_manager_exceptions.DBConnectionError("Cannot connect \
 to MySQL server")
+
         except MySQLdb.ProgrammingError:
-            LOGGER.error("MySQL syntax error")
+            LOGGER.error("MySQL programming error")
+            traceback.print_exc()
             raise data_manager_exceptions.DBSyntaxError("MySQL syntax error")
+
         else:
-            pass
+            if page_size is None:
+                return format_results(rows)
 
-    def get_all_players(self):
-        """Method to get all players from database
+            return paginate_results(rows, int(page_size), cursor, direction)
+
+    @cached_read
+    @retry_on_disconnect
+    def get_rating_timeline(self, player, position, start=None, end=None):
+        """Method to get the rating history of a player position
 
         Args:
-            None
+            player (tup):       player names
+            position (str):     player position
+            start (obj):        first date included, or None
+            end (obj):          last date included, or None
 
         Returns:
-            players (tup):  tuple of player tuples
+            ratings (tup):      (time, mu, sigma) tuples, oldest first
 
         Raises:
+            data_manager_exceptions.DBValueError
+            data_manager_exceptions.DBExistError
             data_manager_exceptions.DBConnectionError
             data_manager_exceptions.DBSyntaxError
 
         """
 
+        if len(player) != 3:
+            raise data_manager_exceptions.DBValueError("Player must\
+ be complete")
+
+        if position not in ('Offense', 'Defense'):
+            raise data_manager_exceptions.DBValueError("Unrecognized \
+position")
+
         try:
-            LOGGER.info("Getting player list")
+            LOGGER.info("Getting rating timeline")
             self.check_if_db_connected()
             cursor = self.db_conn.cursor()
-            cursor.execute("SELECT first_name, last_name, nickname FROM player \
-ORDER BY time DESC")
-            players = cursor.fetchall()
+            player_id = self.get_player_id(player)
+
+            if player_id is None:
+                raise data_manager_exceptions.DBExistError("Player doesn't \
+exist")
+
+            predicate = ""
+            params = ('player', player_id, position.lower())
+            if start is not None:
+                predicate += " AND time >= %s"
+                params += (start,)
+            if end is not None:
+                predicate += " AND time < %s"
+                params += (end + datetime.timedelta(days=1),)
+
+            self.execute(cursor, "SELECT time, mu, sigma FROM rating_history \
+WHERE entity_type = %s AND entity_id = %s AND position = %s{0} \
+ORDER BY time, history_id".format(predicate), params)
+
+            return cursor.fetchall()
 
         except MySQLdb.OperationalError:
             LOGGER.error("MySQL operational error occured")
@@ -587,16 +2733,21 @@ to MySQL server")
             raise data_manager_exceptions.DBSyntaxError("MySQL syntax error")
 
         else:
-            return players
+            pass
 
-    def get_total_players(self):
-        """Method to get player count from database
+    @cached_read
+    @retry_on_disconnect
+    def get_team_rankings(self):
+        """Method to get team rankings from database
+
+        Ranks and records come from the standing tables kept up to date by
+        add_result, so the cost does not grow with the number of results.
 
         Args:
             None
 
         Returns:
-            count (int):    count of players
+            ranks (list):   team rank list
 
         Raises:
             data_manager_exceptions.DBConnectionError
@@ -604,12 +2755,30 @@ to MySQL server")
 
         """
 
+        ranks = []
+
         try:
-            LOGGER.info("Getting total player count")
+            LOGGER.info("Getting team rankings")
             self.check_if_db_connected()
             cursor = self.db_conn.cursor()
-            cursor.execute("SELECT COUNT(player_id) FROM player")
-            count = cursor.fetchone()[0]
+            self.execute(cursor, "SELECT team.team_name, standing.ranking, \
+standing.wins, standing.losses, player_one.first_name, player_two.first_name \
+FROM team_standing AS standing \
+JOIN team ON team.team_id = standing.team_id \
+JOIN player_team_xref AS xref_one ON xref_one.team = team.team_id \
+JOIN player_team_xref AS xref_two ON xref_two.team = team.team_id \
+AND xref_two.xref_id > xref_one.xref_id \
+JOIN player AS player_one ON player_one.player_id = xref_one.player \
+JOIN player AS player_two ON player_two.player_id = xref_two.player \
+ORDER BY standing.ranking DESC")
+            teams = cursor.fetchall()
+
+            for team_name, team_rank, team_win_count, team_loss_count, \
+                player_one_name, player_two_name in teams:
+
+                ranks.append((team_name, float(team_rank),
+                    int(team_win_count), int(team_loss_count),
+                    player_one_name, player_two_name))
 
         except MySQLdb.OperationalError:
             LOGGER.error("MySQL operational error occured")
@@ -623,16 +2792,21 @@ to MySQL server")
             raise data_manager_exceptions.DBSyntaxError("MySQL syntax error")
 
         else:
-            return count
+            return ranks
 
-    def get_total_teams(self):
-        """Method to get team count from database
+    @cached_read
+    @retry_on_disconnect
+    def get_individual_rankings(self):
+        """Method to get individual rankings from database
+
+        Ranks and records come from the standing tables kept up to date by
+        add_result, so the cost does not grow with the number of results.
 
         Args:
             None
 
-        Return:
-            count (int):    total number of teams
+        Returns:
+            ranks (list):   individual rank list
 
         Raises:
             data_manager_exceptions.DBConnectionError
@@ -640,12 +2814,24 @@ to MySQL server")
 
         """
 
+        ranks = []
+
         try:
-            LOGGER.info("Getting total team count")
+            LOGGER.info("Getting individual rankings")
             self.check_if_db_connected()
             cursor = self.db_conn.cursor()
-            cursor.execute("SELECT COUNT(team_id) FROM team")
-            count = cursor.fetchone()[0]
+            self.execute(cursor, "SELECT player.first_name, \
+player.last_name, player.nickname, standing.position, standing.ranking, \
+standing.wins, standing.losses FROM player_standing AS standing \
+JOIN player ON player.player_id = standing.player_id \
+ORDER BY standing.ranking DESC")
+            players = cursor.fetchall()
+
+            for first_name, last_name, nickname, position, rank, win_count, \
+                lose_count in players:
+
+                ranks.append((first_name, last_name, nickname, position,
+                    float(rank), int(win_count), int(lose_count)))
 
         except MySQLdb.OperationalError:
             LOGGER.error("MySQL operational error occured")
@@ -659,16 +2845,22 @@ to MySQL server")
             raise data_manager_exceptions.DBSyntaxError("MySQL syntax error")
 
         else:
-            return count
+            return ranks
 
-    def get_all_teams(self):
-        """Method to get all teams from database
+    @cached_read
+    @retry_on_disconnect
+    def get_player_matrices(self):
+        """Method to get the head to head and partner counts of all players
+
+        The result table is read once and cached until the next commit.
 
         Args:
             None
 
         Returns:
-            teams (tup):    tuple of team tuples
+            matrices (obj):     analytics.PlayerMatrices
+            names (dict):       first name, last name and nickname of every
+                                player_id
 
         Raises:
             data_manager_exceptions.DBConnectionError
@@ -676,36 +2868,17 @@ to MySQL server")
 
         """
 
-        all_teams = ()
-
         try:
-            LOGGER.info("Getting team list")
+            LOGGER.info("Building player matrices")
             self.check_if_db_connected()
             cursor = self.db_conn.cursor()
-            cursor.execute("SELECT team_id, team_name FROM team ORDER BY \
-time DESC")
-            teams = cursor.fetchall()
-
-            for team_id, name in teams:
-                intermediate_teams = ()
-                intermediate_teams = intermediate_teams + (name,)
-                cursor.execute("SELECT player FROM player_team_xref WHERE \
-team = {0}".format(team_id))
-                players = cursor.fetchall()
-                if len(players) != 2:
-                    raise data_manager_exceptions.DBValueError("Found more \
-than two players per team")
-
-                for player in players:
-                    cursor.execute("SELECT first_name, last_name, nickname \
-FROM player WHERE player_id = {0}".format(player[0]))
-                    first_name, last_name, nickname = cursor.fetchall()[0]
+            self.execute(cursor, "SELECT offense_winner, defense_winner, \
+offense_loser, defense_loser FROM result")
+            matrices = analytics.build(cursor.fetchall())
 
-                    intermediate_teams = intermediate_teams + (first_name,
-                        last_name, nickname)
-
-                all_teams = all_teams + (intermediate_teams,)
-                del intermediate_teams
+            self.execute(cursor, "SELECT player_id, first_name, last_name, \
+nickname FROM player")
+            names = dict((row[0], row[1:]) for row in cursor.fetchall())
 
         except MySQLdb.OperationalError:
             LOGGER.error("MySQL operational error occured")
@@ -719,15 +2892,20 @@ to MySQL server")
             raise data_manager_exceptions.DBSyntaxError("MySQL syntax error")
 
         else:
-            return all_teams
+            return matrices, names
 
-    def add_team(self, team_name, member_one, member_two):
-        """Method to add a team to database
+    def get_player_records(self, player, position, partners=False):
+        """Method to get a player's record against opponents or with partners
 
         Args:
-            team_name (str):    team name
-            member_one (tup):   first member names
-            member_two (tup):   second member names
+            player (tup):       player names
+            position (str):     player position
+            partners (bool):    records with teammates instead of opponents
+
+        Returns:
+            records (list):     (first name, last name, nickname, wins,
+                                losses) of every other player, most games
+                                first
 
         Raises:
             data_manager_exceptions.DBValueError
@@ -737,48 +2915,93 @@ to MySQL server")
 
         """
 
-        if len(team_name) is 0:
-            raise data_manager_exceptions.DBValueError("Team name must be at \
-least one character")
-
-        if len(member_one) != 3:
-            raise data_manager_exceptions.DBValueError("First team member must\
+        if len(player) != 3:
+            raise data_manager_exceptions.DBValueError("Player must\
  be complete")
 
-        if len(member_two) != 3:
-            raise data_manager_exceptions.DBValueError("Second team member must\
- be complete")
+        if position not in ('Offense', 'Defense'):
+            raise data_manager_exceptions.DBValueError("Unrecognized \
+position")
 
-        try:
+        player_id = self.get_player_id(player)
 
-            if not self.check_if_team_exists(team_name=team_name):
-                raise data_manager_exceptions.DBExistError("Team already \
-exists")
+        if player_id is None:
+            raise data_manager_exceptions.DBExistError("Player doesn't exist")
 
-            if self.check_if_players_on_team(member_one, member_two):
-                raise data_manager_exceptions.DBExistError("Players already \
-on team together")
-            
-            rating_id = self.add_rating()
+        matrices, names = self.get_player_matrices()
+        seat = ('Offense', 'Defense').index(position)
 
-            LOGGER.info("Adding team to database")
+        if partners:
+            records = matrices.get_partners(player_id, seat)
+        else:
+            records = matrices.get_opponents(player_id, seat)
 
-            self.check_if_db_connected()
-            cursor = self.db_conn.cursor()
-            cursor.execute("INSERT INTO team (team_name, rating) VALUES \
-('{0}', {1})".format(team_name, rating_id))
+        return [names[other] + (wins, losses)
+            for other, wins, losses in records if other in names]
 
-            team_id = cursor.lastrowid
+    @retry_on_disconnect
+    def predict_games(self, games):
+        """Method to get the chance that one team beats the other in games
+
+        Ratings are read once and every valid game is predicted in one
+        vectorized pass. Games that fail validation are skipped and
+        reported.
+
+        Args:
+            games (list):           (offense_one, defense_one, offense_two,
+                                    defense_two) tuples of player name tuples
+
+        Returns:
+            predictions (list):     chance that the first team wins, in the
+                                    order given, None for skipped games
+            errors (list):          (index, exception) of every skipped game
+
+        Raises:
+            data_manager_exceptions.DBConnectionError
+            data_manager_exceptions.DBSyntaxError
+
+        """
 
-            cursor.execute("INSERT INTO player_team_xref (player, team) \
-VALUES ((SELECT player_id FROM player WHERE first_name = '{0}' AND last_name \
-= '{1}' AND nickname = '{2}'), {3})".format(member_one[0], member_one[1],
-                member_one[2], team_id))
+        try:
+            LOGGER.info("Predicting %d games", len(games))
+            self.check_if_db_connected()
+            cursor = self.db_conn.cursor()
 
-            cursor.execute("INSERT INTO player_team_xref (player, team) \
-VALUES ((SELECT player_id FROM player WHERE first_name = '{0}' AND last_name \
-= '{1}' AND nickname = '{2}'), {3})".format(member_two[0], member_two[1],
-                member_two[2], team_id))
+            errors = []
+            valid = []
+            for index, game in enumerate(games):
+                try:
+                    valid.append((index, self.get_game_player_ids(game,
+                        seats=("Offense one", "Defense one", "Offense two",
+                        "Defense two"))))
+                except (data_manager_exceptions.DBValueError,
+                    data_manager_exceptions.DBExistError) as error:
+                    errors.append((index, error))
+
+            predictions = [None] * len(games)
+            if not valid:
+                return predictions, errors
+
+            player_ids = sorted(set(player_id for _, game_ids in valid
+                for player_id in game_ids))
+            self.execute(cursor, "SELECT player_id, offense_mu, \
+offense_sigma, defense_mu, defense_sigma FROM player WHERE player_id IN \
+({0})".format(", ".join(["%s"] * len(player_ids))), player_ids)
+            ratings = {}
+            for player_id, offense_mu, offense_sigma, defense_mu, \
+                defense_sigma in cursor.fetchall():
+                ratings[(player_id, 'offense')] = (offense_mu, offense_sigma)
+                ratings[(player_id, 'defense')] = (defense_mu, defense_sigma)
+
+            seated = [[ratings[key] for key in zip(game_ids, SEATS)]
+                for _, game_ids in valid]
+            probabilities = rating_kernel.win_probability_arrays(
+                [[mu for mu, _ in game] for game in seated],
+                [[sigma for _, sigma in game] for game in seated], 2,
+                trueskill.global_env().beta)
+
+            for (index, _), probability in zip(valid, probabilities):
+                predictions[index] = round(float(probability), 4)
 
         except MySQLdb.OperationalError:
             LOGGER.error("MySQL operational error occured")
@@ -791,23 +3014,22 @@ to MySQL server")
             traceback.print_exc()
             raise data_manager_exceptions.DBSyntaxError("MySQL syntax error")
 
-        except MySQLdb.IntegrityError:
-            LOGGER.error("MySQL programming error")
-            traceback.print_exc()
-            raise data_manager_exceptions.DBValueError("MySQL integrity error")
-
         else:
-            return team_id
+            return predictions, errors
 
-    def add_result(self, offense_winner, defense_winner, offense_loser,
-        defense_loser):
-        """Method to add a result to database
+    @retry_on_disconnect
+    def get_lineups(self, players, top=5):
+        """Method to get the most balanced lineups for a pool of players
 
         Args:
-            offense_winner(tup):    offense_winner
-            defense_winner (tup):   defense_winner
-            offense_loser (tup):    offense_loser
-            defense_loser (tup):    defense_loser
+            players (list):     first name, last name and nickname of every
+                                available player
+            top (int):          lineups returned at most
+
+        Returns:
+            lineups (list):     (quality, offense one, defense one, offense
+                                two, defense two) tuples of player names,
+                                best first
 
         Raises:
             data_manager_exceptions.DBValueError
@@ -817,173 +3039,42 @@ to MySQL server")
 
         """
 
-        if len(offense_winner) != 3:
-            raise data_manager_exceptions.DBValueError("Offense winner must\
- be complete")
-
-        if len(defense_winner) != 3:
-            raise data_manager_exceptions.DBValueError("Defense winner must\
- be complete")
-
-        if len(offense_loser) != 3:
-            raise data_manager_exceptions.DBValueError("Offense loser must\
- be complete")
-
-        if len(defense_loser) != 3:
-            raise data_manager_exceptions.DBValueError("Defense loser must\
+        for player in players:
+            if len(player) != 3:
+                raise data_manager_exceptions.DBValueError("Player must\
  be complete")
 
         try:
-            LOGGER.info("Adding result to database")
+            LOGGER.info("Getting lineups")
             self.check_if_db_connected()
             cursor = self.db_conn.cursor()
-            cursor.execute("INSERT INTO result (offense_winner, \
-defense_winner, offense_loser, defense_loser) VALUES ((SELECT \
-player_id FROM player WHERE first_name = '{0}' AND last_name \
-= '{1}' AND nickname = '{2}'), (SELECT player_id FROM player WHERE first_name \
-= '{3}' AND last_name = '{4}' AND nickname = '{5}'), (SELECT player_id FROM \
-player WHERE first_name = '{6}' AND last_name = '{7}' AND nickname = '{8}'), \
-(SELECT player_id FROM player WHERE first_name = '{9}' AND last_name = '{10}' \
-AND nickname = '{11}'))".format(offense_winner[0],
-                offense_winner[1], offense_winner[2], defense_winner[0],
-                defense_winner[1], defense_winner[2], offense_loser[0],
-                offense_loser[1], offense_loser[2], defense_loser[0],
-                defense_loser[1], defense_loser[2]))
-
-            LOGGER.info("Updating individual ratings")
-            cursor.execute("SELECT player_id, offense_rating FROM player \
-WHERE first_name = '{0}' AND last_name = '{1}' AND nickname = '{2}'".format(
-                offense_winner[0], offense_winner[1], offense_winner[2]))
-            offense_winner_player_id, rating = cursor.fetchall()[0]
-
-            cursor.execute("SELECT mu, sigma FROM rating WHERE rating_id \
-= {0}".format(rating))
-            mu, sigma = cursor.fetchall()[0]
-            offense_winner_rating = trueskill.Rating(mu=float(mu),
-                sigma=float(sigma))
-
-            cursor.execute("SELECT player_id, defense_rating FROM player \
-WHERE first_name = '{0}' AND last_name = '{1}' AND nickname = '{2}'".format(
-                defense_winner[0], defense_winner[1], defense_winner[2]))
-            defense_winner_player_id, rating = cursor.fetchall()[0]
-
-            cursor.execute("SELECT mu, sigma FROM rating WHERE rating_id \
-= {0}".format(rating))
-            mu, sigma = cursor.fetchall()[0]
-            defense_winner_rating = trueskill.Rating(mu=float(mu),
-                sigma=float(sigma))
-
-            cursor.execute("SELECT player_id, offense_rating FROM player \
-WHERE first_name = '{0}' AND last_name = '{1}' AND nickname = '{2}'".format(
-                offense_loser[0], offense_loser[1], offense_loser[2]))
-            offense_loser_player_id, rating = cursor.fetchall()[0]
-
-            cursor.execute("SELECT mu, sigma FROM rating WHERE rating_id \
-= {0}".format(rating))
-            mu, sigma = cursor.fetchall()[0]
-            offense_loser_rating = trueskill.Rating(mu=float(mu),
-                sigma=float(sigma))
-
-            cursor.execute("SELECT player_id, defense_rating FROM player \
-WHERE first_name = '{0}' AND last_name = '{1}' AND nickname = '{2}'".format(
-                defense_loser[0], defense_loser[1], defense_loser[2]))
-            defense_loser_player_id, rating = cursor.fetchall()[0]
-
-            cursor.execute("SELECT mu, sigma FROM rating WHERE rating_id \
-= {0}".format(rating))
-            mu, sigma = cursor.fetchall()[0]
-            defense_loser_rating = trueskill.Rating(mu=float(mu),
-                sigma=float(sigma))
-
-            (new_offense_winner_rating, new_defense_winner_rating), \
-            (new_offense_loser_rating, new_defense_loser_rating) = \
-            trueskill.rate([(offense_winner_rating, defense_winner_rating),
-                (offense_loser_rating, defense_loser_rating)], ranks=[0, 1])
-
-            cursor.execute("INSERT INTO rating (mu, sigma) VALUES ({0}, {1}\
-)".format(new_offense_winner_rating.mu, new_offense_winner_rating.sigma))
-            new_rating_id = cursor.lastrowid
-            cursor.execute("UPDATE player set offense_rating = {0} where \
-player_id = {1}".format(new_rating_id, offense_winner_player_id))
-
-            cursor.execute("INSERT INTO rating (mu, sigma) VALUES ({0}, {1}\
-)".format(new_defense_winner_rating.mu, new_defense_winner_rating.sigma))
-            new_rating_id = cursor.lastrowid
-            cursor.execute("UPDATE player set defense_rating = {0} where \
-player_id = {1}".format(new_rating_id, defense_winner_player_id))
-
-            cursor.execute("INSERT INTO rating (mu, sigma) VALUES ({0}, {1}\
-)".format(new_offense_loser_rating.mu, new_offense_loser_rating.sigma))
-            new_rating_id = cursor.lastrowid
-            cursor.execute("UPDATE player set offense_rating = {0} where \
-player_id = {1}".format(new_rating_id, offense_loser_player_id))
-
-            cursor.execute("INSERT INTO rating (mu, sigma) VALUES ({0}, {1}\
-)".format(new_defense_loser_rating.mu, new_defense_loser_rating.sigma))
-            new_rating_id = cursor.lastrowid
-            cursor.execute("UPDATE player set defense_rating = {0} where \
-player_id = {1}".format(new_rating_id, defense_loser_player_id))
-
-            # team ratings
-            LOGGER.info("Updating team ratings")
-
-            # check if winners are on a team together
-            winning_team = self.check_if_players_on_team(
-                member_one=offense_winner,
-                member_two=defense_winner)
-
-            if not winning_team:
-                # create a new team
-                winning_team = self.add_team(team_name="{0} & {1}\
-".format(offense_winner[0], defense_winner[0]), member_one=offense_winner,
-                    member_two=defense_winner)
-
-            # check if losers are on a team together
-            losing_team = self.check_if_players_on_team(
-                member_one=offense_loser,
-                member_two=defense_loser)
-
-            if not losing_team:
-                # create a new team
-                losing_team = self.add_team(team_name="{0} & {1}\
-".format(offense_loser[0], defense_loser[0]), member_one=offense_loser,
-                    member_two=defense_loser)
-
-            # get ratings
-            cursor.execute("SELECT rating from team WHERE team_id \
-= {0}".format(winning_team))
-            winning_team_rating_id = cursor.fetchone()[0]
-            
-            cursor.execute("SELECT rating from team WHERE team_id \
-= {0}".format(losing_team))
-            losing_team_rating_id = cursor.fetchone()[0]
-
-            cursor.execute("SELECT mu, sigma FROM rating WHERE rating_id \
-= {0}".format(winning_team_rating_id))
-            mu, sigma = cursor.fetchall()[0]
-            winning_team_rating = trueskill.Rating(mu=float(mu),
-                sigma=float(sigma))
-
-            cursor.execute("SELECT mu, sigma FROM rating WHERE rating_id \
-= {0}".format(losing_team_rating_id))
-            mu, sigma = cursor.fetchall()[0]
-            losing_team_rating = trueskill.Rating(mu=float(mu),
-                sigma=float(sigma))
-
-            new_winning_team_rating, new_losing_team_rating = \
-            trueskill.rate_1vs1(winning_team_rating, losing_team_rating)
-
-            cursor.execute("INSERT INTO rating (mu, sigma) VALUES ({0}, {1}\
-)".format(new_winning_team_rating.mu, new_winning_team_rating.sigma))
-            new_rating_id = cursor.lastrowid
-            cursor.execute("UPDATE team SET rating = {0} where \
-team_id = {1}".format(new_rating_id, winning_team))
-
-            cursor.execute("INSERT INTO rating (mu, sigma) VALUES ({0}, {1}\
-)".format(new_losing_team_rating.mu, new_losing_team_rating.sigma))
-            new_rating_id = cursor.lastrowid
-            cursor.execute("UPDATE team SET rating = {0} where \
-team_id = {1}".format(new_rating_id, losing_team))
+            player_ids = [self.get_player_id(player) for player in players]
+
+            if None in player_ids:
+                raise data_manager_exceptions.DBExistError("Player doesn't \
+exist")
+
+            if len(set(player_ids)) != len(player_ids):
+                raise data_manager_exceptions.DBValueError("Player can't be \
+in the pool twice")
+
+            if len(player_ids) < 4:
+                raise data_manager_exceptions.DBValueError("Pool must have \
+at least four players")
+
+            self.execute(cursor, "SELECT player_id, offense_mu, \
+offense_sigma, defense_mu, defense_sigma FROM player WHERE player_id IN \
+({0})".format(", ".join(["%s"] * len(player_ids))), player_ids)
+            ratings = {}
+            for player_id, offense_mu, offense_sigma, defense_mu, \
+                defense_sigma in cursor.fetchall():
+                ratings[player_id] = (trueskill.Rating(mu=offense_mu,
+                    sigma=offense_sigma), trueskill.Rating(mu=defense_mu,
+                    sigma=defense_sigma))
+
+            lineups = matchmaking.best_lineups(
+                [ratings[player_id][0] for player_id in player_ids],
+                [ratings[player_id][1] for player_id in player_ids], top=top)
 
         except MySQLdb.OperationalError:
             LOGGER.error("MySQL operational error occured")
@@ -997,16 +3088,21 @@ to MySQL server")
             raise data_manager_exceptions.DBSyntaxError("MySQL syntax error")
 
         else:
-            pass
+            return [(round(quality, 4),) + tuple(tuple(players[index])
+                for index in seats) for quality, seats in lineups]
 
-    def get_total_results(self):
-        """Method to get result count from database
+    def rebuild_standings(self):
+        """Method to regenerate the standing tables from result history
+
+        Ranks come from the current ratings and win and loss counts from a
+        full pass over result. Results added while the rebuild runs may be
+        missed, so run it while no results are being submitted.
 
         Args:
             None
 
         Returns:
-            count (int):    total number of results
+            None
 
         Raises:
             data_manager_exceptions.DBConnectionError
@@ -1015,11 +3111,26 @@ to MySQL server")
         """
 
         try:
-            LOGGER.info("Getting total result count")
+            LOGGER.info("Rebuilding standings")
             self.check_if_db_connected()
             cursor = self.db_conn.cursor()
-            cursor.execute("SELECT COUNT(result_id) FROM result")
-            count = cursor.fetchone()[0]
+
+            self.execute(cursor, "DELETE FROM player_standing")
+            for position in ('offense', 'defense'):
+                self.execute(cursor, "INSERT INTO player_standing (player_id, \
+position, ranking, wins, losses) SELECT player.player_id, %s, \
+ROUND(player.{0}_mu - 3 * player.{0}_sigma, 4), \
+COALESCE(record.{0}_wins, 0), COALESCE(record.{0}_losses, 0) FROM player \
+LEFT JOIN ({1}) AS record ON record.player_id = player.player_id".format(
+                    position, PLAYER_RECORD_SELECT), (position.capitalize(),))
+
+            self.execute(cursor, "DELETE FROM team_standing")
+            self.execute(cursor, "INSERT INTO team_standing (team_id, \
+ranking, wins, losses) SELECT team.team_id, \
+ROUND(team.mu - 3 * team.sigma, 4), COALESCE(record.wins, 0), \
+COALESCE(record.losses, 0) FROM team \
+LEFT JOIN ({0}) AS record ON record.player_one = team.player_lo \
+AND record.player_two = team.player_hi".format(TEAM_RECORD_SELECT))
 
         except MySQLdb.OperationalError:
             LOGGER.error("MySQL operational error occured")
@@ -1033,13 +3144,23 @@ to MySQL server")
             raise data_manager_exceptions.DBSyntaxError("MySQL syntax error")
 
         else:
-            return count
+            pass
 
-    def get_all_results(self):
-        """Method to get all results from database
+    def archive_ratings(self, batch_size=500, archive=True):
+        """Method to remove one batch of unreferenced legacy rating rows
+
+        Ratings are kept inline on player and team, so rows in the legacy
+        rating table are only still needed while a player or team column
+        points at them. Unreferenced rows are copied to rating_archive,
+        unless archive is False, and deleted. Nothing reads those rows, so
+        the data version is not bumped.
 
         Args:
-            None
+            batch_size (int):   rows removed at most
+            archive (bool):     copy the rows to rating_archive first
+
+        Returns:
+            rating_ids (list):  removed rating_ids, empty once none are left
 
         Raises:
             data_manager_exceptions.DBConnectionError
@@ -1047,55 +3168,30 @@ to MySQL server")
 
         """
 
-        all_results = ()
-
         try:
-            LOGGER.info("Getting result list")
             self.check_if_db_connected()
             cursor = self.db_conn.cursor()
-            cursor.execute("SELECT offense_winner, defense_winner, \
-offense_loser, defense_loser, time FROM result ORDER BY time DESC")
-            results = cursor.fetchall()
-
-            for offense_winner_id, defense_winner_id, offense_loser_id, \
-                defense_loser_id, time in results:
-
-                intermediate_results = ()
-                cursor.execute("SELECT first_name, last_name, nickname FROM \
-player WHERE player_id = {0}".format(offense_winner_id))
-                offense_winner = cursor.fetchall()
-                first_name_offense_winner, last_name_offense_winner, \
-                    nickname_offense_winner = offense_winner[0]
-
-                cursor.execute("SELECT first_name, last_name, nickname FROM \
-player WHERE player_id = {0}".format(defense_winner_id))
-                defense_winner = cursor.fetchall()
-                first_name_defense_winner, last_name_defense_winner, \
-                    nickname_defense_winner = defense_winner[0]
-
-                cursor.execute("SELECT first_name, last_name, nickname FROM \
-player WHERE player_id = {0}".format(offense_loser_id))
-                offense_loser = cursor.fetchall()
-                first_name_offense_loser, last_name_offense_loser, \
-                    nickname_offense_loser = offense_loser[0]
-
-                cursor.execute("SELECT first_name, last_name, nickname FROM \
-player WHERE player_id = {0}".format(defense_loser_id))
-                defense_loser = cursor.fetchall()
-                first_name_defense_loser, last_name_defense_loser, \
-                    nickname_defense_loser = defense_loser[0]
-
-                intermediate_results = intermediate_results + \
-                    (first_name_offense_winner, last_name_offense_winner,
-                    nickname_offense_winner, first_name_defense_winner,
-                    last_name_defense_winner, nickname_defense_winner,
-                    first_name_offense_loser, last_name_offense_loser,
-                    nickname_offense_loser, first_name_defense_loser,
-                    last_name_defense_loser, nickname_defense_loser,
-                    time.strftime('%Y-%m-%d'))
-
-                all_results = all_results + (intermediate_results,)
-                del intermediate_results
+
+            self.execute(cursor, "SELECT rating.rating_id FROM rating \
+LEFT JOIN player AS offense ON offense.offense_rating = rating.rating_id \
+LEFT JOIN player AS defense ON defense.defense_rating = rating.rating_id \
+LEFT JOIN team ON team.rating = rating.rating_id \
+WHERE offense.player_id IS NULL AND defense.player_id IS NULL \
+AND team.team_id IS NULL ORDER BY rating.rating_id LIMIT %s",
+                (batch_size,))
+            rating_ids = [row[0] for row in cursor.fetchall()]
+
+            if rating_ids:
+                placeholders = ", ".join(["%s"] * len(rating_ids))
+
+                if archive:
+                    self.execute(cursor, "INSERT IGNORE INTO rating_archive \
+(rating_id, mu, sigma, time) SELECT rating_id, mu, sigma, time FROM rating \
+WHERE rating_id IN ({0})".format(placeholders), rating_ids,
+                        dirty=False)
+
+                self.execute(cursor, "DELETE FROM rating WHERE rating_id IN \
+({0})".format(placeholders), rating_ids, dirty=False)
 
         except MySQLdb.OperationalError:
             LOGGER.error("MySQL operational error occured")
@@ -1109,14 +3205,27 @@ to MySQL server")
             raise data_manager_exceptions.DBSyntaxError("MySQL syntax error")
 
         else:
-            return all_results
+            return rating_ids
 
-    def get_individual_results(self, player, position):
-        """Method to get individual's results from database
+    def prune_rating_history(self, after_id=0, batch_size=500,
+        keep_days=None):
+        """Method to remove one batch of rating history rows
+
+        Rows of players and teams that no longer exist are always removed.
+        With keep_days set, rows older than that many days are removed too,
+        except the newest row of every player position and team. Rows are
+        visited in history_id order, so pass the last returned history_id
+        as after_id to continue. The data version is not bumped, so cached
+        timelines may keep showing removed rows until the next data change.
 
         Args:
-            player (tup):   player names
-            position (str): player position
+            after_id (int):     only visit rows after this history_id
+            batch_size (int):   rows visited at most
+            keep_days (int):    days of history kept, None to keep all
+
+        Returns:
+            history_ids (list): removed history_ids
+            last_id (int):      last history_id visited, None once done
 
         Raises:
             data_manager_exceptions.DBConnectionError
@@ -1124,75 +3233,32 @@ to MySQL server")
 
         """
 
-        if len(player) != 3:
-            raise data_manager_exceptions.DBValueError("Player must\
- be complete")
-
-        individual_results = ()
-
         try:
-            LOGGER.info("Getting individual result list")
             self.check_if_db_connected()
             cursor = self.db_conn.cursor()
-            cursor.execute("SELECT player_id FROM player WHERE \
-first_name = '{0}' AND last_name = '{1}' AND nickname = \
-'{2}'".format(player[0], player[1], player[2]))
-            player_id = cursor.fetchone()[0]
-
-            if position == 'Offense':
-                cursor.execute("SELECT offense_winner, defense_winner, \
-offense_loser, defense_loser, time FROM result WHERE offense_winner = {0} \
-OR offense_loser = {0} ORDER BY time DESC".format(player_id))
-                results = cursor.fetchall()
-            elif position == 'Defense':
-                cursor.execute("SELECT offense_winner, defense_winner, \
-offense_loser, defense_loser, time FROM result WHERE defense_winner = {0} \
-OR defense_loser = {0} ORDER BY time DESC".format(player_id))
-                results = cursor.fetchall()
-            else:
-                raise data_manager_exceptions.DBValueError("Unrecognized\
-position")
 
-            for offense_winner_id, defense_winner_id, offense_loser_id, \
-                defense_loser_id, time in results:
-
-                intermediate_results = ()
-                cursor.execute("SELECT first_name, last_name, nickname FROM \
-player WHERE player_id = {0}".format(offense_winner_id))
-                offense_winner = cursor.fetchall()
-                first_name_offense_winner, last_name_offense_winner, \
-                    nickname_offense_winner = offense_winner[0]
-
-                cursor.execute("SELECT first_name, last_name, nickname FROM \
-player WHERE player_id = {0}".format(defense_winner_id))
-                defense_winner = cursor.fetchall()
-                first_name_defense_winner, last_name_defense_winner, \
-                    nickname_defense_winner = defense_winner[0]
-
-                cursor.execute("SELECT first_name, last_name, nickname FROM \
-player WHERE player_id = {0}".format(offense_loser_id))
-                offense_loser = cursor.fetchall()
-                first_name_offense_loser, last_name_offense_loser, \
-                    nickname_offense_loser = offense_loser[0]
-
-                cursor.execute("SELECT first_name, last_name, nickname FROM \
-player WHERE player_id = {0}".format(defense_loser_id))
-                defense_loser = cursor.fetchall()
-                first_name_defense_loser, last_name_defense_loser, \
-                    nickname_defense_loser = defense_loser[0]
-
-                intermediate_results = intermediate_results + \
-                    (first_name_offense_winner, last_name_offense_winner,
-                    nickname_offense_winner, first_name_defense_winner,
-                    last_name_defense_winner, nickname_defense_winner,
-                    first_name_offense_loser, last_name_offense_loser,
-                    nickname_offense_loser, first_name_defense_loser,
-                    last_name_defense_loser, nickname_defense_loser,
-                    time.strftime('%Y-%m-%d'))
-
-                individual_results = individual_results + \
-                    (intermediate_results,)
-                del intermediate_results
+            self.execute(cursor, "SELECT history.history_id, \
+player.player_id IS NULL AND team.team_id IS NULL, \
+history.time < NOW() - INTERVAL %s DAY AND EXISTS (SELECT 1 FROM \
+rating_history AS newer WHERE newer.entity_type = history.entity_type \
+AND newer.entity_id = history.entity_id \
+AND newer.position = history.position \
+AND newer.history_id > history.history_id) FROM rating_history AS history \
+LEFT JOIN player ON history.entity_type = 'player' \
+AND player.player_id = history.entity_id \
+LEFT JOIN team ON history.entity_type = 'team' \
+AND team.team_id = history.entity_id \
+WHERE history.history_id > %s ORDER BY history.history_id LIMIT %s",
+                (keep_days, after_id, batch_size))
+            rows = cursor.fetchall()
+
+            history_ids = [row[0] for row in rows if row[1] or
+                (keep_days is not None and row[2])]
+
+            if history_ids:
+                self.execute(cursor, "DELETE FROM rating_history WHERE \
+history_id IN ({0})".format(", ".join(["%s"] * len(history_ids))),
+                    history_ids, dirty=False)
 
         except MySQLdb.OperationalError:
             LOGGER.error("MySQL operational error occured")
@@ -1206,16 +3272,23 @@ to MySQL server")
             raise data_manager_exceptions.DBSyntaxError("MySQL syntax error")
 
         else:
-            return individual_results
+            return history_ids, rows[-1][0] if rows else None
 
-    def get_team_rankings(self):
-        """Method to get team rankings from database
+    def prune_checkpoints(self, keep=10, batch_size=500):
+        """Method to remove one batch of old rating checkpoints
+
+        Only the newest keep checkpoints are kept, replays starting before
+        the oldest of them rate from the default ratings instead. Older
+        checkpoints are dropped first, then the snapshot rows no checkpoint
+        refers to are deleted batch_size at a time. The data version is not
+        bumped, since no read uses the snapshots.
 
         Args:
-            None
+            keep (int):         newest checkpoints kept
+            batch_size (int):   snapshot rows removed at most
 
         Returns:
-            ranks (list):   team rank list
+            removed (int):      snapshot rows removed, 0 once none are left
 
         Raises:
             data_manager_exceptions.DBConnectionError
@@ -1223,62 +3296,114 @@ to MySQL server")
 
         """
 
-        ranks = []
-
         try:
-            LOGGER.info("Getting team rankings")
             self.check_if_db_connected()
             cursor = self.db_conn.cursor()
-            cursor.execute("SELECT team_id, team_name FROM team")
-            teams = cursor.fetchall()
 
-            for team_id, team_name in teams:
-                cursor.execute("SELECT rating FROM \
-team WHERE team_id = {0}".format(team_id))
-                team_rating = cursor.fetchall()[0]
+            # replays read and write checkpoints under the same lock
+            self.lock_ratings(cursor)
 
-                cursor.execute("SELECT mu, sigma FROM rating WHERE rating_id \
-= {0}".format(team_rating[0]))
-                offense_mu, offense_sigma = cursor.fetchall()[0]
+            self.execute(cursor, "SELECT result_id FROM rating_checkpoint \
+ORDER BY result_id DESC LIMIT %s, 1", (keep,))
+            row = cursor.fetchone()
 
-                team_rank = float(offense_mu) - (3 * float(offense_sigma))
+            if row is not None:
+                self.execute(cursor, "DELETE FROM rating_checkpoint WHERE \
+result_id <= %s", (row[0],), dirty=False)
 
-                # get player_ids
-                cursor.execute("SELECT player from player_team_xref \
-WHERE team = {0}".format(team_id))
-                players = cursor.fetchall()
-                player_one = players[0]
-                player_two = players[1]
+            removed = self.execute(cursor, "DELETE FROM rating_snapshot \
+WHERE result_id NOT IN (SELECT result_id FROM rating_checkpoint) LIMIT %s",
+                (batch_size,), dirty=False)
 
-                cursor.execute("SELECT first_name FROM player WHERE \
-player_id = {0}".format(player_one[0]))
-                player_one_name = cursor.fetchone()[0]
+        except MySQLdb.OperationalError as error:
+            LOGGER.error("MySQL operational error occured")
+            traceback.print_exc()
+            raise operational_error(error)
 
-                cursor.execute("SELECT first_name FROM player WHERE \
-player_id = {0}".format(player_two[0]))
-                player_two_name = cursor.fetchone()[0]
+        except MySQLdb.ProgrammingError:
+            LOGGER.error("MySQL programming error")
+            traceback.print_exc()
+            raise data_manager_exceptions.DBSyntaxError("MySQL syntax error")
 
-                cursor.execute("SELECT COUNT(result_id) FROM result WHERE \
-(offense_winner = {0} AND defense_winner = {1}) OR (offense_winner = {1} \
-AND defense_winner = {0})".format(player_one[0], player_two[0]))
-                team_win_count = cursor.fetchone()[0]
+        else:
+            return removed
 
-                cursor.execute("SELECT COUNT(result_id) FROM result WHERE \
-(offense_loser = {0} AND defense_loser = {1}) OR (offense_loser = {1} \
-AND defense_loser = {0})".format(player_one[0], player_two[0]))
-                team_loss_count = cursor.fetchone()[0]
+    def delete_team(self, team_name, delete_results=False):
+        """Method to delete a team and, when confirmed, the results it played
 
-                intermediate_rank = (team_name, round(team_rank, 4),
-                    team_win_count, team_loss_count, player_one_name,
-                    player_two_name)
-                ranks.append(intermediate_rank)
-                del intermediate_rank
+        A team whose players played together is only deleted with
+        delete_results set. Its results are then deleted with the team, and
+        the results after the first of them are re-rated.
 
-        except MySQLdb.OperationalError:
+        Args:
+            team_name (str):        team name
+            delete_results (bool):  also delete the team's results
+
+        Raises:
+            data_manager_exceptions.DBValueError
+            data_manager_exceptions.DBExistError
+            data_manager_exceptions.DBConnectionError
+            data_manager_exceptions.DBSyntaxError
+
+        """
+
+        try:
+            LOGGER.info("Deleting team from database")
+            self.check_if_db_connected()
+            cursor = self.db_conn.cursor()
+
+            self.execute(cursor, "SELECT team_id, player_lo, player_hi FROM \
+team WHERE team_name = %s", (team_name,))
+            row = cursor.fetchone()
+
+            if row is None:
+                raise data_manager_exceptions.DBExistError("Team doesn't \
+exist")
+
+            team_id, player_lo, player_hi = row
+            members = set((player_lo, player_hi))
+
+            self.lock_ratings(cursor)
+            self.execute(cursor, "SELECT result_id, offense_winner, \
+defense_winner, offense_loser, defense_loser FROM result \
+WHERE (offense_winner IN (%s, %s) AND defense_winner IN (%s, %s)) \
+OR (offense_loser IN (%s, %s) AND defense_loser IN (%s, %s)) FOR UPDATE",
+                (player_lo, player_hi) * 4)
+            results = [row for row in cursor.fetchall()
+                if set(row[1:3]) == members or set(row[3:5]) == members]
+
+            if results and not delete_results:
+                raise data_manager_exceptions.DBValueError("Team has \
+results, confirm to delete them too")
+
+            records = {}
+            for row in results:
+                add_records(records, self.get_result_records(row[1:], -1))
+            records.pop(('team', team_id, 'team'), None)
+
+            if results:
+                result_ids = [row[0] for row in results]
+                self.execute(cursor, "DELETE FROM result WHERE result_id IN \
+({0})".format(", ".join(["%s"] * len(result_ids))), result_ids)
+
+            self.execute(cursor, "DELETE FROM team_standing WHERE \
+team_id = %s", (team_id,))
+            self.execute(cursor, "DELETE FROM rating_snapshot WHERE \
+entity_type = %s AND entity_id = %s", ('team', team_id))
+            self.execute(cursor, "DELETE FROM player_team_xref WHERE \
+team = %s", (team_id,))
+            self.execute(cursor, "DELETE FROM team WHERE team_id = %s",
+                (team_id,))
+            self.record_identity_change(cursor,
+                teams={identity_index.team_key(player_lo, player_hi): None})
+
+            if results:
+                self.replay_ratings(cursor, min(result_ids), records)
+
+        except MySQLdb.OperationalError as error:
             LOGGER.error("MySQL operational error occured")
             traceback.print_exc()
-            raise data_manager_exceptions.DBConnectionError("Cannot connect \
-to MySQL server")
+            raise operational_error(error)
 
         except MySQLdb.ProgrammingError:
             LOGGER.error("MySQL programming error")
@@ -1286,75 +3411,42 @@ to MySQL server")
             raise data_manager_exceptions.DBSyntaxError("MySQL syntax error")
 
         else:
-            return ranks
+            pass
 
-    def get_individual_rankings(self):
-        """Method to get individual rankings from database
+    def export_rows(self, name):
+        """Method to stream every row of an exportable table
+
+        Rows are read through a server-side cursor, so neither the client
+        nor the server holds more than EXPORT_BATCH_SIZE of them at once.
+        The calling thread's connection can't run other statements until
+        the rows are consumed or the iterator is closed.
 
         Args:
-            None
+            name (str):     export name, a key of EXPORTS
 
         Returns:
-            ranks (list):   individual rank list
+            columns (tup):  column names
+            rows (iter):    row tuples, in sort key order
 
         Raises:
+            data_manager_exceptions.DBValueError
             data_manager_exceptions.DBConnectionError
             data_manager_exceptions.DBSyntaxError
 
         """
 
-        ranks = []
+        if name not in EXPORTS:
+            raise data_manager_exceptions.DBValueError("Unrecognized \
+export")
+
+        table, columns, key = EXPORTS[name]
 
         try:
-            LOGGER.info("Getting individual rankings")
+            LOGGER.info("Exporting %s", name)
             self.check_if_db_connected()
-            cursor = self.db_conn.cursor()
-            cursor.execute("SELECT player_id, first_name, last_name, \
-nickname FROM player")
-            players = cursor.fetchall()
-
-            for player_id, first_name, last_name, nickname in players:
-                cursor.execute("SELECT offense_rating, defense_rating FROM \
-player WHERE player_id = {0}".format(player_id))
-                offense_rating, defense_rating = cursor.fetchall()[0]
-
-                cursor.execute("SELECT mu, sigma FROM rating WHERE rating_id \
-= {0}".format(offense_rating))
-                offense_mu, offense_sigma = cursor.fetchall()[0]
-
-                cursor.execute("SELECT mu, sigma FROM rating WHERE rating_id \
-= {0}".format(defense_rating))
-                defense_mu, defense_sigma = cursor.fetchall()[0]
-
-                offense_rank = float(offense_mu) - (3 * float(offense_sigma))
-                defense_rank = float(defense_mu) - (3 * float(defense_sigma))
-
-                cursor.execute("SELECT COUNT(result_id) FROM result WHERE \
-offense_winner = {0}".format(player_id))
-                offense_win_count = cursor.fetchone()[0]
-
-                cursor.execute("SELECT COUNT(result_id) FROM result WHERE \
-defense_winner = {0}".format(player_id))
-                defense_win_count = cursor.fetchone()[0]
-
-                cursor.execute("SELECT COUNT(result_id) FROM result WHERE \
-offense_loser = {0}".format(player_id))
-                offense_lose_count = cursor.fetchone()[0]
-
-                cursor.execute("SELECT COUNT(result_id) FROM result WHERE \
-defense_loser = {0}".format(player_id))
-                defense_lose_count = cursor.fetchone()[0]
-
-                intermediate_rank = (first_name, last_name, nickname,
-                    'Offense', round(offense_rank, 4), offense_win_count,
-                    offense_lose_count)
-                ranks.append(intermediate_rank)
-                del intermediate_rank
-                intermediate_rank = (first_name, last_name, nickname,
-                    'Defense', round(defense_rank, 4), defense_win_count,
-                    defense_lose_count)
-                ranks.append(intermediate_rank)
-                del intermediate_rank
+            cursor = self.db_conn.cursor(MySQLdb.cursors.SSCursor)
+            self.execute(cursor, "SELECT {0} FROM {1} ORDER BY {2}".format(
+                ", ".join(columns), table, key))
 
         except MySQLdb.OperationalError:
             LOGGER.error("MySQL operational error occured")
@@ -1368,26 +3460,93 @@ to MySQL server")
             raise data_manager_exceptions.DBSyntaxError("MySQL syntax error")
 
         else:
-            return ranks
+            return columns, self.fetch_stream(cursor)
 
-    def delete_team(self, team_name):
-        """TODO"""
+    def fetch_stream(self, cursor):
+        """Method to iterate over a server-side cursor in batches
 
-    def delete_result(self, offense_winner, defense_winner, offense_loser, defense_loser, timestamp):
-        """TODO"""
+        The cursor is closed once exhausted, on error, or when the iterator
+        is closed early.
+
+        Args:
+            cursor (obj):   server-side cursor holding a result set
+
+        Returns:
+            rows (iter):    row tuples
+
+        Raises:
+            data_manager_exceptions.DBConnectionError
+
+        """
+
+        try:
+            while True:
+                rows = cursor.fetchmany(EXPORT_BATCH_SIZE)
+
+                if not rows:
+                    break
+
+                for row in rows:
+                    yield row
+
+        except MySQLdb.OperationalError:
+            LOGGER.error("MySQL operational error occured")
+            traceback.print_exc()
+            raise data_manager_exceptions.DBConnectionError("Cannot connect \
+to MySQL server")
+
+        finally:
+            try:
+                cursor.close()
+            except MySQLdb.Error:
+                LOGGER.error("Failed to close export cursor")
 
     def commit_data(self):
         """Method to save results to database
 
+        A transaction that changed anything bumps the stored data version
+        before committing, which invalidates cached reads in every process.
+        Identity changes made by the committed transaction are merged into
+        the shared identity index.
+
         Args:
             None
 
         Returns:
             None
 
+        Raises:
+            data_manager_exceptions.DBConnectionError
+            data_manager_exceptions.DBSyntaxError
+
         """
 
-        self.db_conn.commit()
+        try:
+            if getattr(self._local, 'dirty', False):
+                cursor = self.db_conn.cursor()
+                self.execute(cursor, "UPDATE data_version SET version = \
+version + 1 WHERE name = %s", ('data',))
+
+            self.db_conn.commit()
+
+        except MySQLdb.OperationalError as error:
+            LOGGER.error("MySQL operational error occured")
+            traceback.print_exc()
+            raise operational_error(error)
+
+        except MySQLdb.ProgrammingError:
+            LOGGER.error("MySQL programming error")
+            traceback.print_exc()
+            raise data_manager_exceptions.DBSyntaxError("MySQL syntax error")
+
+        self._local.dirty = False
+        self._local.data_versions = None
+
+        changes = getattr(self._local, 'identity_changes', None)
+        self._local.identity_changes = None
+
+        if changes is not None and not self.identity.apply(changes):
+            LOGGER.info("Identity index is stale, it will be reloaded")
 
 def main():
     """docstring"""
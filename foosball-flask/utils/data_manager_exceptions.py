@@ -23,6 +23,25 @@ class DBConnectionError(DataManagerError):
         super(DBConnectionError, self).__init__(msg)
         self.msg = msg
 
+class DBLockError(DBConnectionError):
+    """Exception raised when a transaction loses a lock conflict
+
+    The transaction was rolled back by a deadlock or a lock wait timeout
+    while the connection stayed usable. It derives from DBConnectionError,
+    so callers handling transient database errors handle it too.
+
+    Args:
+        msg (str):  Error message
+
+    Attributes:
+        msg (str):  Error message
+
+    """
+
+    def __init__(self, msg):
+        super(DBLockError, self).__init__(msg)
+        self.msg = msg
+
 class DBSyntaxError(DataManagerError):
     """Exception raised for database syntax errors
 
@@ -0,0 +1,67 @@
+"""Foosball Downsampling
+
+This module reduces a time series to fewer points for charting with the
+largest-triangle-three-buckets algorithm, which keeps the points that shape
+the line the most.
+
+"""
+
+def lttb(points, threshold):
+    """Downsample a series to threshold points
+
+    The first and last points are kept. The points in between are split
+    into threshold - 2 buckets, and from each bucket the point forming the
+    largest triangle with the previously kept point and the average of the
+    next bucket is kept.
+
+    Args:
+        points (list):      (x, y, ...) tuples ordered by x, extra values are
+                            carried along
+        threshold (int):    points wanted
+
+    Returns:
+        points (list):      the kept points, all of them if there are no more
+                            than threshold, only the first and last if
+                            threshold is below 3
+
+    """
+
+    if threshold >= len(points):
+        return list(points)
+
+    if threshold < 3:
+        return [points[0], points[-1]][:max(threshold, 0)]
+
+    sampled = [points[0]]
+    every = float(len(points) - 2) / (threshold - 2)
+    kept = 0
+
+    for bucket in range(threshold - 2):
+        start = int(bucket * every) + 1
+        end = int((bucket + 1) * every) + 1
+
+        next_start = end
+        next_end = min(int((bucket + 2) * every) + 1, len(points))
+        next_points = points[next_start:next_end] or [points[-1]]
+        average_x = sum(point[0] for point in next_points) / \
+            float(len(next_points))
+        average_y = sum(point[1] for point in next_points) / \
+            float(len(next_points))
+
+        kept_x, kept_y = points[kept][:2]
+        best_area = -1
+        best = start
+        for index in range(start, end):
+            x, y = points[index][:2]
+            area = abs((kept_x - average_x) * (y - kept_y) -
+                (kept_x - x) * (average_y - kept_y))
+            if area > best_area:
+                best_area = area
+                best = index
+
+        sampled.append(points[best])
+        kept = best
+
+    sampled.append(points[-1])
+
+    return sampled
@@ -0,0 +1,102 @@
+"""Foosball Export
+
+These functions turn streamed table rows into CSV or newline-delimited JSON
+lines one row at a time, so an export never holds more than one row in
+memory. They are shared by the export endpoint and the maintenance command.
+
+"""
+
+import csv
+import datetime
+import decimal
+import json
+import StringIO
+
+# export formats, with their MIME type and file extension
+FORMATS = {
+    'csv': ('text/csv', 'csv'),
+    'ndjson': ('application/x-ndjson', 'ndjson')}
+
+def convert(value):
+    """Convert a column value into a JSON and CSV friendly value
+
+    Args:
+        value (obj):    column value
+
+    Returns:
+        value (obj):    times as ISO 8601 text, decimals as floats, other
+                        values unchanged
+
+    """
+
+    if isinstance(value, datetime.datetime):
+        return value.isoformat()
+
+    if isinstance(value, decimal.Decimal):
+        return float(value)
+
+    return value
+
+def write_csv(columns, rows):
+    """Format rows as CSV lines, after a header line
+
+    Args:
+        columns (tup):  column names
+        rows (iter):    row tuples
+
+    Returns:
+        lines (iter):   CSV lines
+
+    """
+
+    buf = StringIO.StringIO()
+    writer = csv.writer(buf, lineterminator='\n')
+    writer.writerow(columns)
+
+    yield buf.getvalue()
+
+    for row in rows:
+        buf.seek(0)
+        buf.truncate()
+        writer.writerow([convert(value) for value in row])
+        yield buf.getvalue()
+
+def write_ndjson(columns, rows):
+    """Format rows as JSON objects, one per line
+
+    Args:
+        columns (tup):  column names
+        rows (iter):    row tuples
+
+    Returns:
+        lines (iter):   JSON lines
+
+    """
+
+    for row in rows:
+        yield json.dumps(dict(zip(columns, [convert(value)
+            for value in row])), sort_keys=True) + '\n'
+
+def write(columns, rows, format_name):
+    """Format rows in an export format
+
+    Args:
+        columns (tup):      column names
+        rows (iter):        row tuples
+        format_name (str):  a key of FORMATS
+
+    Returns:
+        lines (iter):       formatted lines
+
+    Raises:
+        ValueError
+
+    """
+
+    if format_name == 'csv':
+        return write_csv(columns, rows)
+
+    if format_name == 'ndjson':
+        return write_ndjson(columns, rows)
+
+    raise ValueError("Unrecognized export format {0}".format(format_name))
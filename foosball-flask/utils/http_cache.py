@@ -0,0 +1,99 @@
+"""Foosball HTTP Cache
+
+This module answers read pages with 304 Not Modified when the client's copy
+is still current, using validators derived from the league's data version.
+
+"""
+
+import datetime
+import functools
+import hashlib
+
+import flask
+
+def last_modified(modified, now=None):
+    """Function to get the Last-Modified time safe to send for a bump time
+
+    The header has one second resolution, so a time in the current second
+    is not sent: another bump later in the same second would carry the same
+    value and leave clients that revalidate with it stale.
+
+    Args:
+        modified (obj): UTC datetime of the last data version bump
+        now (obj):      current UTC datetime, utcnow() if None
+
+    Returns:
+        modified (obj): modified, or None if its second is not over yet
+
+    """
+
+    if now is None:
+        now = datetime.datetime.utcnow()
+
+    if modified >= now.replace(microsecond=0):
+        return None
+
+    return modified
+
+def conditional_get(get_data, revision):
+    """Function to build a decorator answering unchanged GET requests
+
+    The strong ETag is derived from the page revision, the league's data
+    version, bumped by every commit, and the requested path. Requests whose
+    If-None-Match still matches skip the view entirely. If-Modified-Since is
+    only used without If-None-Match, and matches when the data was last
+    bumped no later than the time given. The version is read again after
+    rendering, and a page rendered while it moved is sent without
+    validators rather than labelled with the older version. Other methods
+    are passed through.
+
+    Args:
+        get_data (func):    returns the DataManager holding the versions
+        revision (str):     page revision, changed with every deploy
+
+    Returns:
+        decorator (func):   decorator for read views
+
+    """
+
+    def decorator(view):
+        """Wrap a read view"""
+
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            """Serve 304 if the client's copy is current, or render the view"""
+
+            if flask.request.method != 'GET':
+                return view(*args, **kwargs)
+
+            data_mgr = get_data()
+            version = data_mgr.get_data_version('data')
+            etag = hashlib.sha1("{0}:{1}:{2}".format(revision, version,
+                flask.request.full_path)).hexdigest()
+            modified = last_modified(data_mgr.get_data_modified('data'))
+
+            if flask.request.if_none_match:
+                not_modified = flask.request.if_none_match.contains(etag)
+            else:
+                since = flask.request.if_modified_since
+                not_modified = since is not None and modified is not None \
+                    and modified <= since.replace(tzinfo=None)
+
+            if not_modified:
+                response = flask.Response(status=304)
+            else:
+                response = flask.make_response(view(*args, **kwargs))
+
+                if data_mgr.get_data_stamp('data', refresh=True)[0] != \
+                    version:
+                    return response
+
+            response.set_etag(etag)
+            if modified is not None:
+                response.last_modified = modified
+
+            return response
+
+        return wrapper
+
+    return decorator
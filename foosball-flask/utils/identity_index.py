@@ -0,0 +1,208 @@
+"""Foosball Identity Index
+
+This class maps player names to player ids and player pairs to team ids in
+memory, so resolving them does not need a database round trip.
+
+"""
+
+import threading
+
+def team_key(player_one_id, player_two_id):
+    """Build the unordered key of a two player team
+
+    Args:
+        player_one_id (int):    first member player_id
+        player_two_id (int):    second member player_id
+
+    Returns:
+        key (tup):              member ids, lower player_id first
+
+    """
+
+    return (min(player_one_id, player_two_id),
+        max(player_one_id, player_two_id))
+
+class IdentityChanges(object):
+    """IdentityChanges class holding one transaction's uncommitted changes
+
+    A value of None records a removed name or team.
+
+    Args:
+        base_version (int): identity version the transaction started from
+
+    Attributes:
+        base_version (int): identity version the transaction started from
+        version (int):      identity version written by the transaction
+        players (dict):     name triple to player_id
+        teams (dict):       team key to team_id
+
+    """
+
+    def __init__(self, base_version):
+        self.base_version = base_version
+        self.version = base_version
+        self.players = {}
+        self.teams = {}
+
+class IdentityIndex(object):
+    """IdentityIndex class shared by all threads of a DataManager
+
+    The index is tagged with the identity version it was loaded at. Every
+    write to player names or team membership bumps that version in the
+    database, so a process that sees a different version knows another
+    process changed the data and reloads.
+
+    Attributes:
+        version (int):  identity version the index reflects, None until loaded
+        hits (int):     lookups answered from the index
+        misses (int):   lookups for unknown names or teams
+        reloads (int):  full loads from the database
+
+    """
+
+    def __init__(self):
+        self.version = None
+        self.hits = 0
+        self.misses = 0
+        self.reloads = 0
+        self._players = {}
+        self._teams = {}
+        self._lock = threading.Lock()
+
+    def load(self, version, players, teams):
+        """Method to replace the index contents
+
+        Args:
+            version (int):  identity version the rows were read at
+            players (tup):  (player_id, first_name, last_name, nickname) rows
+            teams (tup):    (team_id, player_one_id, player_two_id) rows
+
+        Returns:
+            None
+
+        """
+
+        player_ids = dict((tuple(row[1:]), row[0]) for row in players)
+        team_ids = dict((team_key(row[1], row[2]), row[0]) for row in teams)
+
+        with self._lock:
+            self._players = player_ids
+            self._teams = team_ids
+            self.version = version
+            self.reloads += 1
+
+    def get_player_id(self, player, changes=None):
+        """Method to resolve player names to a player_id
+
+        Args:
+            player (tup):   first name, last name and nickname
+            changes (obj):  calling transaction's uncommitted changes
+
+        Returns:
+            player_id (int):    player_id, or None if there is no such player
+
+        """
+
+        player = tuple(player)
+
+        if changes is not None and player in changes.players:
+            return changes.players[player]
+
+        with self._lock:
+            player_id = self._players.get(player)
+            self._count(player_id)
+
+        return player_id
+
+    def get_team_id(self, player_one_id, player_two_id, changes=None):
+        """Method to resolve a pair of players to their team_id
+
+        Args:
+            player_one_id (int):    first member player_id
+            player_two_id (int):    second member player_id
+            changes (obj):          calling transaction's uncommitted changes
+
+        Returns:
+            team_id (int):          team_id, or None if they have no team
+
+        """
+
+        key = team_key(player_one_id, player_two_id)
+
+        if changes is not None and key in changes.teams:
+            return changes.teams[key]
+
+        with self._lock:
+            team_id = self._teams.get(key)
+            self._count(team_id)
+
+        return team_id
+
+    def apply(self, changes):
+        """Method to merge a committed transaction's changes into the index
+
+        The changes are only merged if the index was at the version the
+        transaction started from. Otherwise another process wrote in between
+        and the index is left for the next version check to reload.
+
+        Args:
+            changes (obj):  committed transaction's changes
+
+        Returns:
+            (bool):         True if the changes were merged
+
+        """
+
+        with self._lock:
+            if self.version is None or self.version != changes.base_version:
+                return False
+
+            for index, updates in ((self._players, changes.players),
+                (self._teams, changes.teams)):
+                for key, value in updates.items():
+                    if value is None:
+                        index.pop(key, None)
+                    else:
+                        index[key] = value
+
+            self.version = changes.version
+
+        return True
+
+    def get_stats(self):
+        """Method to get index size and hit statistics
+
+        Args:
+            None
+
+        Returns:
+            stats (dict):   index size, version and lookup counts
+
+        """
+
+        with self._lock:
+            return {
+                'version': self.version,
+                'players': len(self._players),
+                'teams': len(self._teams),
+                'hits': self.hits,
+                'misses': self.misses,
+                'reloads': self.reloads}
+
+    def _count(self, value):
+        """Count a lookup as a hit or a miss
+
+        Must be called with the index lock held.
+
+        Args:
+            value (int):    lookup result
+
+        Returns:
+            None
+
+        """
+
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
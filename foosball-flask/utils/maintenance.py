@@ -0,0 +1,150 @@
+"""Foosball Maintenance
+
+This script runs maintenance tasks against a foosball database.
+
+Example:
+    python maintenance.py --db_name foosball rebuild-standings
+    python maintenance.py --db_name foosball rebuild-ratings
+    python maintenance.py --db_name foosball trim-ratings --keep_days 365
+    python maintenance.py --db_name foosball export results results.csv
+
+"""
+
+import argparse
+import sys
+
+import data_manager
+import export
+import retention
+
+def rebuild_standings(data_mgr, args):
+    """Regenerate the standing tables from result history
+
+    Args:
+        data_mgr (obj): DataManager connected to the database
+        args (obj):     parsed command line arguments
+
+    Returns:
+        None
+
+    """
+
+    data_mgr.rebuild_standings()
+    data_mgr.commit_data()
+
+    print "Rebuilt standings for {0} players and {1} teams".format(
+        data_mgr.get_total_players(), data_mgr.get_total_teams())
+
+def rebuild_ratings(data_mgr, args):
+    """Re-rate every result and save fresh rating checkpoints
+
+    Args:
+        data_mgr (obj): DataManager connected to the database
+        args (obj):     parsed command line arguments
+
+    Returns:
+        None
+
+    """
+
+    replayed = data_mgr.rebuild_ratings()
+    data_mgr.commit_data()
+
+    print "Re-rated {0} results".format(replayed)
+
+def trim_ratings(data_mgr, args):
+    """Remove unreferenced legacy ratings, expired history and old checkpoints
+
+    Args:
+        data_mgr (obj): DataManager connected to the database
+        args (obj):     parsed command line arguments
+
+    Returns:
+        None
+
+    """
+
+    ratings, history, snapshots = retention.run(data_mgr,
+        retention.RetentionPolicy(keep_days=args.keep_days,
+        archive=not args.no_archive, batch_size=args.batch_size,
+        pause=args.pause, keep_checkpoints=args.keep_checkpoints))
+
+    print "Removed {0} legacy ratings, {1} rating history rows and {2} \
+rating snapshot rows".format(ratings, history, snapshots)
+
+def export_table(data_mgr, args):
+    """Stream every row of a table to a file
+
+    Args:
+        data_mgr (obj): DataManager connected to the database
+        args (obj):     parsed command line arguments
+
+    Returns:
+        None
+
+    """
+
+    columns, rows = data_mgr.export_rows(args.name)
+
+    with open(args.output, 'wb') as output:
+        for line in export.write(columns, rows, args.format):
+            output.write(line)
+
+    print "Exported {0} to {1}".format(args.name, args.output)
+
+def main():
+    """Main entry point
+
+    Args:
+        None
+
+    Returns:
+        None
+
+    """
+
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--db_user', default='foosball')
+    parser.add_argument('--db_pass', default='foosball')
+    parser.add_argument('--db_host', default='127.0.0.1')
+    parser.add_argument('--db_name', default='foosball')
+    subparsers = parser.add_subparsers(dest='task')
+    rebuild_parser = subparsers.add_parser('rebuild-standings',
+        help='regenerate leaderboard tables from result history')
+    rebuild_parser.set_defaults(run=rebuild_standings)
+    ratings_parser = subparsers.add_parser('rebuild-ratings',
+        help='re-rate every result and save rating checkpoints')
+    ratings_parser.set_defaults(run=rebuild_ratings)
+    trim_parser = subparsers.add_parser('trim-ratings',
+        help='remove unreferenced legacy ratings, expired rating history and \
+old rating checkpoints')
+    trim_parser.add_argument('--keep_days', type=int, default=None,
+        help='days of rating history kept, all of it if not given')
+    trim_parser.add_argument('--no_archive', action='store_true',
+        help='delete legacy ratings instead of archiving them')
+    trim_parser.add_argument('--keep_checkpoints', type=int, default=10,
+        help='newest rating checkpoints kept')
+    trim_parser.add_argument('--batch_size', type=int, default=500)
+    trim_parser.add_argument('--pause', type=float, default=0.5,
+        help='seconds slept between batches')
+    trim_parser.set_defaults(run=trim_ratings)
+    export_parser = subparsers.add_parser('export',
+        help='stream a table as CSV or newline-delimited JSON')
+    export_parser.add_argument('name',
+        choices=sorted(data_manager.EXPORTS))
+    export_parser.add_argument('--format', default='csv',
+        choices=sorted(export.FORMATS))
+    export_parser.add_argument('output', help='file written')
+    export_parser.set_defaults(run=export_table)
+    args = parser.parse_args()
+
+    data_mgr = data_manager.DataManager(db_user=args.db_user,
+        db_pass=args.db_pass, db_host=args.db_host, db_name=args.db_name)
+
+    try:
+        args.run(data_mgr, args)
+    finally:
+        data_mgr.release_connection()
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,129 @@
+"""Foosball Matchmaking
+
+These functions pick the most balanced two versus two lineups out of a pool
+of available players. A lineup seats four players as offense and defense of
+two teams and is scored by TrueSkill match quality, the chance of a draw
+relative to the chance of a draw between equal teams. For two teams it has a
+closed form:
+
+    c^2     = sum(sigma^2) + players * beta^2
+    quality = sqrt(players * beta^2 / c^2) * exp(-(mu_one - mu_two)^2 / 2c^2)
+
+Every ordered pair of players makes a team, the first on offense and the
+second on defense. Small pools score every pair of teams without a player
+in common. Large pools sort the teams by mean and only score each team
+against its closest neighbours, since quality falls quickly as the means
+move apart.
+
+"""
+
+import math
+
+import trueskill
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# pools up to this size are searched exhaustively
+EXHAUSTIVE_POOL = 24
+
+# neighbours each team is scored against in larger pools
+NEIGHBOURS = 64
+
+def quality(team_one, team_two, env=None):
+    """Match quality of one game between two teams
+
+    Args:
+        team_one (tup): trueskill ratings of the first team
+        team_two (tup): trueskill ratings of the second team
+        env (obj):      trueskill environment, the global one if None
+
+    Returns:
+        quality (float): match quality, between 0 and 1
+
+    """
+
+    if env is None:
+        env = trueskill.global_env()
+
+    ratings = tuple(team_one) + tuple(team_two)
+    spread = len(ratings) * env.beta ** 2
+    c_squared = sum(rating.sigma ** 2 for rating in ratings) + spread
+    delta = sum(rating.mu for rating in team_one) - \
+        sum(rating.mu for rating in team_two)
+
+    return math.sqrt(spread / c_squared) * \
+        math.exp(-delta ** 2 / (2 * c_squared))
+
+def best_lineups(offense, defense, top=5, env=None):
+    """Find the most balanced lineups in a pool of players
+
+    Args:
+        offense (list):     trueskill offense rating of every player
+        defense (list):     trueskill defense rating of every player, in the
+                            same order
+        top (int):          lineups returned at most
+        env (obj):          trueskill environment, the global one if None
+
+    Returns:
+        lineups (list):     (quality, (offense one, defense one, offense two,
+                            defense two)) tuples of player indexes, best
+                            first
+
+    Raises:
+        ImportError
+
+    """
+
+    if numpy is None:
+        raise ImportError("Install numpy to find lineups")
+
+    if env is None:
+        env = trueskill.global_env()
+
+    size = len(offense)
+    if size < 4 or top < 1:
+        return []
+
+    offense_mu = numpy.array([rating.mu for rating in offense])
+    offense_var = numpy.array([rating.sigma for rating in offense]) ** 2
+    defense_mu = numpy.array([rating.mu for rating in defense])
+    defense_var = numpy.array([rating.sigma for rating in defense]) ** 2
+
+    # every ordered pair of distinct players is a team
+    first, second = numpy.nonzero(~numpy.eye(size, dtype=bool))
+    team_mu = offense_mu[first] + defense_mu[second]
+    team_var = offense_var[first] + defense_var[second]
+
+    if size <= EXHAUSTIVE_POOL:
+        one, two = numpy.triu_indices(len(first), 1)
+    else:
+        order = numpy.argsort(team_mu, kind='mergesort')
+        width = min(NEIGHBOURS, len(order) - 1)
+        one = numpy.concatenate([order[:-offset]
+            for offset in range(1, width + 1)])
+        two = numpy.concatenate([order[offset:]
+            for offset in range(1, width + 1)])
+
+    # teams sharing a player can't play each other
+    apart = (first[one] != first[two]) & (first[one] != second[two]) & \
+        (second[one] != first[two]) & (second[one] != second[two])
+    one = one[apart]
+    two = two[apart]
+
+    spread = 4 * env.beta ** 2
+    c_squared = team_var[one] + team_var[two] + spread
+    scores = numpy.sqrt(spread / c_squared) * numpy.exp(
+        -(team_mu[one] - team_mu[two]) ** 2 / (2 * c_squared))
+
+    if len(scores) > top:
+        best = numpy.argpartition(-scores, top - 1)[:top]
+    else:
+        best = numpy.arange(len(scores))
+    best = best[numpy.argsort(-scores[best], kind='mergesort')]
+
+    return [(float(scores[index]), (int(first[one[index]]),
+        int(second[one[index]]), int(first[two[index]]),
+        int(second[two[index]]))) for index in best]
@@ -0,0 +1,299 @@
+"""Foosball Rating Kernel
+
+These functions rate two team games without draws using the closed-form
+TrueSkill update. Between two teams the factor graph solved by trueskill.rate
+has a single truncation and converges in one pass, so its result can be
+computed directly:
+
+    c^2     = sum(sigma^2 + tau^2) + players * beta^2
+    t       = (mu_winners - mu_losers) / c
+    v, w    = v_win(t, draw_margin / c), w_win(t, draw_margin / c)
+    mu'     = mu +/- (sigma^2 + tau^2) / c * v
+    sigma'  = sqrt((sigma^2 + tau^2) * (1 - (sigma^2 + tau^2) / c^2 * w))
+
+Environment parameters and the normal distribution functions are taken from
+trueskill's global environment, so results agree with trueskill.rate and
+trueskill.rate_1vs1. The batch functions rate many independent games at once
+with NumPy, using the same erfc approximation as trueskill's default backend.
+
+"""
+
+import math
+
+import trueskill
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+def rate(winners, losers, env=None):
+    """Rate one game won by one team over another
+
+    Args:
+        winners (tup):  trueskill ratings of the winning team
+        losers (tup):   trueskill ratings of the losing team
+        env (obj):      trueskill environment, the global one if None
+
+    Returns:
+        winners (tup):  new ratings of the winning team
+        losers (tup):   new ratings of the losing team
+
+    """
+
+    if env is None:
+        env = trueskill.global_env()
+
+    tau_squared = env.tau ** 2
+    variances = [rating.sigma ** 2 + tau_squared for rating in
+        winners + losers]
+    c_squared = sum(variances) + len(variances) * env.beta ** 2
+    c = math.sqrt(c_squared)
+
+    t = (sum(rating.mu for rating in winners) -
+        sum(rating.mu for rating in losers)) / c
+    draw_margin = trueskill.calc_draw_margin(env.draw_probability,
+        len(variances), env) / c
+
+    v = env.v_win(t, draw_margin)
+    w = env.w_win(t, draw_margin)
+
+    ratings = []
+    for index, (rating, variance) in enumerate(zip(winners + losers,
+        variances)):
+        sign = 1 if index < len(winners) else -1
+        ratings.append(env.create_rating(
+            mu=rating.mu + sign * variance / c * v,
+            sigma=math.sqrt(variance * (1 - variance / c_squared * w))))
+
+    return tuple(ratings[:len(winners)]), tuple(ratings[len(winners):])
+
+def rate_2vs2(winners, losers, env=None):
+    """Rate one two versus two game
+
+    Args:
+        winners (tup):  offense and defense ratings of the winners
+        losers (tup):   offense and defense ratings of the losers
+        env (obj):      trueskill environment, the global one if None
+
+    Returns:
+        winners (tup):  new offense and defense ratings of the winners
+        losers (tup):   new offense and defense ratings of the losers
+
+    """
+
+    return rate(tuple(winners), tuple(losers), env=env)
+
+def rate_1vs1(winner, loser, env=None):
+    """Rate one one versus one game
+
+    Args:
+        winner (obj):   rating of the winner
+        loser (obj):    rating of the loser
+        env (obj):      trueskill environment, the global one if None
+
+    Returns:
+        winner (obj):   new rating of the winner
+        loser (obj):    new rating of the loser
+
+    """
+
+    (winner,), (loser,) = rate((winner,), (loser,), env=env)
+
+    return winner, loser
+
+def win_probability(team_one, team_two, env=None):
+    """Chance that one team beats another
+
+    Args:
+        team_one (tup):         trueskill ratings of the first team
+        team_two (tup):         trueskill ratings of the second team
+        env (obj):              trueskill environment, the global one if None
+
+    Returns:
+        probability (float):    chance that the first team wins
+
+    """
+
+    if env is None:
+        env = trueskill.global_env()
+
+    ratings = tuple(team_one) + tuple(team_two)
+    delta = sum(rating.mu for rating in team_one) - \
+        sum(rating.mu for rating in team_two)
+    c = math.sqrt(sum(rating.sigma ** 2 for rating in ratings) +
+        len(ratings) * env.beta ** 2)
+
+    return env.cdf(delta / c)
+
+def rate_batch(mu, sigma, team_size, env=None):
+    """Rate many independent games at once
+
+    Every row is one game, holding the winning team's players followed by
+    the losing team's. Rows are rated independently of each other, so a
+    player may only appear once across the batch.
+
+    Args:
+        mu (obj):           games x players array of means
+        sigma (obj):        games x players array of deviations
+        team_size (int):    players per team
+        env (obj):          trueskill environment, the global one if None
+
+    Returns:
+        mu (obj):           new means
+        sigma (obj):        new deviations
+
+    Raises:
+        ImportError
+
+    """
+
+    if numpy is None:
+        raise ImportError("Install numpy to rate games in batches")
+
+    if env is None:
+        env = trueskill.global_env()
+
+    mu = numpy.asarray(mu, dtype=float)
+
+    return rate_arrays(mu, sigma, team_size, env.beta, env.tau,
+        trueskill.calc_draw_margin(env.draw_probability, mu.shape[1], env))
+
+def rate_arrays(mu, sigma, team_size, beta, tau, draw_margin):
+    """Rate many independent games with explicit environment parameters
+
+    The parameters are either scalars shared by all games or arrays with one
+    value per game, so games rated under different environments can be
+    rated together.
+
+    Args:
+        mu (obj):           games x players array of means
+        sigma (obj):        games x players array of deviations
+        team_size (int):    players per team
+        beta (obj):         performance deviation
+        tau (obj):          dynamics factor
+        draw_margin (obj):  draw margin, as from trueskill.calc_draw_margin
+
+    Returns:
+        mu (obj):           new means
+        sigma (obj):        new deviations
+
+    Raises:
+        ImportError
+
+    """
+
+    if numpy is None:
+        raise ImportError("Install numpy to rate games in batches")
+
+    mu = numpy.asarray(mu, dtype=float)
+    sigma = numpy.asarray(sigma, dtype=float)
+    players = mu.shape[1]
+
+    variances = sigma ** 2 + (numpy.asarray(tau, dtype=float) ** 2)[..., None]
+    c_squared = variances.sum(axis=1) + players * numpy.asarray(beta,
+        dtype=float) ** 2
+    c = numpy.sqrt(c_squared)
+
+    t = (mu[:, :team_size].sum(axis=1) - mu[:, team_size:].sum(axis=1)) / c
+    x = t - draw_margin / c
+
+    # v_win and w_win, with trueskill's fallback for a vanishing cdf
+    denom = 0.5 * erfc(-x / math.sqrt(2))
+    with numpy.errstate(divide='ignore', invalid='ignore'):
+        v = numpy.where(denom > 0, numpy.exp(-x ** 2 / 2) /
+            math.sqrt(2 * math.pi) / denom, -x)
+    w = v * (v + x)
+
+    sign = numpy.ones(players)
+    sign[team_size:] = -1
+
+    new_mu = mu + sign * variances / c[:, None] * v[:, None]
+    new_sigma = numpy.sqrt(variances * (1 - variances / c_squared[:, None] *
+        w[:, None]))
+
+    return new_mu, new_sigma
+
+def win_probability_arrays(mu, sigma, team_size, beta):
+    """Chance that the first team of each game beats the second
+
+    Args:
+        mu (obj):           games x players array of means
+        sigma (obj):        games x players array of deviations
+        team_size (int):    players per team
+        beta (obj):         performance deviation, scalar or one per game
+
+    Returns:
+        probability (obj):  array of win probabilities
+
+    Raises:
+        ImportError
+
+    """
+
+    if numpy is None:
+        raise ImportError("Install numpy to rate games in batches")
+
+    mu = numpy.asarray(mu, dtype=float)
+    sigma = numpy.asarray(sigma, dtype=float)
+
+    delta = mu[:, :team_size].sum(axis=1) - mu[:, team_size:].sum(axis=1)
+    c = numpy.sqrt((sigma ** 2).sum(axis=1) + mu.shape[1] *
+        numpy.asarray(beta, dtype=float) ** 2)
+
+    return 0.5 * erfc(-delta / c / math.sqrt(2))
+
+def rate_2vs2_batch(mu, sigma, env=None):
+    """Rate many independent two versus two games at once
+
+    Args:
+        mu (obj):       games x 4 array of offense winner, defense winner,
+                        offense loser and defense loser means
+        sigma (obj):    games x 4 array of the matching deviations
+        env (obj):      trueskill environment, the global one if None
+
+    Returns:
+        mu (obj):       new means
+        sigma (obj):    new deviations
+
+    """
+
+    return rate_batch(mu, sigma, 2, env=env)
+
+def rate_1vs1_batch(mu, sigma, env=None):
+    """Rate many independent one versus one games at once
+
+    Args:
+        mu (obj):       games x 2 array of winner and loser means
+        sigma (obj):    games x 2 array of the matching deviations
+        env (obj):      trueskill environment, the global one if None
+
+    Returns:
+        mu (obj):       new means
+        sigma (obj):    new deviations
+
+    """
+
+    return rate_batch(mu, sigma, 1, env=env)
+
+def erfc(x):
+    """Complementary error function of an array
+
+    Same approximation as trueskill's default backend.
+
+    Args:
+        x (obj):    array
+
+    Returns:
+        erfc (obj): array of erfc(x)
+
+    """
+
+    z = numpy.abs(x)
+    t = 1. / (1. + z / 2.)
+    r = t * numpy.exp(-z * z - 1.26551223 + t * (1.00002368 + t * (
+        0.37409196 + t * (0.09678418 + t * (-0.18628806 + t * (
+        0.27886807 + t * (-1.13520398 + t * (1.48851587 + t * (
+        -0.82215223 + t * 0.17087277)))))))))
+
+    return numpy.where(x < 0, 2. - r, r)
@@ -0,0 +1,148 @@
+"""Foosball Read Cache
+
+This class keeps results of recent database reads in memory, tagged with the
+data version they were read at.
+
+"""
+
+import collections
+import threading
+
+class ReadCache(object):
+    """ReadCache class shared by all threads of a DataManager
+
+    Every entry belongs to the current data version. Moving to a newer
+    version drops all entries, and reads made at an older version than the
+    current one are neither answered from nor stored in the cache. Entries
+    are evicted least recently used first once the cache holds max_size of
+    them.
+
+    Args:
+        max_size (int):     entries kept at most
+
+    Attributes:
+        max_size (int):     entries kept at most
+        version (int):      data version of the cached entries
+        hits (int):         reads answered from the cache
+        misses (int):       reads that went to the database
+        evictions (int):    entries evicted to stay within max_size
+        invalidations (int): times the cache was emptied by a newer version
+
+    """
+
+    def __init__(self, max_size=256):
+        self.max_size = max_size
+        self.version = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, version, key):
+        """Method to look up a cached read
+
+        Args:
+            version (int):  data version the caller reads at
+            key (tup):      read method name and arguments
+
+        Returns:
+            found (bool):   True if the read was cached
+            value (obj):    cached value, or None
+
+        """
+
+        with self._lock:
+            self._advance(version)
+
+            if version == self.version and key in self._entries:
+                value = self._entries.pop(key)
+                self._entries[key] = value
+                self.hits += 1
+                return True, value
+
+            self.misses += 1
+
+        return False, None
+
+    def put(self, version, key, value):
+        """Method to store a read made at a data version
+
+        Args:
+            version (int):  data version the value was read at
+            key (tup):      read method name and arguments
+            value (obj):    value returned by the read
+
+        Returns:
+            None
+
+        """
+
+        with self._lock:
+            self._advance(version)
+
+            if version != self.version:
+                return
+
+            self._entries.pop(key, None)
+
+            if len(self._entries) >= self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+            self._entries[key] = value
+
+    def clear(self):
+        """Method to drop every cached read, keeping the version
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self):
+        """Method to get cache size and hit statistics
+
+        Args:
+            None
+
+        Returns:
+            stats (dict):   cache size, version and hit counts
+
+        """
+
+        with self._lock:
+            return {
+                'version': self.version,
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations}
+
+    def _advance(self, version):
+        """Drop all entries if version is newer than the cached one
+
+        Must be called with the cache lock held.
+
+        Args:
+            version (int):  data version seen by a caller
+
+        Returns:
+            None
+
+        """
+
+        if self.version is None or version > self.version:
+            if self._entries:
+                self._entries.clear()
+                self.invalidations += 1
+            self.version = version
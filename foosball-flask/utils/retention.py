@@ -0,0 +1,164 @@
+"""Foosball Rating Retention
+
+This module trims the rating tables in small batches: legacy rating rows no
+longer referenced by a player or team, rating history past its retention
+period or belonging to deleted players and teams, and rating checkpoints
+beyond the newest few.
+
+"""
+
+import logging
+import threading
+import time
+
+LOGGER = logging.getLogger("foosball")
+
+class RetentionPolicy(object):
+    """RetentionPolicy class describing what to remove and how fast
+
+    Every batch is committed on its own and followed by a pause, so no
+    transaction holds locks on more than batch_size rows and other
+    connections get to run in between.
+
+    Args:
+        keep_days (int):        days of rating history kept, None to keep
+                                all
+        archive (bool):         copy legacy rating rows to rating_archive
+        batch_size (int):       rows visited per batch
+        pause (float):          seconds slept between batches
+        keep_checkpoints (int): newest rating checkpoints kept, None to keep
+                                all
+
+    Attributes:
+        keep_days (int):        days of rating history kept, None to keep
+                                all
+        archive (bool):         copy legacy rating rows to rating_archive
+        batch_size (int):       rows visited per batch
+        pause (float):          seconds slept between batches
+        keep_checkpoints (int): newest rating checkpoints kept, None to keep
+                                all
+
+    """
+
+    def __init__(self, keep_days=None, archive=True, batch_size=500,
+        pause=0.5, keep_checkpoints=10):
+        self.keep_days = keep_days
+        self.archive = archive
+        self.batch_size = batch_size
+        self.pause = pause
+        self.keep_checkpoints = keep_checkpoints
+
+def run(data_mgr, policy):
+    """Apply a retention policy until nothing is left to remove
+
+    Args:
+        data_mgr (obj): DataManager
+        policy (obj):   RetentionPolicy
+
+    Returns:
+        ratings (int):      legacy rating rows removed
+        history (int):      rating history rows removed
+        snapshots (int):    rating checkpoint snapshot rows removed
+
+    """
+
+    ratings = 0
+    while True:
+        rating_ids = data_mgr.archive_ratings(batch_size=policy.batch_size,
+            archive=policy.archive)
+        data_mgr.commit_data()
+
+        if not rating_ids:
+            break
+
+        ratings += len(rating_ids)
+        time.sleep(policy.pause)
+
+    history = 0
+    after_id = 0
+    while True:
+        history_ids, after_id = data_mgr.prune_rating_history(
+            after_id=after_id, batch_size=policy.batch_size,
+            keep_days=policy.keep_days)
+        data_mgr.commit_data()
+        history += len(history_ids)
+
+        if after_id is None:
+            break
+
+        time.sleep(policy.pause)
+
+    snapshots = 0
+    while policy.keep_checkpoints is not None:
+        removed = data_mgr.prune_checkpoints(keep=policy.keep_checkpoints,
+            batch_size=policy.batch_size)
+        data_mgr.commit_data()
+
+        if not removed:
+            break
+
+        snapshots += removed
+        time.sleep(policy.pause)
+
+    LOGGER.info("Removed %d legacy ratings, %d rating history rows and %d \
+rating snapshot rows", ratings, history, snapshots)
+
+    return ratings, history, snapshots
+
+class RetentionJob(threading.Thread):
+    """RetentionJob class applying a retention policy periodically
+
+    The job runs as a daemon thread with its own pooled connection, and
+    logs rather than stops on database errors.
+
+    Args:
+        data_mgr (obj):     DataManager
+        policy (obj):       RetentionPolicy
+        interval (float):   seconds between runs
+
+    Attributes:
+        data_mgr (obj):     DataManager
+        policy (obj):       RetentionPolicy
+        interval (float):   seconds between runs
+
+    """
+
+    def __init__(self, data_mgr, policy, interval):
+        threading.Thread.__init__(self, name="rating-retention")
+        self.daemon = True
+        self.data_mgr = data_mgr
+        self.policy = policy
+        self.interval = interval
+        self._stopped = threading.Event()
+
+    def run(self):
+        """Apply the policy every interval until stopped
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+
+        while not self._stopped.wait(self.interval):
+            try:
+                run(self.data_mgr, self.policy)
+            except Exception:
+                LOGGER.exception("Rating retention failed")
+            finally:
+                self.data_mgr.release_connection()
+
+    def stop(self):
+        """Stop the job after the current run
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+
+        self._stopped.set()
@@ -0,0 +1,114 @@
+"""Foosball Single Flight
+
+This class makes concurrent callers asking for the same key share one
+computation instead of each running their own.
+
+"""
+
+import threading
+
+class Flight(object):
+    """Flight class holding one in-flight computation
+
+    Attributes:
+        done (obj):     event set once the computation finished
+        result (obj):   computed value
+        error (obj):    exception raised by the computation, or None
+
+    """
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+class SingleFlight(object):
+    """SingleFlight class coalescing concurrent identical computations
+
+    The first caller for a key runs the computation. Callers arriving for
+    the same key while it runs wait for it and get the same result, or the
+    same exception. Nothing is kept once the computation finished.
+
+    Attributes:
+        calls (int):        calls made
+        executions (int):   computations actually run
+        coalesced (int):    calls answered by another caller's computation
+        errors (int):       computations that raised
+
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.executions = 0
+        self.coalesced = 0
+        self.errors = 0
+        self._flights = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, function, *args, **kwargs):
+        """Method to run a computation, or join the one running for key
+
+        Args:
+            key (obj):          hashable key identifying the computation
+            function (func):    computation
+            args (tup):         computation arguments
+            kwargs (dict):      computation keyword arguments
+
+        Returns:
+            result (obj):       computed value
+
+        """
+
+        with self._lock:
+            self.calls += 1
+            flight = self._flights.get(key)
+
+            if flight is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                flight = Flight()
+                self._flights[key] = flight
+                self.executions += 1
+                leader = True
+
+        if not leader:
+            flight.done.wait()
+
+            if flight.error is not None:
+                raise flight.error
+
+            return flight.result
+
+        try:
+            flight.result = function(*args, **kwargs)
+        except Exception as error:
+            flight.error = error
+            with self._lock:
+                self.errors += 1
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+        return flight.result
+
+    def get_stats(self):
+        """Method to get coalescing statistics
+
+        Args:
+            None
+
+        Returns:
+            stats (dict):   call, execution and coalescing counts
+
+        """
+
+        with self._lock:
+            return {
+                'calls': self.calls,
+                'executions': self.executions,
+                'coalesced': self.coalesced,
+                'errors': self.errors,
+                'in_flight': len(self._flights)}
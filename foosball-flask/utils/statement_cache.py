@@ -0,0 +1,115 @@
+"""Foosball Statement Cache
+
+This class keeps what was learned from the text of recently used SQL
+statements for one MySQL connection: their placeholder count and whether
+they only read. Nothing is prepared on the server, MySQLdb interpolates the
+parameters into the text and MySQL parses every execution again.
+
+"""
+
+import collections
+
+import data_manager_exceptions
+
+# statements that only read data and never leave uncommitted changes
+READ_VERBS = ('SELECT', 'SHOW', 'DESCRIBE', 'EXPLAIN')
+
+class StatementText(object):
+    """StatementText class holding the checks of a parameterized statement
+
+    Args:
+        sql (str):          SQL text with %s placeholders
+
+    Attributes:
+        sql (str):          SQL text with %s placeholders
+        param_count (int):  number of placeholders
+        is_read (bool):     True if the statement cannot modify data
+        executions (int):   times the statement ran on its connection
+
+    """
+
+    def __init__(self, sql):
+        self.sql = sql
+        self.param_count = sql.replace('%%', '').count('%s')
+        self.is_read = sql.lstrip().split(None, 1)[0].upper() in READ_VERBS
+        self.executions = 0
+
+    def bind(self, params):
+        """Method to check parameters against the statement's placeholders
+
+        Args:
+            params (tup):   statement parameters
+
+        Returns:
+            params (tup):   parameters to hand to the cursor, or None for a
+                            statement without placeholders
+
+        Raises:
+            data_manager_exceptions.DBSyntaxError
+
+        """
+
+        if len(params) != self.param_count:
+            raise data_manager_exceptions.DBSyntaxError("Statement expects \
+{0} parameters, got {1}".format(self.param_count, len(params)))
+
+        self.executions += 1
+
+        if self.param_count == 0:
+            return None
+
+        return params
+
+class StatementTextCache(object):
+    """StatementTextCache class reusing statement text checks per connection
+
+    Statements are keyed by their SQL text and evicted least recently used
+    first once the cache holds max_size of them. Only the placeholder and
+    read checks are saved on a hit, the server still parses each execution.
+
+    Args:
+        max_size (int):     statements kept at most
+
+    Attributes:
+        max_size (int):     statements kept at most
+        checks (int):       statement texts checked on a cache miss
+        executes (int):     statement executions
+        evictions (int):    statements evicted to stay within max_size
+
+    """
+
+    def __init__(self, max_size=128):
+        self.max_size = max_size
+        self.checks = 0
+        self.executes = 0
+        self.evictions = 0
+        self._statements = collections.OrderedDict()
+
+    def __len__(self):
+        return len(self._statements)
+
+    def get(self, sql):
+        """Method to get the checked text of a statement
+
+        Args:
+            sql (str):          SQL text with %s placeholders
+
+        Returns:
+            statement (obj):    StatementText
+
+        """
+
+        statement = self._statements.pop(sql, None)
+
+        if statement is None:
+            statement = StatementText(sql)
+            self.checks += 1
+
+            if len(self._statements) >= self.max_size:
+                self._statements.popitem(last=False)
+                self.evictions += 1
+
+        self._statements[sql] = statement
+        self.executes += 1
+
+        return statement
@@ -0,0 +1,325 @@
+"""Foosball TrueSkill Tuning
+
+This script replays the result history under many TrueSkill environments and
+scores how well each one predicted the winners before every game, by log-loss
+and Brier score of the pre-game win probability. Lower is better for both.
+
+The history is read once into arrays. Environments are rated together, one
+NumPy row each, in chunks spread across a process pool.
+
+Example:
+    python tuning.py --db_name foosball grid --beta 2 4.1667 6 --tau 0 0.08
+    python tuning.py --db_name foosball random 2000
+
+"""
+
+import argparse
+import multiprocessing
+import random
+import sys
+
+import numpy
+import trueskill
+
+import data_manager
+import rating_kernel
+
+# environments rated together by one pool task
+CHUNK_SIZE = 64
+
+# bounds of the random search, as (low, high) per parameter
+SEARCH_SPACE = {
+    'sigma': (1.0, 15.0),
+    'beta': (0.5, 10.0),
+    'tau': (0.0, 0.5),
+    'draw_probability': (0.0, 0.3)}
+
+# smallest probability scored, so a confident miss costs a finite log-loss
+MIN_PROBABILITY = 1e-15
+
+# result history shared with pool workers, set by set_games
+GAMES = None
+
+class Environment(object):
+    """Environment class holding one candidate set of TrueSkill parameters
+
+    Args:
+        mu (float):                 initial mean
+        sigma (float):              initial deviation
+        beta (float):               performance deviation
+        tau (float):                dynamics factor
+        draw_probability (float):   draw probability
+
+    Attributes:
+        mu (float):                 initial mean
+        sigma (float):              initial deviation
+        beta (float):               performance deviation
+        tau (float):                dynamics factor
+        draw_probability (float):   draw probability
+        log_loss (float):           mean log-loss, None until scored
+        brier (float):              mean Brier score, None until scored
+
+    """
+
+    def __init__(self, mu, sigma, beta, tau, draw_probability):
+        self.mu = mu
+        self.sigma = sigma
+        self.beta = beta
+        self.tau = tau
+        self.draw_probability = draw_probability
+        self.log_loss = None
+        self.brier = None
+
+    def get_draw_margin(self, size):
+        """Method to get the draw margin for a game of size players
+
+        Args:
+            size (int):     players in the game
+
+        Returns:
+            margin (float): draw margin
+
+        """
+
+        return trueskill.calc_draw_margin(self.draw_probability, size,
+            trueskill.TrueSkill(mu=self.mu, sigma=self.sigma, beta=self.beta,
+            tau=self.tau, draw_probability=self.draw_probability))
+
+def get_default_environment():
+    """Build the environment the app rates with
+
+    Args:
+        None
+
+    Returns:
+        environment (obj):  Environment
+
+    """
+
+    env = trueskill.global_env()
+
+    return Environment(env.mu, env.sigma, env.beta, env.tau,
+        env.draw_probability)
+
+def load_games(data_mgr):
+    """Read the result history into an array of rating columns
+
+    Every player has an offense and a defense column, so each game becomes
+    the columns of its offense winner, defense winner, offense loser and
+    defense loser, in result order.
+
+    Args:
+        data_mgr (obj):     DataManager connected to the database
+
+    Returns:
+        games (obj):        games x 4 integer array of columns
+        columns (int):      number of columns
+
+    """
+
+    cursor = data_mgr.db_conn.cursor()
+    data_mgr.execute(cursor, "SELECT offense_winner, defense_winner, \
+offense_loser, defense_loser FROM result ORDER BY result_id")
+    rows = cursor.fetchall()
+
+    player_index = {}
+    games = numpy.empty((len(rows), 4), dtype=numpy.int32)
+    for number, row in enumerate(rows):
+        for seat, player_id in enumerate(row):
+            index = player_index.setdefault(player_id, len(player_index))
+            games[number, seat] = 2 * index + seat % 2
+
+    return games, 2 * len(player_index)
+
+def set_games(games, columns):
+    """Share the result history with a pool worker
+
+    Args:
+        games (obj):    games x 4 integer array of columns
+        columns (int):  number of columns
+
+    Returns:
+        None
+
+    """
+
+    global GAMES
+    GAMES = (games, columns)
+
+def score(environments):
+    """Replay the shared history under each environment and score it
+
+    Args:
+        environments (list):    Environment objects
+
+    Returns:
+        scores (list):          (log_loss, brier) per environment
+
+    """
+
+    games, columns = GAMES
+    count = len(environments)
+
+    beta = numpy.array([env.beta for env in environments])
+    tau = numpy.array([env.tau for env in environments])
+    draw_margin = numpy.array([env.get_draw_margin(4)
+        for env in environments])
+
+    mu = numpy.repeat(numpy.array([[env.mu] for env in environments]),
+        columns, axis=1)
+    sigma = numpy.repeat(numpy.array([[env.sigma] for env in environments]),
+        columns, axis=1)
+
+    log_loss = numpy.zeros(count)
+    brier = numpy.zeros(count)
+    for game in games:
+        game_mu = mu[:, game]
+        game_sigma = sigma[:, game]
+
+        probability = rating_kernel.win_probability_arrays(game_mu,
+            game_sigma, 2, beta)
+        log_loss -= numpy.log(numpy.maximum(probability, MIN_PROBABILITY))
+        brier += (1 - probability) ** 2
+
+        mu[:, game], sigma[:, game] = rating_kernel.rate_arrays(game_mu,
+            game_sigma, 2, beta, tau, draw_margin)
+
+    total = max(len(games), 1)
+
+    return zip(log_loss / total, brier / total)
+
+def tune(games, columns, environments, processes=None):
+    """Score environments across a process pool
+
+    Args:
+        games (obj):            games x 4 integer array of columns
+        columns (int):          number of columns
+        environments (list):    Environment objects, scored in place
+        processes (int):        worker processes, one per core if None
+
+    Returns:
+        environments (list):    the environments, best log-loss first
+
+    """
+
+    chunks = [environments[start:start + CHUNK_SIZE]
+        for start in range(0, len(environments), CHUNK_SIZE)]
+
+    pool = multiprocessing.Pool(processes, initializer=set_games,
+        initargs=(games, columns))
+    try:
+        scores = pool.map(score, chunks)
+    finally:
+        pool.close()
+        pool.join()
+
+    for chunk, chunk_scores in zip(chunks, scores):
+        for env, (log_loss, brier) in zip(chunk, chunk_scores):
+            env.log_loss = log_loss
+            env.brier = brier
+
+    return sorted(environments, key=lambda env: env.log_loss)
+
+def grid(args):
+    """Build every combination of the given parameter values
+
+    Args:
+        args (obj):             parsed command line arguments
+
+    Returns:
+        environments (list):    Environment objects
+
+    """
+
+    environments = []
+    for sigma in args.sigma:
+        for beta in args.beta:
+            for tau in args.tau:
+                for draw_probability in args.draw_probability:
+                    environments.append(Environment(args.mu, sigma, beta,
+                        tau, draw_probability))
+
+    return environments
+
+def search(args):
+    """Draw random parameter values from SEARCH_SPACE
+
+    Args:
+        args (obj):             parsed command line arguments
+
+    Returns:
+        environments (list):    Environment objects
+
+    """
+
+    generator = random.Random(args.seed)
+
+    return [Environment(args.mu, *[generator.uniform(*SEARCH_SPACE[name])
+        for name in ('sigma', 'beta', 'tau', 'draw_probability')])
+        for _ in range(args.count)]
+
+def main():
+    """Main entry point
+
+    Args:
+        None
+
+    Returns:
+        None
+
+    """
+
+    default = get_default_environment()
+
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--db_user', default='foosball')
+    parser.add_argument('--db_pass', default='foosball')
+    parser.add_argument('--db_host', default='127.0.0.1')
+    parser.add_argument('--db_name', default='foosball')
+    parser.add_argument('--processes', type=int, default=None,
+        help='worker processes, one per core by default')
+    parser.add_argument('--top', type=int, default=10,
+        help='environments listed')
+    parser.add_argument('--mu', type=float, default=default.mu,
+        help='initial mean, it only shifts ratings')
+    subparsers = parser.add_subparsers(dest='search')
+    grid_parser = subparsers.add_parser('grid',
+        help='every combination of the given values')
+    for name in ('sigma', 'beta', 'tau', 'draw_probability'):
+        grid_parser.add_argument('--{0}'.format(name), type=float, nargs='+',
+            default=[getattr(default, name)])
+    grid_parser.set_defaults(build=grid)
+    random_parser = subparsers.add_parser('random',
+        help='random values within SEARCH_SPACE')
+    random_parser.add_argument('count', type=int,
+        help='environments to draw')
+    random_parser.add_argument('--seed', type=int, default=None)
+    random_parser.set_defaults(build=search)
+    args = parser.parse_args()
+
+    data_mgr = data_manager.DataManager(db_user=args.db_user,
+        db_pass=args.db_pass, db_host=args.db_host, db_name=args.db_name)
+
+    try:
+        games, columns = load_games(data_mgr)
+    finally:
+        data_mgr.release_connection()
+
+    if len(games) == 0:
+        return "Aborting. {0} holds no results".format(args.db_name)
+
+    environments = tune(games, columns, [default] + args.build(args),
+        processes=args.processes)
+
+    print "{0:>4} {1:>8} {2:>8} {3:>8} {4:>8} {5:>10} {6:>8}".format("rank",
+        "sigma", "beta", "tau", "draw", "log-loss", "brier")
+
+    for rank, env in enumerate(environments, 1):
+        if rank <= args.top or env is default:
+            print "{0:>4} {1:>8.4f} {2:>8.4f} {3:>8.4f} {4:>8.4f} \
+{5:>10.6f} {6:>8.6f}{7}".format(rank, env.sigma, env.beta, env.tau,
+                env.draw_probability, env.log_loss, env.brier,
+                " (current)" if env is default else "")
+
+if __name__ == '__main__':
+    sys.exit(main())